@@ -0,0 +1,105 @@
+"""
+Measures the throughput of multi-airport runs for an increasing number of worker processes.
+
+Synthetic Inflot exports and a TOTAL workbook are written for every airport; the reports of all
+airports are then built from scratch by `MultiAirportRunner` once per worker count. Speedup and
+efficiency are relative to the smallest worker count; (airport, month) tasks are independent, so
+the efficiency can only stay close to 1 while the workers do not outnumber the cores.
+
+Usage:
+    python -m benchmarks.bench_airports --airports 4 --months 6 --rows 20000 --workers 1 2 4 8
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+from benchmarks.synthetic import generate_inflot, generate_total_cargo, write_inflot_excel, write_total_excel
+from pipeline.airports import MultiAirportRunner
+
+AIRPORT_CODES = ["EPGD", "EPWA", "EPKT", "EPKK", "EPWR", "EPPO", "EPSC", "EPRZ", "EPLB", "EPBY", "EPLL", "EPMO"]
+FORMATS = {"A1": "parquet", "B1": "parquet", "C1": "parquet"}
+
+
+def write_airports(work_dir: str, airports: int, months: int, rows: int, year: int = 2025) -> dict:
+    """
+    :return: Airports configuration of synthetic exports, as read by `load_airports`.
+    """
+    config = {}
+    for index, rairport in enumerate(AIRPORT_CODES[:airports]):
+        inflot_dir = os.path.join(work_dir, "exports", rairport)
+        os.makedirs(inflot_dir)
+        for month in range(1, months + 1):
+            df = generate_inflot(rows, year=year, month=month, seed=index * 100 + month)
+            write_inflot_excel(df, os.path.join(inflot_dir, f"inflot_{str(month).zfill(2)}.xlsx"))
+        total_path = write_total_excel(generate_total_cargo(year - 1, year, seed=index),
+                                       os.path.join(work_dir, "exports", f"{rairport}_TOTAL.xlsx"))
+        config[rairport] = {"inflot_dir": inflot_dir, "total_path": total_path}
+    return config
+
+
+def benchmark(airports: int, months: int, rows: int, workers: list) -> dict:
+    """
+    :param airports: Number of reporting airports.
+    :param months: Monthly exports per airport.
+    :param rows: Flights per month.
+    :param workers: Worker counts to measure.
+    :return: Result dictionary with the seconds, months per second, speedup and efficiency of every worker count.
+    """
+    if airports > len(AIRPORT_CODES):
+        raise ValueError(f"At most {len(AIRPORT_CODES)} airports are available")
+
+    runs = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        config = write_airports(work_dir, airports, months, rows)
+        for count in workers:
+            # A fresh workbook cache for every run, so each of them parses all the exports.
+            root = os.path.join(work_dir, f"airports_{count}")
+            runner = MultiAirportRunner(config, root, max_workers=count, cache_dir=os.path.join(root, "cache"),
+                                        formats=FORMATS, incremental=False, history=False)
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = runner.run()
+            seconds = time.perf_counter() - started
+            built = sum(len(airport_results) for airport_results in results.values())
+            runs[count] = {"seconds": seconds, "months_per_second": built / seconds}
+
+    base = runs[workers[0]]["months_per_second"] / workers[0]
+    for count, run in runs.items():
+        run["speedup"] = run["months_per_second"] / runs[workers[0]]["months_per_second"]
+        run["efficiency"] = run["months_per_second"] / (base * count)
+
+    return {
+        "airports": airports,
+        "months_per_airport": months,
+        "rows_per_month": rows,
+        "cpu_count": os.cpu_count(),
+        "runs": runs,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark multi-airport runs against the number of workers.")
+    parser.add_argument("--airports", type=int, default=4)
+    parser.add_argument("--months", type=int, default=6)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--json", help="Optional path of a JSON file for the results.")
+    args = parser.parse_args()
+
+    result = benchmark(args.airports, args.months, args.rows, sorted(args.workers))
+    print(f" {result['airports']} airports x {result['months_per_airport']} months x {result['rows_per_month']} rows, "
+          f"{result['cpu_count']} CPUs")
+    print(f" {'workers':>7} {'seconds':>9} {'months/s':>9} {'speedup':>8} {'efficiency':>10}")
+    for count, run in result["runs"].items():
+        print(f" {count:>7} {run['seconds']:>9.2f} {run['months_per_second']:>9.2f} {run['speedup']:>8.2f} "
+              f"{run['efficiency']:>10.2f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Compares the single-pass C1 aggregation with the previous three filtered groupbys.
+
+Usage:
+    python -m benchmarks.bench_c1_aggregation --rows 100000 1000000 5000000 --repeat 3
+"""
+import argparse
+import json
+import time
+import pandas as pd
+from benchmarks.run_benchmarks import inflot_frame
+from benchmarks.synthetic import generate_inflot, generate_total_cargo
+from transform.strategies.gus_c1.gus_c1_config import MAPPING_A1_TYPE, MAPPING_TMY
+from transform.strategies.gus_c1.gus_c1_transform_strategy import C1TransformStrategy
+from transform.transform_utils import TransformUtils
+
+
+def aggregate_by_type(df: pd.DataFrame, filter_values: list) -> pd.DataFrame:
+    """
+    Filters one group of flight types and aggregates it per airline, as C1 did before.
+    """
+    df = TransformUtils.keep_relevant_rows(df, "Typ rejsu", filter_values)
+    df = df.groupby(["AIRLINEC"], as_index=False, observed=True).agg({
+        "PAX": "sum",
+        "TRANSITPAX": "sum",
+        "AIRCRAFTM": "count",
+        "AIRCRAFTMY": "count",
+    })
+    return TransformUtils.uncategorize(df)
+
+
+def three_pass_combine(df_c1: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reference implementation: three filtered groupbys, concatenated and remapped.
+    """
+    df_tmy = aggregate_by_type(df_c1, MAPPING_TMY)
+    df_tmy["PAX"] = 0
+    df_tmy["AIRCRAFTM"] = 0
+    df_tm = aggregate_by_type(df_c1, ["Sanitarny"])
+
+    aircraft_mapping = dict(zip(df_tm["AIRLINEC"], df_tm["AIRCRAFTMY"]))
+    df_tmy["AIRCRAFTM"] = df_tmy["AIRLINEC"].map(aircraft_mapping).fillna(df_tmy["AIRCRAFTM"])
+    return pd.concat([aggregate_by_type(df_c1, MAPPING_A1_TYPE), df_tmy], ignore_index=True)
+
+
+def prepared_strategy(df_inflot: pd.DataFrame, df_total: pd.DataFrame) -> C1TransformStrategy:
+    """
+    :return: C1 strategy with the steps before the aggregation already applied.
+    """
+    strategy = C1TransformStrategy(df_inflot, df_total)
+    strategy._prepare_columns()
+    strategy._add_columns()
+    strategy._remove_unnecessary_rows()
+    strategy._remove_unnecessary_columns()
+    return strategy
+
+
+def benchmark(rows_list: list, repeat: int) -> list:
+    """
+    :param rows_list: Inflot sizes to measure.
+    :param repeat: Number of runs per size and input; the best time is reported.
+    :return: List of result dictionaries.
+    """
+    df_total = generate_total_cargo()
+    results = []
+    for rows in rows_list:
+        inputs = {"compact": inflot_frame(rows, seed=0), "object": generate_inflot(rows, seed=0)}
+        for input_name, df_inflot in inputs.items():
+            three_pass, single_pass = [], []
+            for _ in range(repeat):
+                strategy = prepared_strategy(df_inflot, df_total)
+                started = time.perf_counter()
+                expected = three_pass_combine(strategy.df_c1)
+                three_pass.append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                strategy._combine_aggregated_data()
+                single_pass.append(time.perf_counter() - started)
+                pd.testing.assert_frame_equal(strategy.df_c1, expected)
+
+            results.append({
+                "rows": rows,
+                "input": input_name,
+                "three_pass_seconds": min(three_pass),
+                "single_pass_seconds": min(single_pass),
+                "speedup": min(three_pass) / min(single_pass),
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the C1 aggregation.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Optional path of a JSON file for the results.")
+    args = parser.parse_args()
+    TransformUtils.enable_copy_on_write()
+
+    results = benchmark(args.rows, args.repeat)
+    for result in results:
+        print(f"{result['rows']:>9} rows, {result['input']:>7} input: three-pass {result['three_pass_seconds']:.4f}s, "
+              f"single-pass {result['single_pass_seconds']:.4f}s ({result['speedup']:.2f}x)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
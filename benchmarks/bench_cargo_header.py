@@ -0,0 +1,80 @@
+"""
+Measures how CargoData header processing scales with the width of the CARGO sheet.
+
+For every width the header steps (_preparing_multiindex_columns, _drop_columns,
+_trim_at_razem_zgr, _filter_by_period_) are timed, together with the whole CargoData.run.
+
+Usage:
+    python -m benchmarks.bench_cargo_header --columns 500 2000 10000 50000 --repeat 3
+"""
+import argparse
+import json
+import time
+from benchmarks.synthetic import generate_total_cargo
+from transform.strategies.cargo_utils.cargo_config import CARGO_DROP
+from transform.strategies.cargo_utils.cargo_utils import CargoData
+
+AIRPORTS_PER_AIRLINE = 5
+
+
+def time_header_steps(df_total, year: int, month: int) -> dict:
+    """
+    Runs the header steps of CargoData one by one.
+
+    :return: Seconds per step.
+    """
+    cargo = CargoData(df_total)
+    steps = [
+        ("_preparing_multiindex_columns", lambda: cargo._preparing_multiindex_columns()),
+        ("_drop_columns", lambda: cargo._drop_columns(CARGO_DROP)),
+        ("_trim_at_razem_zgr", lambda: cargo._trim_at_razem_zgr()),
+        ("_filter_by_period_", lambda: cargo._filter_by_period_(year, month)),
+    ]
+    timings = {}
+    for name, step in steps:
+        started = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    CargoData(df_total).run(year, month)
+    timings["run"] = time.perf_counter() - started
+    return timings
+
+
+def benchmark(columns_list: list, repeat: int, year: int = 2025, month: int = 2) -> list:
+    """
+    :param columns_list: Approximate numbers of airline/airport columns of the generated sheets.
+    :param repeat: Number of runs per width; the best time of every step is reported.
+    :return: List of result dictionaries.
+    """
+    results = []
+    for columns in columns_list:
+        airlines = max(1, columns // (2 * AIRPORTS_PER_AIRLINE))
+        df_total = generate_total_cargo(airlines=airlines, airports_per_airline=AIRPORTS_PER_AIRLINE)
+        best = {}
+        for _ in range(repeat):
+            for step, seconds in time_header_steps(df_total, year, month).items():
+                best[step] = min(seconds, best.get(step, seconds))
+        results.append({"columns": df_total.shape[1], "rows": df_total.shape[0], "seconds": best})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark CargoData header processing on wide CARGO sheets.")
+    parser.add_argument("--columns", type=int, nargs="+", default=[500, 2_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Optional path of a JSON file for the results.")
+    args = parser.parse_args()
+
+    results = benchmark(args.columns, args.repeat)
+    for result in results:
+        steps = ", ".join(f"{step} {seconds:.4f}s" for step, seconds in result["seconds"].items())
+        print(f"{result['columns']:>7} columns: {steps}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compares the dtype backends of the extracted Inflot columns on the A1/B1/C1 transforms.
+
+A synthetic Inflot export is projected to the schema columns and typed three ways: plain object
+strings as `pd.read_excel` returns them, the "numpy" backend (categorical text, nullable Int16
+counts) and the "pyarrow" backend (Arrow-backed strings, see `ARROW_STRING_DTYPE`). For each,
+the cast, the transforms of all reports and the memory of the extracted frame are measured, and
+the reports are checked to be identical to those of the plain frame.
+
+Usage:
+    python -m benchmarks.bench_dtype_backend --rows 100000 1000000
+"""
+import argparse
+import json
+import time
+import pandas as pd
+from benchmarks.synthetic import generate_inflot, generate_total_cargo
+from transform.inflot_schema import INFLOT_SCHEMA, INFLOT_SCHEMAS
+from transform.report_runner import ReportRunner
+from transform.transform_utils import TransformUtils
+
+
+def transform(df_inflot: pd.DataFrame, df_total: pd.DataFrame) -> dict:
+    """
+    :return: A1, B1 and C1 reports, computed one after the other.
+    """
+    with ReportRunner(df_inflot, df_total, max_workers=1) as runner:
+        return runner.run().compute(["A1", "B1", "C1"])
+
+
+def best_of(repeat: int, function) -> tuple:
+    """
+    :return: Result of the last call and the best time in seconds.
+    """
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        seconds = time.perf_counter() - started
+        best = seconds if best is None else min(best, seconds)
+    return result, best
+
+
+def benchmark(rows: int, repeat: int = 3) -> dict:
+    """
+    :param rows: Flights of the synthetic export.
+    :param repeat: Runs per measurement; the best one is kept.
+    :return: Result dictionary with cast and transform seconds and frame megabytes per backend.
+    """
+    df_raw = generate_inflot(rows, year=2025, month=2)
+    df_raw = df_raw.iloc[:, INFLOT_SCHEMA.select_columns(list(df_raw.columns))]
+    df_total = generate_total_cargo(2024, 2025)
+
+    expected = transform(df_raw, df_total)
+    result = {"rows": rows, "object_mb": df_raw.memory_usage(deep=True).sum() / 1024 ** 2}
+    _, result["object_transform_seconds"] = best_of(repeat, lambda: transform(df_raw, df_total))
+    for backend, schema in INFLOT_SCHEMAS.items():
+        df_inflot, result[f"{backend}_cast_seconds"] = best_of(repeat, lambda: schema.apply(df_raw))
+        reports, result[f"{backend}_transform_seconds"] = best_of(repeat, lambda: transform(df_inflot, df_total))
+        result[f"{backend}_mb"] = df_inflot.memory_usage(deep=True).sum() / 1024 ** 2
+        for report_type, df in reports.items():
+            pd.testing.assert_frame_equal(df, expected[report_type], check_dtype=False)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Inflot dtype backends on the transforms.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Optional path of a JSON file for the results.")
+    args = parser.parse_args()
+    TransformUtils.enable_copy_on_write()
+
+    results = [benchmark(rows, args.repeat) for rows in args.rows]
+    for result in results:
+        for name, value in result.items():
+            print(f" {name:<28} {value:.4f}" if isinstance(value, float) else f" {name:<28} {value}")
+        print()
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Measures reads of the flight history store over years of monthly Inflot exports.
+
+Synthetic months are written to a FlightHistoryStore; then one year of two columns is read
+three ways: every partition and column followed by filtering in pandas, with partition pruning
+only, and with partition and column pruning. Parsing one month from its Excel export is timed
+for comparison, since that is what an analysis without the store has to repeat for every month.
+
+Usage:
+    python -m benchmarks.bench_history_store --years 10 --rows 20000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from benchmarks.synthetic import generate_inflot, write_inflot_excel
+from extract.frame_cache import FrameCache
+from extract.strategies.inflot_extract_strategy import InflotExtractStrategy
+from pipeline.history_store import FlightHistoryStore
+from transform.inflot_schema import INFLOT_SCHEMA
+
+COLUMNS = ["Typ rejsu", "TTL"]
+
+
+def extracted_month(rows: int, year: int, month: int):
+    """
+    :return: Synthetic Inflot export of one month, projected and typed like an extracted one.
+    """
+    df = generate_inflot(rows, year=year, month=month, seed=year * 12 + month)
+    return INFLOT_SCHEMA.apply(df.iloc[:, INFLOT_SCHEMA.select_columns(list(df.columns))])
+
+
+def timed(function) -> tuple:
+    """
+    :return: Result of the call and the seconds it took.
+    """
+    started = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - started
+
+
+def benchmark(years: int, rows: int, first_year: int = 2010) -> dict:
+    """
+    :param years: Number of years of monthly exports stored.
+    :param rows: Flights per month.
+    :param first_year: First stored year.
+    :return: Result dictionary with timings in seconds.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        store = FlightHistoryStore(os.path.join(work_dir, "history"))
+        write_seconds = 0.0
+        for year in range(first_year, first_year + years):
+            for month in range(1, 13):
+                df = extracted_month(rows, year, month)
+                write_seconds += timed(lambda: store.write(df, year, month))[1]
+        store_bytes = sum(os.path.getsize(os.path.join(directory, name))
+                          for directory, _, names in os.walk(store.root) for name in names)
+
+        year = first_year + years // 2
+        full, full_seconds = timed(lambda: store.read())
+        filtered, filter_seconds = timed(lambda: full.loc[full["year"] == year, COLUMNS])
+        pruned, pruned_seconds = timed(lambda: store.read(start=(year, 1), end=(year, 12)))
+        projected, projected_seconds = timed(lambda: store.read(COLUMNS, start=(year, 1), end=(year, 12)))
+        assert len(filtered) == len(pruned) == len(projected)
+
+        excel_path = write_inflot_excel(generate_inflot(rows, year=year, month=1), os.path.join(work_dir, "inflot.xlsx"))
+        cache = FrameCache(os.path.join(work_dir, "cache"))
+        _, excel_seconds = timed(lambda: InflotExtractStrategy(excel_path, cache=cache, schema=INFLOT_SCHEMA,
+                                                               copy_to_inbox=False).retrive_data())
+
+    return {
+        "years": years,
+        "rows_per_month": rows,
+        "store_bytes": store_bytes,
+        "write_seconds_per_month": write_seconds / (years * 12),
+        "full_read_and_filter_seconds": full_seconds + filter_seconds,
+        "partition_pruned_seconds": pruned_seconds,
+        "partition_and_column_pruned_seconds": projected_seconds,
+        "excel_parse_one_month_seconds": excel_seconds,
+        "excel_parse_one_year_estimate_seconds": excel_seconds * 12,
+        "rows_read": len(projected),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark filtered reads of the flight history store.")
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--json", help="Optional path of a JSON file for the results.")
+    args = parser.parse_args()
+
+    result = benchmark(args.years, args.rows)
+    for name, value in result.items():
+        print(f" {name:<38} {value:.4f}" if isinstance(value, float) else f" {name:<38} {value}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
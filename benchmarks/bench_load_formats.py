@@ -0,0 +1,63 @@
+"""
+Compares write throughput of the report load strategies.
+
+Usage:
+    python -m benchmarks.bench_load_formats --rows 1000 10000 100000 --repeat 3
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from benchmarks.synthetic import generate_report
+from load.load_config import LOAD_STRATEGIES
+
+
+def benchmark(rows_list: list, repeat: int) -> list:
+    """
+    Writes synthetic reports with every registered load strategy.
+
+    :param rows_list: Report sizes to measure.
+    :param repeat: Number of writes per size and format; the best time is reported.
+    :return: List of result dictionaries.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as save_path:
+        for rows in rows_list:
+            df = generate_report(rows)
+            for file_format, strategy_class in LOAD_STRATEGIES.items():
+                timings = []
+                for _ in range(repeat):
+                    strategy = strategy_class(df, "A1", 2025, 2)
+                    started = time.perf_counter()
+                    full_path = strategy.load(save_path)
+                    timings.append(time.perf_counter() - started)
+                best = min(timings)
+                results.append({
+                    "format": file_format,
+                    "rows": rows,
+                    "seconds": best,
+                    "rows_per_second": rows / best,
+                    "file_bytes": os.path.getsize(full_path),
+                })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark report write throughput per output format.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Optional path of a JSON file for the results.")
+    args = parser.parse_args()
+
+    results = benchmark(args.rows, args.repeat)
+    for result in results:
+        print(f"{result['format']:>8} {result['rows']:>9} rows: {result['seconds']:.4f}s "
+              f"({result['rows_per_second']:,.0f} rows/s, {result['file_bytes']:,} bytes)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
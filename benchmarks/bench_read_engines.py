@@ -0,0 +1,127 @@
+"""
+Compares the `pd.read_excel` engines on the layouts the pipeline reads.
+
+Two reads are measured for every engine able to read the file type (see `READ_ENGINES`): an
+Inflot export projected to the schema columns, as `InflotExtractStrategy` reads it, and the
+header-less CARGO sheet of the TOTAL workbook read with `header=None`, as
+`TotalTableExtractStrategy` reads it. Synthetic .xlsx files are used by default; real exports
+(including .xls ones) can be given instead. Every frame is compared with the one of the default
+engine of the format, and a difference is reported with the timings, so the benchmark doubles as
+the equivalence check calamine needs before it can become the default (see `READ_ENGINES`).
+Engines that are not installed are reported as skipped.
+
+Usage:
+    python -m benchmarks.bench_read_engines --rows 20000 100000
+    python -m benchmarks.bench_read_engines --inflot luty25.xls --total TABELA_TOTAL_AKTUALNA.xlsx
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import pandas as pd
+from benchmarks.synthetic import generate_inflot, generate_total_cargo, write_inflot_excel, write_total_excel
+from extract.extract_config import READ_ENGINES
+from extract.extract_utils import ExtractUtils
+from transform.inflot_schema import INFLOT_SCHEMA
+
+TOTAL_READ_OPTIONS = {"sheet_name": "CARGO", "header": None}
+
+
+def read_options(kind: str, path: str) -> dict:
+    """
+    :param kind: "inflot" or "total".
+    :param path: Path of the workbook.
+    :return: `pd.read_excel` options the extract strategy uses for the workbook.
+    """
+    if kind == "total":
+        return dict(TOTAL_READ_OPTIONS)
+    return {"usecols": INFLOT_SCHEMA.select_columns(ExtractUtils.read_header(path))}
+
+
+def benchmark_file(kind: str, path: str, repeat: int = 3) -> dict:
+    """
+    :param kind: "inflot" or "total".
+    :param path: Path of the workbook.
+    :param repeat: Reads per engine; the best one is kept.
+    :return: Result dictionary with, per engine, its best "seconds" and the "mismatch" of its frame
+        with the one of the default engine (None when equal); None for engines not installed.
+    """
+    candidates = READ_ENGINES.get(os.path.splitext(path)[1].lower(), ("openpyxl",))
+    options = read_options(kind, path)
+    reference = candidates[0]
+    expected = pd.read_excel(path, engine=reference, **options)
+
+    engines = {}
+    for engine in candidates:
+        if not ExtractUtils.engine_available(engine):
+            engines[engine] = None
+            continue
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            df = pd.read_excel(path, engine=engine, **options)
+            seconds = time.perf_counter() - started
+            best = seconds if best is None else min(best, seconds)
+        try:
+            pd.testing.assert_frame_equal(df, expected, check_dtype=False)
+            mismatch = None
+        except AssertionError as error:
+            mismatch = str(error).strip()
+        engines[engine] = {"seconds": best, "mismatch": mismatch}
+
+    return {
+        "kind": kind,
+        "file": os.path.basename(path),
+        "rows": len(expected),
+        "reference": reference,
+        "auto": ExtractUtils.read_engine(path, "auto"),
+        "engines": engines,
+    }
+
+
+def benchmark(rows: list, inflot: list, total: list, repeat: int = 3) -> list:
+    """
+    :param rows: Flights of the synthetic Inflot exports, used when no Inflot file is given.
+    :param inflot: Paths of real Inflot exports.
+    :param total: Paths of real TOTAL workbooks; a synthetic one is used when empty.
+    :param repeat: Reads per engine; the best one is kept.
+    :return: Result dictionaries, one per file.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        if not inflot:
+            inflot = [write_inflot_excel(generate_inflot(count, year=2025, month=2),
+                                         os.path.join(work_dir, f"inflot_{count}.xlsx")) for count in rows]
+        if not total:
+            total = [write_total_excel(generate_total_cargo(2010, 2025), os.path.join(work_dir, "TOTAL.xlsx"))]
+        return ([benchmark_file("inflot", path, repeat) for path in inflot]
+                + [benchmark_file("total", path, repeat) for path in total])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Excel read engines on the Inflot and TOTAL layouts.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[20_000, 100_000])
+    parser.add_argument("--inflot", nargs="+", default=[], help="Real Inflot exports instead of synthetic ones.")
+    parser.add_argument("--total", nargs="+", default=[], help="Real TOTAL workbooks instead of a synthetic one.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Optional path of a JSON file for the results.")
+    args = parser.parse_args()
+
+    results = benchmark(args.rows, args.inflot, args.total, args.repeat)
+    for result in results:
+        print(f" {result['file']} ({result['kind']}, {result['rows']} rows), auto engine: {result['auto']}")
+        reference = result["engines"][result["reference"]]["seconds"]
+        for engine, timing in result["engines"].items():
+            if timing is None:
+                print(f"   {engine:<10} skipped, not installed")
+                continue
+            print(f"   {engine:<10} {timing['seconds']:>8.3f}s  x{reference / timing['seconds']:.2f}")
+            if timing["mismatch"] is not None:
+                print(f"   {'':<10} differs from {result['reference']}: {timing['mismatch'].splitlines()[0]}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
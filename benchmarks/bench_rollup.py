@@ -0,0 +1,93 @@
+"""
+Measures annual rollups built from monthly partials against transforming every month again.
+
+Twelve synthetic months are transformed once and their partials stored, as a batch run does.
+The annual A1/B1/C1 reports are then built twice: by merging the stored partials, and by
+running the monthly transforms of the whole year again (the extracted inputs are kept in
+memory, so the Excel parse a real re-run would also repeat is not even counted).
+
+Usage:
+    python -m benchmarks.bench_rollup --rows 20000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from benchmarks.synthetic import generate_inflot, generate_total_cargo
+from pipeline.rollup import PartialStore, rollup_window
+from transform.inflot_schema import INFLOT_SCHEMA
+from transform.report_runner import ReportRunner
+from transform.rollup import ReportPartial
+from transform.transform_utils import TransformUtils
+
+
+def extracted_month(rows: int, year: int, month: int):
+    """
+    :return: Synthetic Inflot export of one month, projected and typed like an extracted one.
+    """
+    df = generate_inflot(rows, year=year, month=month, seed=year * 12 + month, as_object=False)
+    return INFLOT_SCHEMA.apply(df.iloc[:, INFLOT_SCHEMA.select_columns(list(df.columns))])
+
+
+def transform_month(df_inflot, df_total, year: int, month: int) -> ReportPartial:
+    """
+    :return: Partial of one month, after computing all its reports.
+    """
+    with ReportRunner(df_inflot, df_total) as runner:
+        bundle = runner.run()
+        bundle.compute(["A1", "B1", "C1"])
+        return ReportPartial.from_bundle(bundle, df_total, year, month)
+
+
+def benchmark(rows: int, year: int = 2024) -> dict:
+    """
+    :param rows: Flights per month.
+    :param year: Year of the synthetic months.
+    :return: Result dictionary with timings in seconds.
+    """
+    df_total = generate_total_cargo(year - 1, year)
+    months = [extracted_month(rows, year, month) for month in range(1, 13)]
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        store = PartialStore(os.path.join(work_dir, "partials"))
+        for month, df_inflot in enumerate(months, start=1):
+            store.save(transform_month(df_inflot, df_total, year, month))
+
+        label, periods = rollup_window("year", year)
+        started = time.perf_counter()
+        reports = store.merged(periods).reports(label)
+        rollup_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    partials = [transform_month(df_inflot, df_total, year, month) for month, df_inflot in enumerate(months, start=1)]
+    ReportPartial.merge(partials).reports(label)
+    retransform_seconds = time.perf_counter() - started
+
+    return {
+        "rows_per_month": rows,
+        "rollup_seconds": rollup_seconds,
+        "retransform_seconds": retransform_seconds,
+        "speedup": retransform_seconds / rollup_seconds,
+        "a1_rows": len(reports["A1"]),
+        "c1_rows": len(reports["C1"]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark annual rollups from monthly partials.")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--json", help="Optional path of a JSON file for the results.")
+    args = parser.parse_args()
+    TransformUtils.enable_copy_on_write()
+
+    result = benchmark(args.rows)
+    for name, value in result.items():
+        print(f" {name:<22} {value:.4f}" if isinstance(value, float) else f" {name:<22} {value}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Measures SqliteLoadStrategy as a database accumulates decades of monthly reports.
+
+Every month of the given number of years is loaded as a synthetic A1 report; the load time of
+the first and last years is compared to show whether it grows with the table. Then a corrected
+month in the middle of the history is reloaded (unchanged, with changed values and with fewer
+rows) and one period is read back.
+
+Usage:
+    python -m benchmarks.bench_sqlite_load --years 30 --rows 2000
+"""
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from benchmarks.synthetic import generate_report
+from load.strategies.sqlite_load_strategy import SqliteLoadStrategy
+
+
+def monthly_report(rows: int, year: int, month: int):
+    """
+    :return: Synthetic A1 report of one period.
+    """
+    return generate_report(rows, seed=year * 12 + month).assign(YEAR=str(year)[-2:], PERIOD=month)
+
+
+def timed_load(df, year: int, month: int, database: str) -> float:
+    """
+    :return: Seconds taken by one SqliteLoadStrategy load.
+    """
+    started = time.perf_counter()
+    SqliteLoadStrategy(df, "A1", year, month).load(database)
+    return time.perf_counter() - started
+
+
+def benchmark(years: int, rows: int, first_year: int = 1990) -> dict:
+    """
+    :param years: Number of years of monthly reports to load.
+    :param rows: Rows per monthly report.
+    :param first_year: First loaded year.
+    :return: Result dictionary with timings in seconds.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        database = os.path.join(work_dir, "reports.sqlite")
+        periods = [(year, month) for year in range(first_year, first_year + years) for month in range(1, 13)]
+        loads = [timed_load(monthly_report(rows, year, month), year, month, database) for year, month in periods]
+
+        # Two-digit years repeat after a century, so the reloaded month is taken from the loaded range.
+        year, month = periods[len(periods) // 2]
+        report = monthly_report(rows, year, month)
+        corrected = report.assign(SEATAV=report["SEATAV"] + 1)
+        reload_unchanged = timed_load(report, year, month, database)
+        reload_corrected = timed_load(corrected, year, month, database)
+        reload_shorter = timed_load(corrected.iloc[: rows // 2], year, month, database)
+
+        with sqlite3.connect(database) as connection:
+            started = time.perf_counter()
+            period_rows = connection.execute("SELECT * FROM GUS_A1 WHERE YEAR = ? AND PERIOD = ?",
+                                             (str(year)[-2:], month)).fetchall()
+            query = time.perf_counter() - started
+            total_rows = connection.execute("SELECT COUNT(*) FROM GUS_A1").fetchone()[0]
+        database_bytes = os.path.getsize(database)
+
+    return {
+        "years": years,
+        "rows_per_month": rows,
+        "total_rows": total_rows,
+        "database_bytes": database_bytes,
+        "first_year_median_seconds": statistics.median(loads[:12]),
+        "last_year_median_seconds": statistics.median(loads[-12:]),
+        "reload_unchanged_seconds": reload_unchanged,
+        "reload_corrected_seconds": reload_corrected,
+        "reload_shorter_seconds": reload_shorter,
+        "period_query_seconds": query,
+        "period_rows": len(period_rows),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the SQLite load strategy over decades of months.")
+    parser.add_argument("--years", type=int, default=30)
+    parser.add_argument("--rows", type=int, default=2_000)
+    parser.add_argument("--json", help="Optional path of a JSON file for the results.")
+    args = parser.parse_args()
+
+    result = benchmark(args.years, args.rows)
+    for name, value in result.items():
+        print(f" {name:<28} {value:.4f}" if isinstance(value, float) else f" {name:<28} {value}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
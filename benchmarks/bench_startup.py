@@ -0,0 +1,123 @@
+"""
+Measures the startup time of the command line entry point and checks it against budgets.
+
+Every command is started as a new process several times; the first run (closest to a cold start)
+and the median are reported, and the median is compared with the budget. For plain Python the
+heavy modules imported by each command are also listed (from `python -X importtime`); commands
+that should start quickly must not import any of them.
+
+Usage:
+    python -m benchmarks.bench_startup --repeat 10
+    python -m benchmarks.bench_startup --executable dist/airport-reports.exe
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Command name -> arguments passed to main.py (or to the frozen executable).
+STARTUP_COMMANDS = {
+    "help": ["--help"],
+    "list": ["list"],
+    "client-help": ["client", "--help"],
+    "run-help": ["run", "--help"],
+}
+
+# Median startup time allowed per command, in seconds. A frozen executable also unpacks and
+# starts its bundled interpreter, so its budgets are higher.
+STARTUP_BUDGETS = {
+    "python": {"help": 0.25, "list": 0.25, "client-help": 0.25, "run-help": 2.5},
+    "frozen": {"help": 0.75, "list": 0.75, "client-help": 0.75, "run-help": 4.0},
+}
+
+# Commands that must start without importing the modules in HEAVY_MODULES.
+LIGHT_COMMANDS = ("help", "list", "client-help")
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "openpyxl")
+
+
+def command_line(arguments: list, executable: str = None) -> list:
+    """
+    :param arguments: Arguments of the entry point.
+    :param executable: Frozen executable; when None, main.py is run with the current interpreter.
+    :return: Full command line.
+    """
+    if executable:
+        return [executable, *arguments]
+    return [sys.executable, os.path.join(ROOT, "main.py"), *arguments]
+
+
+def time_command(command: list, repeat: int) -> dict:
+    """
+    :param command: Command line to start.
+    :param repeat: Number of starts.
+    :return: Seconds of the first start and the median of all starts.
+    """
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        seconds.append(time.perf_counter() - started)
+    return {"first_seconds": seconds[0], "median_seconds": statistics.median(seconds)}
+
+
+def heavy_imports(arguments: list) -> list:
+    """
+    :param arguments: Arguments of main.py.
+    :return: Top-level names of the heavy modules imported by the command.
+    """
+    process = subprocess.run([sys.executable, "-X", "importtime", os.path.join(ROOT, "main.py"), *arguments],
+                             cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    imported = set()
+    for line in process.stderr.splitlines():
+        if line.startswith("import time:") and line.count("|") == 2:
+            imported.add(line.rsplit("|", 1)[1].strip().split(".")[0])
+    return sorted(imported.intersection(HEAVY_MODULES))
+
+
+def benchmark(repeat: int, executable: str = None) -> list:
+    """
+    :param repeat: Number of starts per command.
+    :param executable: Frozen executable to measure instead of main.py.
+    :return: One result dictionary per command.
+    """
+    kind = "frozen" if executable else "python"
+    results = []
+    for name, arguments in STARTUP_COMMANDS.items():
+        result = {"command": name, "kind": kind, **time_command(command_line(arguments, executable), repeat)}
+        result["budget_seconds"] = STARTUP_BUDGETS[kind][name]
+        result["within_budget"] = result["median_seconds"] <= result["budget_seconds"]
+        if not executable:
+            result["heavy_imports"] = heavy_imports(arguments)
+            if name in LIGHT_COMMANDS and result["heavy_imports"]:
+                result["within_budget"] = False
+        results.append(result)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the startup time of the command line entry point.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--executable", help="Frozen executable to measure instead of main.py.")
+    parser.add_argument("--json", help="Optional path of a JSON file for the results.")
+    args = parser.parse_args()
+
+    results = benchmark(args.repeat, args.executable)
+    for result in results:
+        status = "ok" if result["within_budget"] else "OVER BUDGET"
+        imports = f", imports {', '.join(result['heavy_imports'])}" if result.get("heavy_imports") else ""
+        print(f" {result['command']:<12} first {result['first_seconds']:.3f}s, median {result['median_seconds']:.3f}s "
+              f"(budget {result['budget_seconds']:.2f}s){imports}: {status}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if not all(result["within_budget"] for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""
+Times every stage of the report pipeline on synthetic data.
+
+Stages measured for each Inflot size:
+- extract: reading the Inflot export and the CARGO sheet of TOTAL from Excel, without and with
+  the FrameCache (only for sizes that fit in an Excel sheet, see --extract-max-rows),
+- transform: every step of A1/B1/C1TransformStrategy and the strategies as a whole,
+- cargo: every step of CargoData.run, building the CargoFacts table and one period lookup,
+- load: every report written in every registered output format.
+
+Usage:
+    python -m benchmarks.run_benchmarks --rows 10000 100000 1000000 --json results.json
+    python -m benchmarks.run_benchmarks --rows 10000 100000 --compare results.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import EXCEL_MAX_ROWS, generate_inflot, generate_total_cargo, write_inflot_excel, \
+    write_total_excel
+from extract.frame_cache import FrameCache
+from extract.strategies.inflot_extract_strategy import InflotExtractStrategy
+from extract.strategies.total_table_extract_strategy import TotalTableExtractStrategy
+from instrumentation.profiler import PROFILER
+from load.load_config import LOAD_STRATEGIES
+from transform.inflot_schema import INFLOT_SCHEMA
+from transform.strategies.cargo_utils.cargo_cache import CARGO_RESULTS_CACHE
+from transform.strategies.cargo_utils.cargo_facts import CargoFacts
+from transform.strategies.cargo_utils.cargo_utils import CargoData
+from transform.strategies.gus_a1.gus_a1_transform_strategy import A1TransformStrategy
+from transform.strategies.gus_b1.gus_b1_transform_strategy import B1TransformStrategy
+from transform.strategies.gus_c1.gus_c1_transform_strategy import C1TransformStrategy
+from transform.transform_utils import TransformUtils
+
+# Methods that are not pipeline steps and are never timed separately.
+UNTIMED_METHODS = {"run", "get_data"}
+
+
+class StageTimer:
+    """
+    Collects wall-clock timings of named stages, keeping the best time over repeats.
+    """
+
+    def __init__(self) -> None:
+        self.timings = {}
+        self._current = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Times the body of a `with` block as the stage `name`.
+
+        :param name: Stage name, e.g. 'transform.A1._aggregate_report'.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._current[name] = self._current.get(name, 0.0) + time.perf_counter() - started
+
+    def add_records(self, records: list, prefixes: dict) -> None:
+        """
+        Adds the steps recorded by the profiler as stages.
+
+        :param records: Records returned by `Profiler.stop`.
+        :param prefixes: Stage name prefix per class name; steps of other classes are ignored.
+        """
+        for record in records:
+            class_name, method = record["name"].split(".", 1)
+            if class_name in prefixes and method not in UNTIMED_METHODS:
+                name = f"{prefixes[class_name]}.{method}"
+                self._current[name] = self._current.get(name, 0.0) + record["wall_seconds"]
+
+    def end_repeat(self) -> None:
+        """
+        Closes one repeat, keeping the lowest time seen for every stage.
+        """
+        for name, seconds in self._current.items():
+            self.timings[name] = min(seconds, self.timings.get(name, seconds))
+        self._current = {}
+
+
+def inflot_frame(rows: int, seed: int) -> pd.DataFrame:
+    """
+    Builds a synthetic Inflot frame as the extract stage returns it (projected, compact dtypes).
+
+    :param rows: Number of flights.
+    :param seed: Random seed.
+    :return: DataFrame ready for the transforms.
+    """
+    df = generate_inflot(rows, seed=seed, as_object=False)
+    return INFLOT_SCHEMA.apply(df.iloc[:, INFLOT_SCHEMA.select_columns(list(df.columns))])
+
+
+@contextmanager
+def working_directory(path: str):
+    """
+    Temporarily changes the working directory, so the extract strategies' relative inbox
+    folders are created inside `path`.
+    """
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def bench_extract(timer: StageTimer, df_inflot: pd.DataFrame, df_total: pd.DataFrame, work_dir: str) -> None:
+    """
+    Times reading both workbooks from Excel, first without and then with a warm FrameCache.
+    """
+    inflot_path = write_inflot_excel(df_inflot, os.path.join(work_dir, "inflot.xlsx"))
+    total_path = write_total_excel(df_total, os.path.join(work_dir, "total.xlsx"))
+
+    with working_directory(work_dir):
+        with timer.stage("extract.inflot"):
+            InflotExtractStrategy(inflot_path, schema=INFLOT_SCHEMA).retrive_data()
+        with timer.stage("extract.total"):
+            TotalTableExtractStrategy(total_path).retrive_data()
+
+        cache = FrameCache(os.path.join(work_dir, "cache"))
+        InflotExtractStrategy(inflot_path, cache=cache, schema=INFLOT_SCHEMA).retrive_data()
+        TotalTableExtractStrategy(total_path, cache=cache).retrive_data()
+        with timer.stage("extract.inflot_cached"):
+            InflotExtractStrategy(inflot_path, cache=cache, schema=INFLOT_SCHEMA).retrive_data()
+        with timer.stage("extract.total_cached"):
+            TotalTableExtractStrategy(total_path, cache=cache).retrive_data()
+
+
+def bench_transform(timer: StageTimer, df_inflot: pd.DataFrame, df_total: pd.DataFrame, year: int,
+                    month: int) -> dict:
+    """
+    Times CargoData.run and every transform strategy step by step, using the steps recorded
+    by the profiler (without memory tracing, which would distort the times).
+
+    The shared cargo results cache is cleared first, so A1 and C1 include their CargoData work.
+
+    :return: Transformed reports by report type.
+    """
+    PROFILER.start(trace_memory=False)
+    with timer.stage("cargo.run"):
+        CargoData(df_total).run(year, month)
+    timer.add_records(PROFILER.stop(), {"CargoData": "cargo"})
+    with timer.stage("cargo.facts"):
+        facts = CargoFacts(df_total)
+    with timer.stage("cargo.facts.for_period"):
+        facts.for_period(year, month)
+
+    CARGO_RESULTS_CACHE.clear()
+    reports = {}
+    PROFILER.start(trace_memory=False)
+    for report_type, strategy_class, arguments in (
+        ("A1", A1TransformStrategy, lambda: (df_inflot, df_total)),
+        ("B1", B1TransformStrategy, lambda: (reports["A1"],)),
+        ("C1", C1TransformStrategy, lambda: (df_inflot, df_total)),
+    ):
+        with timer.stage(f"transform.{report_type}"):
+            reports[report_type] = strategy_class(*arguments()).run()
+    timer.add_records(PROFILER.stop(), {
+        "A1TransformStrategy": "transform.A1",
+        "B1TransformStrategy": "transform.B1",
+        "C1TransformStrategy": "transform.C1",
+    })
+    return reports
+
+
+def bench_load(timer: StageTimer, reports: dict, year: int, month: int, work_dir: str) -> None:
+    """
+    Times writing every report in every registered output format.
+    """
+    save_path = os.path.join(work_dir, "reports")
+    os.makedirs(save_path, exist_ok=True)
+    for report_type, df in reports.items():
+        for file_format, strategy_class in LOAD_STRATEGIES.items():
+            with timer.stage(f"load.{report_type}.{file_format}"):
+                strategy_class(df, report_type, year, month).load(save_path)
+
+
+def benchmark(rows: int, repeat: int, extract_max_rows: int, seed: int = 0) -> dict:
+    """
+    Runs every stage for one Inflot size.
+
+    :param rows: Number of Inflot flights.
+    :param repeat: Number of repeats; the best time of every stage is reported.
+    :param extract_max_rows: Largest size for which the Excel extract is measured.
+    :param seed: Random seed of the generators.
+    :return: Result dictionary with the stage timings in seconds.
+    """
+    year, month = 2025, 2
+    df_inflot = inflot_frame(rows, seed)
+    df_total = generate_total_cargo(seed=seed)
+    timer = StageTimer()
+    extract = rows <= min(extract_max_rows, EXCEL_MAX_ROWS)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for _ in range(repeat):
+            if extract:
+                bench_extract(timer, generate_inflot(rows, year, month, seed=seed), df_total, work_dir)
+            reports = bench_transform(timer, df_inflot, df_total, year, month)
+            bench_load(timer, reports, year, month, work_dir)
+            timer.end_repeat()
+
+    return {
+        "rows": rows,
+        "total_shape": list(df_total.shape),
+        "report_rows": {report_type: len(df) for report_type, df in reports.items()},
+        "extract_measured": extract,
+        "stages": timer.timings,
+    }
+
+
+def metadata() -> dict:
+    """
+    :return: Description of the environment the benchmark ran in.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(results: list, baseline: dict, threshold: float, min_seconds: float) -> list:
+    """
+    Finds stages that became slower than in a previous run.
+
+    :param results: Results of the current run.
+    :param baseline: Content of a JSON file written by a previous run.
+    :param threshold: Allowed relative slowdown, e.g. 0.2 for 20%.
+    :param min_seconds: Slowdowns smaller than this many seconds are ignored as noise.
+    :return: One dictionary per regressed stage.
+    """
+    baseline_results = {result["rows"]: result["stages"] for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        previous = baseline_results.get(result["rows"], {})
+        for stage, seconds in result["stages"].items():
+            if stage not in previous:
+                continue
+            before = previous[stage]
+            if seconds - before > min_seconds and seconds > before * (1 + threshold):
+                regressions.append({"rows": result["rows"], "stage": stage, "before": before, "after": seconds})
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the report pipeline on synthetic data.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--extract-max-rows", type=int, default=200_000,
+                        help="Largest size whose Excel extract is measured; writing the input is slow.")
+    parser.add_argument("--json", help="Path of a JSON file for the results.")
+    parser.add_argument("--compare", help="JSON file of a previous run; exits with 1 on regressions.")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--min-seconds", type=float, default=0.01)
+    args = parser.parse_args()
+    TransformUtils.enable_copy_on_write()
+
+    results = []
+    for rows in args.rows:
+        result = benchmark(rows, args.repeat, args.extract_max_rows)
+        results.append(result)
+        print(f"{rows} rows:")
+        for stage, seconds in result["stages"].items():
+            print(f"  {stage:<55} {seconds:.4f}s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"metadata": metadata(), "results": results}, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.threshold, args.min_seconds)
+        for regression in regressions:
+            print(f"REGRESSION {regression['rows']} rows {regression['stage']}: "
+                  f"{regression['before']:.4f}s -> {regression['after']:.4f}s")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
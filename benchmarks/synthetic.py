@@ -0,0 +1,199 @@
+import numpy as np
+import pandas as pd
+from transform.strategies.cargo_utils.cargo_config import (
+    CARGO_DROP,
+    CARGO_AIRLINEC_MAPPING,
+    CARGO_PAIRPORT_MAPPING,
+    MONTHS_MAPPING
+)
+from transform.strategies.gus_a1.gus_a1_config import FLIGHT_TYPES
+from transform.strategies.gus_c1.gus_c1_config import MAPPING_TMY
+
+# Largest number of data rows an .xlsx sheet can hold (one row is the header).
+EXCEL_MAX_ROWS = 1_048_575
+
+INFLOT_FLIGHT_TYPES = list(FLIGHT_TYPES["PASSFREIGH"]) + MAPPING_TMY + ["Pozycjonujący"]
+INFLOT_FLIGHT_TYPE_WEIGHTS = [0.55, 0.01, 0.12, 0.02, 0.03, 0.02] + [0.04, 0.03, 0.03, 0.02, 0.05, 0.03] + [0.05]
+
+# Raw Inflot headers; some contain the line breaks and padding found in real exports.
+INFLOT_COLUMNS = [
+    "Data",
+    "Port ICAO",
+    "Operacja",
+    "Przewoźnik\nICAO",
+    "Model samolotu",
+    "PAX Capacity",
+    "Typ rejsu",
+    "TTL",
+    "Infant",
+    "Tranzyt",
+    " Numer rejsu ",
+    "Stanowisko",
+]
+
+
+def _codes(rng: np.random.Generator, count: int, length: int, known: list) -> list:
+    """
+    Returns `count` distinct uppercase codes, starting with the `known` ones.
+    """
+    codes = list(dict.fromkeys(known))
+    letters = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+    while len(codes) < count:
+        code = "".join(rng.choice(letters, length))
+        if code not in codes:
+            codes.append(code)
+    return codes[:count]
+
+
+def generate_inflot(rows: int, year: int = 2025, month: int = 2, airlines: int = 60, airports: int = 150,
+                    seed: int = 0, as_object: bool = True) -> pd.DataFrame:
+    """
+    Generates a synthetic Inflot export for one month.
+
+    :param rows: Number of flights.
+    :param year: Full year of the flights.
+    :param month: Month of the flights.
+    :param airlines: Number of distinct operators.
+    :param airports: Number of distinct origin/destination airports.
+    :param seed: Random seed.
+    :param as_object: Return text columns as object dtype, like `pd.read_excel` does;
+        otherwise they are categoricals, which keeps 10M-row frames in memory.
+    :return: DataFrame with the raw Inflot layout.
+    """
+    rng = np.random.default_rng(seed)
+    airline_codes = _codes(rng, airlines, 3, ["LOT", "DLH", "RYR", "WZZ", "SAS", "KLM", "NOZ", "XXX", "BCS", "SAR"])
+    airport_codes = _codes(rng, airports, 4, list(CARGO_PAIRPORT_MAPPING.values()))
+    aircraft = ["B738", "B38M", "A320", "A20N", "A321", "E195", "DH8D", "AT76", "B77F", "C56X"]
+
+    start = pd.Timestamp(year=year, month=month, day=1)
+    month_length = (start + pd.offsets.MonthBegin(1)) - start
+    offsets = np.sort(rng.integers(0, int(month_length.total_seconds() // 60), rows))
+
+    def text(values: list, weights=None) -> pd.Categorical:
+        probabilities = None if weights is None else np.array(weights) / np.sum(weights)
+        return pd.Categorical.from_codes(rng.choice(len(values), rows, p=probabilities), categories=values)
+
+    ttl = rng.integers(0, 190, rows).astype(float)
+    ttl[rng.random(rows) < 0.05] = np.nan
+
+    df = pd.DataFrame({
+        "Data": start + pd.to_timedelta(offsets, unit="min"),
+        "Port ICAO": text(airport_codes),
+        "Operacja": text(["P", "O"]),
+        "Przewoźnik\nICAO": text(airline_codes),
+        "Model samolotu": text(aircraft),
+        "PAX Capacity": rng.integers(4, 220, rows),
+        "Typ rejsu": text(INFLOT_FLIGHT_TYPES, INFLOT_FLIGHT_TYPE_WEIGHTS),
+        "TTL": ttl,
+        "Infant": rng.integers(0, 4, rows),
+        "Tranzyt": rng.integers(0, 6, rows),
+        " Numer rejsu ": text([f"FL{i:04d}" for i in range(500)]),
+        "Stanowisko": text([f"S{i}" for i in range(40)]),
+    }, columns=INFLOT_COLUMNS)
+
+    if as_object:
+        categorical = [column for column, dtype in df.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+        df = df.astype({column: object for column in categorical})
+    return df
+
+
+def generate_total_cargo(first_year: int = 2010, last_year: int = 2025, airlines: int = 40,
+                         airports_per_airline: int = 5, seed: int = 0) -> pd.DataFrame:
+    """
+    Generates a synthetic CARGO sheet of the TOTAL workbook, as read with `header=None`.
+
+    Layout expected by `CargoData`:
+    - row 0: title, rows 1-3: airline / airport / IMPORT-EXPORT header levels,
+    - columns 0-1: ROK and MIESIĄC (Roman numeral months), one data row per month,
+    - columns to drop (CARGO_DROP keywords) and everything after the first 'RAZEM ZGR' column.
+
+    :param first_year: First year with monthly rows.
+    :param last_year: Last year with monthly rows.
+    :param airlines: Number of airlines with cargo columns.
+    :param airports_per_airline: Number of airports per airline (two columns each).
+    :param seed: Random seed.
+    :return: Raw DataFrame with integer column labels.
+    """
+    rng = np.random.default_rng(seed)
+    airline_names = list(CARGO_AIRLINEC_MAPPING) + [f"Linia {i}" for i in range(max(0, airlines - len(CARGO_AIRLINEC_MAPPING)))]
+    airport_names = list(CARGO_PAIRPORT_MAPPING) + [f"Port {i}" for i in range(200)]
+
+    header = [("ROK", None, None), ("MIESIĄC", None, None)]
+    for airline in airline_names[:airlines]:
+        # Airlines known to the cargo mappings fly to mapped airports, so their freight reaches the reports.
+        pool = list(CARGO_PAIRPORT_MAPPING) if airline in CARGO_AIRLINEC_MAPPING else airport_names
+        for airport in rng.choice(pool, min(airports_per_airline, len(pool)), replace=False):
+            header.append((airline, airport, "IMPORT"))
+            header.append((airline, airport, "EXPORT"))
+    for keyword in CARGO_DROP:
+        header.append((keyword, "WAW", "IMPORT"))
+    header.append(("RAZEM ZGR", None, None))
+    header.append(("DHL", "WAW", "IMPORT"))
+
+    columns = len(header)
+    periods = [(year, MONTHS_MAPPING[month]) for year in range(first_year, last_year + 1) for month in range(1, 13)]
+    values = rng.integers(0, 60_000, (len(periods), columns - 2)).astype(object)
+    values[rng.random(values.shape) < 0.3] = None
+
+    rows = [["CARGO - TABELA TOTAL"] + [None] * (columns - 1)]
+    for level in range(3):
+        rows.append([column[level] for column in header])
+    for (year, roman), row_values in zip(periods, values):
+        rows.append([year, roman] + list(row_values))
+    return pd.DataFrame(rows)
+
+
+def generate_report(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Builds a DataFrame with the columns and dtypes of an A1 report.
+
+    :param rows: Number of report rows.
+    :param seed: Random seed.
+    :return: Synthetic A1 report.
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "TABLE": "A1",
+        "COUNTRY": "EP",
+        "YEAR": "25",
+        "PERIOD": 2,
+        "RAIRPORT": "EPGD",
+        "PAIRPORT": rng.choice(["EPWA", "EDDF", "EGLL", "LFPG", "EHAM", "ENGM"], rows),
+        "AD": rng.integers(1, 3, rows),
+        "SCHEDNS": rng.integers(1, 3, rows).astype(float),
+        "PASSFREIGH": rng.integers(1, 3, rows).astype(float),
+        "AIRLINEC": rng.choice(["LOT", "DLH", "RYR", "WZZ", "SAS", "KLM"], rows),
+        "AIRCRAFTTY": rng.choice(["B738", "A320", "E195", "A21N"], rows),
+        "PAX ON BOARD": rng.integers(0, 20_000, rows).astype(float),
+        "FREIGHT ON BOARD": rng.random(rows) * 50,
+        "FLIGHT": rng.integers(1, 120, rows),
+        "SEATAV": rng.integers(50, 30_000, rows),
+    })
+
+
+def write_inflot_excel(df: pd.DataFrame, path: str) -> str:
+    """
+    Saves a synthetic Inflot export as .xlsx.
+
+    :param df: DataFrame from `generate_inflot`.
+    :param path: Destination path.
+    :return: The destination path.
+    :raises ValueError: If the frame does not fit in one Excel sheet.
+    """
+    if len(df) > EXCEL_MAX_ROWS:
+        raise ValueError(f"{len(df)} rows do not fit in an Excel sheet (max {EXCEL_MAX_ROWS})")
+    df.to_excel(path, index=False)
+    return path
+
+
+def write_total_excel(df: pd.DataFrame, path: str) -> str:
+    """
+    Saves a synthetic CARGO sheet as the 'CARGO' sheet of an .xlsx TOTAL workbook.
+
+    :param df: DataFrame from `generate_total_cargo`.
+    :param path: Destination path.
+    :return: The destination path.
+    """
+    with pd.ExcelWriter(path) as writer:
+        df.to_excel(writer, sheet_name="CARGO", header=False, index=False)
+    return path
@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Iterator, Union
 import pandas as pd
 from extract.strategies.abstract_extract_strategy import ExtractStrategy
 
@@ -43,3 +43,15 @@ class Extract:
         on the implementation of the extraction strategy.
         """
         return self._strategy.retrive_data()
+
+    def iter_chunks(self, chunk_size: int = 50_000) -> Iterator[pd.DataFrame]:
+        """
+        Stream the data in row chunks using the current extraction strategy.
+
+        Parameters:
+        chunk_size (int): Maximum number of rows per chunk.
+
+        Returns:
+        An iterator of DataFrames produced by the strategy.
+        """
+        return self._strategy.iter_chunks(chunk_size)
@@ -0,0 +1,19 @@
+# `pd.read_excel` engines able to read each file extension; the first one, the default engine of
+# pandas, is used unless another is requested. calamine (python-calamine, a Rust reader) is opt-in
+# through READ_ENGINE_ENV until its frames are checked to be equal on real exports.
+READ_ENGINES = {
+    ".xls": ("xlrd", "calamine"),
+    ".xlsx": ("openpyxl", "calamine"),
+    ".xlsm": ("openpyxl", "calamine"),
+}
+
+# Module each engine needs; an engine whose module is not installed is skipped.
+ENGINE_MODULES = {
+    "calamine": "python_calamine",
+    "xlrd": "xlrd",
+    "openpyxl": "openpyxl",
+}
+
+# Environment variable forcing one engine (e.g. "calamine") for every read; "auto" or unset uses
+# the default engine of READ_ENGINES. Worker processes inherit it.
+READ_ENGINE_ENV = "ETL_READ_ENGINE"
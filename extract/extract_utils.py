@@ -1,8 +1,17 @@
 import datetime
+import functools
+import importlib.util
+import itertools
+import math
 import os
 import pandas as pd
 import shutil
-from typing import Union
+from contextlib import closing
+from typing import Iterator, Optional, Union
+from pandas.io.parsers import TextParser
+from extract.extract_config import ENGINE_MODULES, READ_ENGINE_ENV, READ_ENGINES
+from extract.frame_cache import FrameCache
+from extract.input_schema import InputSchema
 
 
 class ExtractUtils:
@@ -25,6 +34,7 @@ class ExtractUtils:
         Copy a file to the destination folder with a timestamped filename.
 
         - Checks if the file exists before copying.
+        - Creates the destination folder if it does not exist yet.
         - Creates a new filename with a timestamp to prevent overwriting.
         - Copies the file to the specified directory.
 
@@ -35,6 +45,7 @@ class ExtractUtils:
         if not os.path.isfile(source):
             return f"Error, file in location {source} does not exist"
 
+        os.makedirs(destination_folder, exist_ok=True)
         filename, file_extension = os.path.splitext(os.path.basename(source))
         new_filename = f"{filename}_{ExtractUtils.create_timestamp()}{file_extension}"
         destination_path = os.path.join(destination_folder, new_filename)
@@ -44,12 +55,196 @@ class ExtractUtils:
         return destination_path
 
     @staticmethod
-    def load_to_data_frame(destination_path: str) -> pd.DataFrame:
+    @functools.lru_cache(maxsize=None)
+    def engine_available(engine: str) -> bool:
+        """
+        :param engine: Name of a `pd.read_excel` engine listed in `ENGINE_MODULES`.
+        :return: True when the module of the engine is installed.
+        """
+        return importlib.util.find_spec(ENGINE_MODULES[engine]) is not None
+
+    @staticmethod
+    def read_engine(file_path: str, engine: Optional[str] = None) -> str:
+        """
+        Chooses the `pd.read_excel` engine of a file.
+
+        :param file_path: Path to the Excel file; its extension selects the candidate engines.
+        :param engine: Engine to use, `READ_ENGINE_ENV` or "auto" when None; "auto" is the default
+            engine of the file type, the first one of `READ_ENGINES`.
+        :return: Name of the engine.
+        :raises ValueError: If a requested engine cannot read the file type or is not installed.
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        candidates = READ_ENGINES.get(extension, ("openpyxl",))
+        engine = engine or os.environ.get(READ_ENGINE_ENV) or "auto"
+        if engine == "auto":
+            # Used even when its module is missing, so pandas raises its usual error about the optional dependency.
+            return candidates[0]
+
+        if engine not in candidates:
+            raise ValueError(f"Engine {engine} cannot read {extension} files. Available: {list(candidates)}")
+        if not ExtractUtils.engine_available(engine):
+            raise ValueError(f"Engine {engine} needs the {ENGINE_MODULES[engine]} package, which is not installed")
+        return engine
+
+    @staticmethod
+    def load_to_data_frame(destination_path: str, cache: Optional[FrameCache] = None, engine: Optional[str] = None,
+                           **read_options) -> pd.DataFrame:
         """
         Load an Excel file into a Pandas DataFrame.
 
-        :param sheet_name:
+        When a cache is given, a workbook whose content has already been parsed with the same
+        options and engine is read from the cache instead of being decoded again.
+
         :param destination_path: The full path to the Excel file.
+        :param cache: Optional FrameCache used to skip repeated Excel parsing.
+        :param engine: Read engine, chosen by `read_engine` (automatically by default).
+        :param read_options: Additional keyword arguments for `pd.read_excel`, e.g. sheet_name or header.
         :return: A Pandas DataFrame containing the loaded data.
         """
-        return pd.read_excel(destination_path)
+        read_options = {**read_options, "engine": ExtractUtils.read_engine(destination_path, engine)}
+        if cache is None:
+            return pd.read_excel(destination_path, **read_options)
+        return cache.read_excel(destination_path, **read_options)
+
+    @staticmethod
+    def read_header(file_path: str, sheet_name: Union[str, int] = 0, engine: Optional[str] = None) -> list:
+        """
+        Read only the header row of an Excel sheet.
+
+        :param file_path: The full path to the Excel file.
+        :param sheet_name: Sheet name or zero-based sheet index.
+        :param engine: Read engine, chosen by `read_engine` (automatically by default).
+        :return: List of raw column names.
+        """
+        engine = ExtractUtils.read_engine(file_path, engine)
+        return list(pd.read_excel(file_path, sheet_name=sheet_name, nrows=0, engine=engine).columns)
+
+    @staticmethod
+    def read_rows(file_path: str, count: int, sheet_name: Union[str, int] = 0) -> list:
+        """
+        Read only the first rows of an Excel sheet, without building a DataFrame.
+
+        .xlsx sheets are streamed, so the rest of the sheet is never parsed; .xls sheets are
+        decoded by xlrd as a whole, but no cells beyond the requested rows are converted.
+
+        :param file_path: The full path to the Excel file.
+        :param count: Number of rows to read.
+        :param sheet_name: Sheet name or zero-based sheet index.
+        :return: Lists of converted cell values (empty cells as ""), at most `count` of them.
+        """
+        if file_path.lower().endswith(".xls"):
+            rows = ExtractUtils._iter_xls_rows(file_path, sheet_name)
+        else:
+            rows = ExtractUtils._iter_xlsx_rows(file_path, sheet_name)
+        with closing(rows):
+            return list(itertools.islice(rows, count))
+
+    @staticmethod
+    def iter_excel_chunks(file_path: str, chunk_size: int = 50_000, sheet_name: Union[str, int] = 0,
+                          usecols: Optional[list] = None,
+                          schema: Optional[InputSchema] = None) -> Iterator[pd.DataFrame]:
+        """
+        Read an Excel sheet as a stream of DataFrames with at most `chunk_size` rows each.
+
+        - .xlsx files are read with openpyxl in read-only mode, which parses the sheet row by row,
+          so memory use depends on the chunk size rather than on the file size.
+        - .xls files are decoded by xlrd as a whole: the complete sheet is held in memory while it
+          is read, so memory use grows with the file size. Only the DataFrames are built chunk by chunk.
+
+        Cells are converted the same way `pd.read_excel` converts them, and the first row is used
+        as the header of every chunk. Without a schema, the dtypes are inferred per chunk, so the
+        same column can get different dtypes in different chunks.
+
+        :param file_path: The full path to the Excel file.
+        :param chunk_size: Maximum number of data rows per chunk.
+        :param sheet_name: Sheet name or zero-based sheet index.
+        :param usecols: Optional positions of the columns to keep; other cells are dropped row by row.
+        :param schema: Optional InputSchema; when given, only its columns are kept (unless `usecols`
+            is given) and every chunk gets its dtypes.
+        :return: Iterator of Pandas DataFrames.
+        """
+        if file_path.lower().endswith(".xls"):
+            rows = ExtractUtils._iter_xls_rows(file_path, sheet_name)
+        else:
+            rows = ExtractUtils._iter_xlsx_rows(file_path, sheet_name)
+
+        header = next(rows, None)
+        if header is None:
+            return
+        if usecols is None and schema is not None:
+            usecols = schema.select_columns(header)
+        if usecols is not None:
+            header = [header[i] if i < len(header) else "" for i in usecols]
+            rows = ([row[i] if i < len(row) else "" for i in usecols] for row in rows)
+
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield ExtractUtils._chunk_frame(header, chunk, schema)
+                chunk = []
+        if chunk:
+            yield ExtractUtils._chunk_frame(header, chunk, schema)
+
+    @staticmethod
+    def _chunk_frame(header: list, chunk: list, schema: Optional[InputSchema]) -> pd.DataFrame:
+        """
+        Builds the DataFrame of one chunk of rows, with the dtypes of the schema when given.
+        """
+        df = TextParser([header] + chunk, header=0).read()
+        return schema.apply(df) if schema is not None else df
+
+    @staticmethod
+    def _iter_xlsx_rows(file_path: str, sheet_name: Union[str, int]) -> Iterator[list]:
+        """
+        Yield converted cell values of an .xlsx sheet row by row, using openpyxl's read-only mode.
+        """
+        from openpyxl import load_workbook
+        from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+        try:
+            sheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+            for row in sheet.iter_rows():
+                values = []
+                for cell in row:
+                    value = cell.value
+                    if value is None:
+                        value = ""
+                    elif cell.data_type == TYPE_ERROR:
+                        value = float("nan")
+                    elif cell.data_type == TYPE_NUMERIC and math.isfinite(value) and int(value) == value:
+                        value = int(value)
+                    values.append(value)
+                yield values
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _iter_xls_rows(file_path: str, sheet_name: Union[str, int]) -> Iterator[list]:
+        """
+        Yield converted cell values of a legacy .xls sheet row by row, using xlrd.
+        """
+        import xlrd
+        from xlrd import XL_CELL_BOOLEAN, XL_CELL_DATE, XL_CELL_ERROR, XL_CELL_NUMBER
+
+        workbook = xlrd.open_workbook(file_path, on_demand=True)
+        try:
+            sheet = workbook.sheet_by_index(sheet_name) if isinstance(sheet_name, int) else workbook.sheet_by_name(sheet_name)
+            for row_index in range(sheet.nrows):
+                values = []
+                for cell in sheet.row(row_index):
+                    value = cell.value
+                    if cell.ctype == XL_CELL_DATE:
+                        value = xlrd.xldate.xldate_as_datetime(value, workbook.datemode)
+                    elif cell.ctype == XL_CELL_ERROR:
+                        value = float("nan")
+                    elif cell.ctype == XL_CELL_BOOLEAN:
+                        value = bool(value)
+                    elif cell.ctype == XL_CELL_NUMBER and math.isfinite(value) and int(value) == value:
+                        value = int(value)
+                    values.append(value)
+                yield values
+        finally:
+            workbook.release_resources()
@@ -0,0 +1,303 @@
+import datetime
+import hashlib
+import json
+import os
+import uuid
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+
+class FrameCache:
+    """
+    On-disk cache of parsed Excel sheets.
+
+    Each parsed sheet is stored as an uncompressed Arrow IPC file named after a key built from
+    the content fingerprint of the workbook, the sheet and the reader options. A warm read
+    memory-maps that file instead of decoding the workbook again, so numeric and datetime
+    columns are handed to pandas without copying.
+
+    The cache directory is kept below `max_bytes`; the least recently used entries are removed
+    first (an entry's modification time is refreshed on every hit).
+    """
+
+    FORMAT_VERSION = 1
+    EXTENSION = ".arrow"
+
+    # Tags used to encode object columns, which in the raw sheets mix text, numbers and blanks.
+    _NAN, _NONE, _STR, _INT, _FLOAT, _DATETIME, _BOOL = range(7)
+
+    def __init__(self, cache_dir: str = os.path.join("boxes", "cache"), max_bytes: int = 2 * 1024 ** 3) -> None:
+        """
+        Initializes the cache.
+
+        :param cache_dir: Directory where cached frames are stored. Created if missing.
+        :param max_bytes: Upper limit for the total size of the cache directory.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._fingerprints = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def fingerprint(self, file_path: str, chunk_size: int = 1024 * 1024) -> str:
+        """
+        Computes a content fingerprint of a file.
+
+        The digest is remembered per (path, size, modification time), so repeated reads of an
+        unchanged file within one process hash it only once.
+
+        :param file_path: Path to the file.
+        :param chunk_size: Number of bytes hashed at a time.
+        :return: Hex digest of the file content.
+        """
+        stat = os.stat(file_path)
+        memo_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        if memo_key in self._fingerprints:
+            return self._fingerprints[memo_key]
+
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(chunk_size), b""):
+                digest.update(chunk)
+
+        self._fingerprints[memo_key] = digest.hexdigest()
+        return self._fingerprints[memo_key]
+
+    def make_key(self, file_path: str, **read_options) -> str:
+        """
+        Builds the cache key for a workbook read with the given `pd.read_excel` options.
+
+        :param file_path: Path to the Excel file.
+        :param read_options: Keyword arguments passed to `pd.read_excel` (e.g. sheet_name, header, engine).
+            The engine is part of the key, since engines may convert some cells differently.
+        :return: Hex string identifying the cache entry.
+        """
+        payload = json.dumps(
+            {
+                "version": self.FORMAT_VERSION,
+                "fingerprint": self.fingerprint(file_path),
+                "options": read_options,
+            },
+            sort_keys=True,
+            default=repr,
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=20).hexdigest()
+
+    def entry_path(self, key: str) -> str:
+        """
+        :param key: Cache key returned by `make_key`.
+        :return: Path of the Arrow IPC file for the given key.
+        """
+        return os.path.join(self.cache_dir, f"{key}{self.EXTENSION}")
+
+    def read_excel(self, file_path: str, **read_options) -> pd.DataFrame:
+        """
+        Returns the parsed sheet, decoding the workbook only on a cache miss.
+
+        :param file_path: Path to the Excel file.
+        :param read_options: Keyword arguments passed to `pd.read_excel`.
+        :return: A Pandas DataFrame with the sheet content.
+        """
+        path = self.entry_path(self.make_key(file_path, **read_options))
+        if os.path.isfile(path):
+            os.utime(path)
+            return self.load(path)
+
+        df = pd.read_excel(file_path, **read_options)
+        if self.store(df, path):
+            self._evict()
+        return df
+
+    def load(self, path: str) -> pd.DataFrame:
+        """
+        Opens a cached frame through a memory map.
+
+        :param path: Path of the Arrow IPC file.
+        :return: The cached DataFrame. Native columns are read-only views on the mapped file.
+        """
+        table = ipc.open_file(pa.memory_map(path, "r")).read_all()
+        layout = json.loads(table.schema.metadata[b"frame_cache"])
+
+        columns = {}
+        for position, column in enumerate(layout["columns"]):
+            if column["kind"] == "native":
+                columns[position] = self._restore_native(table.column(column["fields"][0]), column["dtype"])
+            else:
+                columns[position] = self._restore_mixed(table, column["fields"])
+
+        df = pd.DataFrame(columns, copy=False)
+        df.columns = [column["label"] for column in layout["columns"]]
+        return df
+
+    def store(self, df: pd.DataFrame, path: str) -> bool:
+        """
+        Writes a frame to the cache.
+
+        Frames with a non-default index or with column labels other than strings and integers
+        are not cached.
+
+        :param df: DataFrame to store.
+        :param path: Destination path of the Arrow IPC file.
+        :return: True if the frame has been stored, False otherwise.
+        """
+        if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+            return False
+        if not all(isinstance(label, (str, int)) and not isinstance(label, bool) for label in df.columns):
+            return False
+
+        arrays, names, layout = [], [], []
+        for position, label in enumerate(df.columns):
+            series = df.iloc[:, position]
+            if series.dtype == object:
+                fields = self._encode_mixed(series, str(position), arrays, names)
+                layout.append({"label": label, "kind": "mixed", "fields": fields})
+            else:
+                arrays.append(pa.array(series, from_pandas=True))
+                names.append(str(position))
+                layout.append({"label": label, "kind": "native",
+                               "fields": [str(position)], "dtype": str(series.dtype)})
+
+        schema = pa.schema(
+            [pa.field(name, array.type) for name, array in zip(names, arrays)],
+            metadata={"frame_cache": json.dumps({"columns": layout})},
+        )
+        table = pa.Table.from_arrays(arrays, schema=schema)
+
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with pa.OSFile(temp_path, "wb") as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temp_path, path)
+        return True
+
+    def _encode_mixed(self, series: pd.Series, prefix: str, arrays: list, names: list) -> list:
+        """
+        Splits an object column into a tag array plus one typed array per value kind.
+
+        :param series: Object column to encode.
+        :param prefix: Field name prefix for this column.
+        :param arrays: List collecting the Arrow arrays to write.
+        :param names: List collecting the Arrow field names to write.
+        :return: Names of the fields written for this column, tag field first.
+        """
+        values = series.to_numpy()
+        tags = np.empty(len(values), dtype=np.int8)
+        typed = {self._STR: {}, self._INT: {}, self._FLOAT: {}, self._DATETIME: {}, self._BOOL: {}}
+
+        for i, value in enumerate(values):
+            if value is None:
+                tags[i] = self._NONE
+            elif isinstance(value, str):
+                tags[i] = self._STR
+            elif isinstance(value, (bool, np.bool_)):
+                tags[i] = self._BOOL
+            elif isinstance(value, (int, np.integer)):
+                tags[i] = self._INT
+            elif isinstance(value, (float, np.floating)):
+                tags[i] = self._NAN if np.isnan(value) else self._FLOAT
+            elif isinstance(value, (datetime.datetime, np.datetime64)):
+                tags[i] = self._DATETIME
+            else:
+                tags[i] = self._STR
+                value = str(value)
+            if tags[i] in typed:
+                typed[tags[i]][i] = value
+
+        arrow_types = {
+            self._STR: pa.string(),
+            self._INT: pa.int64(),
+            self._FLOAT: pa.float64(),
+            self._DATETIME: pa.timestamp("ns"),
+            self._BOOL: pa.bool_(),
+        }
+        fields = [f"{prefix}.tag"]
+        arrays.append(pa.array(tags))
+        names.append(fields[0])
+        for tag, kind_values in typed.items():
+            if kind_values:
+                # Every field spans the whole column; positions holding another kind are null.
+                column = pd.Series(kind_values, dtype=object).reindex(range(len(values)))
+                if tag == self._DATETIME:
+                    column = pd.to_datetime(column)
+                fields.append(f"{prefix}.{tag}")
+                arrays.append(pa.array(column, type=arrow_types[tag], from_pandas=True))
+                names.append(fields[-1])
+        return fields
+
+    def _restore_mixed(self, table: pa.Table, fields: list) -> pd.Series:
+        """
+        Rebuilds an object column from the arrays written by `_encode_mixed`.
+
+        :param table: Table read from the cache file.
+        :param fields: Field names of the column, tag field first.
+        :return: Object Series equal to the one that has been stored.
+        """
+        tags = table.column(fields[0]).to_numpy()
+        values = np.full(len(tags), np.nan, dtype=object)
+        values[tags == self._NONE] = None
+
+        for field in fields[1:]:
+            tag = int(field.rsplit(".", 1)[1])
+            mask = tags == tag
+            if tag == self._DATETIME:
+                kind_values = table.column(field).to_pandas().to_numpy(dtype=object)
+            else:
+                kind_values = np.empty(len(tags), dtype=object)
+                kind_values[:] = table.column(field).to_pylist()
+            values[mask] = kind_values[mask]
+        return pd.Series(values, dtype=object)
+
+    @staticmethod
+    def _restore_native(column: pa.ChunkedArray, dtype: str) -> pd.Series:
+        """
+        Converts a natively stored column back to pandas, keeping the original dtype.
+
+        :param column: Arrow column read from the cache file.
+        :param dtype: String representation of the original pandas dtype.
+        :return: The restored Series.
+        """
+        if dtype.endswith("[pyarrow]"):
+            return pd.Series(pd.arrays.ArrowExtensionArray(column))
+        series = column.to_pandas()
+        if str(series.dtype) != dtype:
+            series = series.astype(dtype)
+        return series
+
+    def _evict(self) -> None:
+        """
+        Removes least recently used entries until the cache fits in `max_bytes`.
+
+        Entries that cannot be removed (e.g. still mapped by another process on Windows) and entries
+        already removed by another process are skipped.
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(self.EXTENSION):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+
+    def clear(self) -> None:
+        """
+        Removes every cached entry.
+        """
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(self.EXTENSION) or name.endswith(".tmp"):
+                os.remove(os.path.join(self.cache_dir, name))
+
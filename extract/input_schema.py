@@ -0,0 +1,59 @@
+import pandas as pd
+
+
+class InputSchema:
+    """
+    Declares which columns of a source report are needed and which dtypes they should get.
+
+    Column names are matched after the same cleaning `TransformUtils.rename_columns` applies
+    (surrounding spaces removed, newlines replaced with spaces), so raw headers such as
+    "Przewoźnik\\nICAO" match "Przewoźnik ICAO". The first column of the sheet is the date
+    column used by `TransformUtils.get_middle_record_data`; it is always read and converted
+    to datetime.
+    """
+
+    def __init__(self, columns: list, dtypes: dict) -> None:
+        """
+        :param columns: Cleaned names of the columns to read.
+        :param dtypes: Mapping of cleaned column name to pandas dtype (e.g. "category", "Int16").
+        """
+        self.columns = columns
+        self.dtypes = dtypes
+
+    @staticmethod
+    def clean_column_name(name) -> str:
+        """
+        :param name: Raw header of a column.
+        :return: Header without surrounding spaces and with newlines replaced by spaces.
+        """
+        return str(name).strip().replace("\n", " ").strip()
+
+    def select_columns(self, header: list) -> list:
+        """
+        Finds the positions of the schema columns in a raw header row.
+
+        :param header: Raw column names of the source sheet.
+        :return: Sorted positions of the columns to read.
+        """
+        wanted = set(self.columns)
+        positions = {0}
+        positions.update(i for i, name in enumerate(header) if self.clean_column_name(name) in wanted)
+        return sorted(positions)
+
+    def apply(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """
+        Casts the columns of a projected DataFrame to the declared compact dtypes.
+
+        :param dataframe: DataFrame read with the columns returned by `select_columns`.
+        :return: DataFrame with the declared dtypes and a datetime date column.
+        """
+        dtypes = {}
+        for name in dataframe.columns:
+            dtype = self.dtypes.get(self.clean_column_name(name))
+            if dtype is not None:
+                dtypes[name] = dtype
+
+        date_column = dataframe.columns[0]
+        if not pd.api.types.is_datetime64_any_dtype(dataframe[date_column]):
+            dtypes[date_column] = "datetime64[ns]"
+        return dataframe.astype(dtypes)
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from typing import Iterator
+import pandas as pd
 
 
 class ExtractStrategy(ABC):
@@ -9,3 +11,15 @@ class ExtractStrategy(ABC):
         :return: None
         """
         pass
+
+    def iter_chunks(self, chunk_size: int = 50_000) -> Iterator[pd.DataFrame]:
+        """
+        Streams the data as DataFrames with at most `chunk_size` rows each.
+
+        Strategies whose sources can be read incrementally override this method;
+        `retrive_data` stays available for reading everything at once.
+
+        :param chunk_size: Maximum number of rows per chunk.
+        :return: Iterator of Pandas DataFrames.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support streaming")
@@ -1,7 +1,11 @@
-from typing import Union
+import os
+from typing import Iterator, Optional, Union
 import pandas as pd
 from extract.strategies.abstract_extract_strategy import ExtractStrategy
 from extract.extract_utils import ExtractUtils
+from extract.frame_cache import FrameCache
+from extract.input_schema import InputSchema
+from instrumentation.profiler import profiled_step
 
 
 class InflotExtractStrategy(ExtractStrategy):
@@ -10,35 +14,82 @@ class InflotExtractStrategy(ExtractStrategy):
 
     This class is responsible for:
     - Copying the given Excel file to the designated inbox directory.
-    - Loading the copied file into a Pandas DataFrame.
+    - Loading the copied file into a Pandas DataFrame, at once or as a stream of row chunks.
     """
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, cache: Optional[FrameCache] = None, schema: Optional[InputSchema] = None,
+                 copy_to_inbox: bool = True, inbox_path: Optional[str] = None, engine: Optional[str] = None):
         """
         Initializes the extractor with the file path.
         :param file_path: The full path to the Excel file that needs to be processed.
+        :param cache: Optional FrameCache; when given, an unchanged workbook is not parsed again.
+        :param schema: Optional InputSchema; when given, only its columns are read and they get compact dtypes.
+        :param copy_to_inbox: Copy the file to the inbox before reading it; False reads `file_path`
+            directly, e.g. for files that already are in the inbox.
+        :param inbox_path: Directory the file is copied to, `boxes/inflot/inbox` by default; one per
+            airport when several airports are processed.
+        :param engine: `pd.read_excel` engine, chosen per file type by `ExtractUtils.read_engine` by default.
         """
-        self.inbox_path = "boxes\\inflot\\inbox"
+        self.inbox_path = inbox_path or os.path.join("boxes", "inflot", "inbox")
         self.file_path = file_path
+        self.cache = cache
+        self.schema = schema
+        self.copy_to_inbox = copy_to_inbox
+        self.engine = engine
         self.df = None
 
+    def _source_path(self) -> str:
+        """
+        :return: Path of the file to read: the inbox copy, or `file_path` when copying is disabled
+            (an error message when the file does not exist).
+        """
+        if self.copy_to_inbox:
+            return ExtractUtils.copy_file(self.file_path, self.inbox_path)
+        if not os.path.isfile(self.file_path):
+            return f"Error, file in location {self.file_path} does not exist"
+        return self.file_path
+
+    @profiled_step("df")
     def retrive_data(self) -> Union[pd.DataFrame, str]:
         """
         Retrieves data by copying the file and loading it into a Pandas DataFrame.
 
         Steps:
-        1. Copies the file from `self.file_path` to `self.inbox_path` using `ExtractUtils.copy_file()`.
+        1. Copies the file from `self.file_path` to `self.inbox_path` using `ExtractUtils.copy_file()`,
+           unless `copy_to_inbox` is False.
         2. If the copying fails (returns an error message), the function returns the error.
-        3. Otherwise, loads the copied file into a DataFrame.
+        3. Otherwise, loads the copied file into a DataFrame; with a schema, only the schema columns
+           are read and cast to their compact dtypes.
 
         :return: A Pandas DataFrame containing the extracted data or an error message if the file cannot be copied.
         """
-        destination_path = ExtractUtils.copy_file(self.file_path, self.inbox_path)
+        destination_path = self._source_path()
         if "Error" in destination_path:
             return destination_path
 
-        self.df = ExtractUtils.load_to_data_frame(destination_path)
+        if self.schema is None:
+            self.df = ExtractUtils.load_to_data_frame(destination_path, cache=self.cache, engine=self.engine)
+            return self.df
+
+        usecols = self.schema.select_columns(ExtractUtils.read_header(destination_path, engine=self.engine))
+        self.df = self.schema.apply(ExtractUtils.load_to_data_frame(destination_path, cache=self.cache,
+                                                                    engine=self.engine, usecols=usecols))
         return self.df
 
+    def iter_chunks(self, chunk_size: int = 50_000) -> Iterator[pd.DataFrame]:
+        """
+        Streams the Inflot report in bounded-size row chunks instead of loading it at once.
+
+        Intended for large multi-airport or multi-month exports. For .xlsx files memory use stays
+        roughly constant regardless of the file size; .xls files are decoded as a whole by xlrd
+        (see `ExtractUtils.iter_excel_chunks`). With a schema, every chunk gets its dtypes.
 
+        :param chunk_size: Maximum number of rows per chunk.
+        :return: Iterator of Pandas DataFrames with the columns of the report.
+        :raises FileNotFoundError: If the source file does not exist.
+        """
+        destination_path = self._source_path()
+        if "Error" in destination_path:
+            raise FileNotFoundError(destination_path)
 
+        yield from ExtractUtils.iter_excel_chunks(destination_path, chunk_size, schema=self.schema)
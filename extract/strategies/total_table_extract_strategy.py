@@ -1,7 +1,10 @@
-from typing import Union
+import os
+from typing import Optional, Union
 import pandas as pd
 from extract.strategies.abstract_extract_strategy import ExtractStrategy
 from extract.extract_utils import ExtractUtils
+from extract.frame_cache import FrameCache
+from instrumentation.profiler import profiled_step
 
 
 class TotalTableExtractStrategy(ExtractStrategy):
@@ -13,31 +16,55 @@ class TotalTableExtractStrategy(ExtractStrategy):
     - Loading the copied file into a Pandas DataFrame.
     """
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, cache: Optional[FrameCache] = None, inbox_path: Optional[str] = None,
+                 engine: Optional[str] = None, copy_to_inbox: bool = True):
         """
         Initializes the extractor with the file path.
 
         :param file_path: The full path to the Excel file that needs to be processed.
+        :param cache: Optional FrameCache; when given, an unchanged workbook is not parsed again.
+        :param inbox_path: Directory the file is copied to, `boxes/total_table/inbox` by default; one
+            per airport when several airports are processed.
+        :param engine: `pd.read_excel` engine, chosen per file type by `ExtractUtils.read_engine` by default.
+        :param copy_to_inbox: Copy the file to the inbox before reading it; False reads `file_path`
+            directly, e.g. when the same workbook is read again and again by the daemon.
         """
 
-        self.inbox_path = "boxes\\total_table\\inbox"
+        self.inbox_path = inbox_path or os.path.join("boxes", "total_table", "inbox")
         self.file_path = file_path
+        self.cache = cache
+        self.engine = engine
+        self.copy_to_inbox = copy_to_inbox
         self.df = None
 
+    def _source_path(self) -> str:
+        """
+        :return: Path of the file to read: the inbox copy, or `file_path` when copying is disabled
+            (an error message when the file does not exist).
+        """
+        if self.copy_to_inbox:
+            return ExtractUtils.copy_file(self.file_path, self.inbox_path)
+        if not os.path.isfile(self.file_path):
+            return f"Error, file in location {self.file_path} does not exist"
+        return self.file_path
+
+    @profiled_step("df")
     def retrive_data(self) -> Union[pd.DataFrame, str]:
         """
         Retrieves data by copying the file and loading it into a Pandas DataFrame.
 
         Steps:
-        1. Copies the file from `self.file_path` to `self.inbox_path` using `ExtractUtils.copy_file()`.
+        1. Copies the file from `self.file_path` to `self.inbox_path` using `ExtractUtils.copy_file()`,
+           unless `copy_to_inbox` is False.
         2. If copying fails (returns an error message), the function returns the error.
         3. Otherwise, loads the copied file into a DataFrame.
 
         :return: A Pandas DataFrame containing the extracted data or an error message if the file cannot be copied.
         """
-        destination_path = ExtractUtils.copy_file(self.file_path, self.inbox_path)
+        destination_path = self._source_path()
         if "Error" in destination_path:
             return destination_path
 
-        self.df = pd.read_excel(destination_path, sheet_name="CARGO", header=None)
+        self.df = ExtractUtils.load_to_data_frame(destination_path, cache=self.cache, engine=self.engine,
+                                                  sheet_name="CARGO", header=None)
         return self.df
@@ -0,0 +1,289 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Optional
+import pandas as pd
+
+# Environment variables enabling profiling of `main.py` and batch runs without code changes.
+PROFILE_DIR_ENV = "ETL_PROFILE_DIR"
+PROFILE_SAMPLING_ENV = "ETL_PROFILE_SAMPLING"
+
+DEFAULT_SAMPLING_INTERVAL = 0.005
+
+
+class StackSampler:
+    """
+    Periodically samples the call stacks of all threads.
+
+    The result is written in the folded-stacks format ("frame;frame;frame count" per line) read
+    by flamegraph.pl, speedscope and similar tools.
+    """
+
+    def __init__(self, interval: float = DEFAULT_SAMPLING_INTERVAL) -> None:
+        """
+        :param interval: Seconds between two samples.
+        """
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)).replace(" ", "_"))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def write(self, path: str) -> str:
+        """
+        :param path: Destination of the folded-stacks file.
+        :return: The destination path.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+        return path
+
+
+class Profiler:
+    """
+    Records wall time, CPU time, peak allocated memory and the output shape of pipeline steps.
+
+    Steps are marked with the `profiled_step` decorator. The profiler is disabled by default;
+    a disabled profiler costs a single attribute check per step.
+
+    CPU time is measured per thread. Peak memory is traced with `tracemalloc`, whose peak is
+    process wide and reset at the start of every step: with steps running concurrently in other
+    threads, one step's reset would erase the peak of another. `ReportRunner` therefore computes
+    reports one at a time while memory is traced (`traces_memory`).
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.records = []
+        self.trace_memory = False
+        self.sampler = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started_tracemalloc = False
+
+    @property
+    def traces_memory(self) -> bool:
+        """
+        :return: True while steps are recorded with their peak memory.
+        """
+        return self.enabled and self.trace_memory
+
+    def start(self, trace_memory: bool = True, sampling_interval: Optional[float] = None) -> None:
+        """
+        Enables recording of profiled steps.
+
+        :param trace_memory: Trace peak memory of every step; slows the program down noticeably.
+        :param sampling_interval: When given, also samples call stacks every that many seconds.
+        """
+        self.records = []
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if sampling_interval:
+            self.sampler = StackSampler(sampling_interval)
+            self.sampler.start()
+        self.enabled = True
+
+    def stop(self) -> list:
+        """
+        Disables recording.
+
+        :return: Records of the profiled steps, in the order the steps finished.
+        """
+        self.enabled = False
+        if self.sampler is not None:
+            self.sampler.stop()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        return self.records
+
+    def call(self, name: str, function, args: tuple, kwargs: dict, frame_attr: Optional[str] = None):
+        """
+        Runs a step and records its measurements.
+
+        :param name: Step name, e.g. 'A1TransformStrategy._aggregate_report'.
+        :param function: The step function.
+        :param args: Positional arguments; the first one is the object owning the step.
+        :param kwargs: Keyword arguments.
+        :param frame_attr: Attribute of the object holding the DataFrame produced by the step;
+            when missing, the returned value is used if it is a DataFrame.
+        :return: The value returned by the step.
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        entry = {"child_peak": 0}
+
+        if self.trace_memory:
+            start_memory = tracemalloc.get_traced_memory()[0]
+            if stack:
+                stack[-1]["child_peak"] = max(stack[-1]["child_peak"], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        stack.append(entry)
+        started_wall = time.perf_counter()
+        started_cpu = time.thread_time()
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            wall = time.perf_counter() - started_wall
+            cpu = time.thread_time() - started_cpu
+            stack.pop()
+
+        record = {
+            "name": name,
+            "depth": len(stack),
+            "thread": threading.current_thread().name,
+            "wall_seconds": wall,
+            "cpu_seconds": cpu,
+        }
+        if self.trace_memory:
+            peak = max(tracemalloc.get_traced_memory()[1], entry["child_peak"])
+            record["peak_bytes"] = peak - start_memory
+            if stack:
+                stack[-1]["child_peak"] = max(stack[-1]["child_peak"], peak)
+
+        frame = getattr(args[0], frame_attr, None) if frame_attr and args else None
+        if not isinstance(frame, pd.DataFrame):
+            frame = result
+        if isinstance(frame, pd.DataFrame):
+            record["rows"], record["columns"] = frame.shape
+
+        with self._lock:
+            self.records.append(record)
+        return result
+
+    def summary(self) -> dict:
+        """
+        :return: Total wall time, CPU time and calls per step name.
+        """
+        summary = {}
+        for record in self.records:
+            totals = summary.setdefault(record["name"], {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0})
+            totals["calls"] += 1
+            totals["wall_seconds"] += record["wall_seconds"]
+            totals["cpu_seconds"] += record["cpu_seconds"]
+        return summary
+
+    def dump(self, path: str, metadata: Optional[dict] = None) -> str:
+        """
+        Writes the recorded steps as a JSON profile.
+
+        :param path: Destination of the JSON file.
+        :param metadata: Additional information stored with the profile, e.g. the input file.
+        :return: The destination path.
+        """
+        profile = {
+            "metadata": {"created": datetime.now().isoformat(timespec="seconds"), "pid": os.getpid(),
+                         **(metadata or {})},
+            "records": self.records,
+            "summary": self.summary(),
+        }
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(profile, file, indent=2, default=str)
+        return path
+
+    @contextmanager
+    def session(self, output_dir: str, run_name: str, sampling_interval: Optional[float] = None,
+                metadata: Optional[dict] = None):
+        """
+        Profiles the body of a `with` block and writes `<run_name>-<timestamp>.json` to `output_dir`,
+        plus a `.folded` flamegraph file when sampling.
+
+        :param output_dir: Directory of the profile files.
+        :param run_name: Name identifying the run, e.g. the processed period.
+        :param sampling_interval: Seconds between stack samples; no sampling when None.
+        :param metadata: Additional information stored with the profile.
+        """
+        self.start(sampling_interval=sampling_interval)
+        try:
+            yield self
+        finally:
+            self.stop()
+            os.makedirs(output_dir, exist_ok=True)
+            base_path = os.path.join(output_dir, f"{run_name}-{datetime.now():%Y%m%d%H%M%S}-{os.getpid()}")
+            self.dump(f"{base_path}.json", {"run": run_name, **(metadata or {})})
+            print(f" Profile written to: {base_path}.json")
+            if self.sampler is not None:
+                self.sampler.write(f"{base_path}.folded")
+                self.sampler = None
+
+    def session_from_env(self, run_name: str, metadata: Optional[dict] = None):
+        """
+        Returns a profiling session configured by environment variables, or a no-op context.
+
+        `ETL_PROFILE_DIR` enables profiling and sets the output directory; `ETL_PROFILE_SAMPLING`
+        set to '1' (or to a sampling interval in seconds, e.g. '0.01') also writes a flamegraph file.
+
+        :param run_name: Name identifying the run.
+        :param metadata: Additional information stored with the profile.
+        """
+        output_dir = os.environ.get(PROFILE_DIR_ENV)
+        if not output_dir:
+            return nullcontext(self)
+
+        sampling = os.environ.get(PROFILE_SAMPLING_ENV, "").strip().lower()
+        interval = None
+        if sampling in ("1", "true", "yes"):
+            interval = DEFAULT_SAMPLING_INTERVAL
+        elif sampling:
+            interval = float(sampling)
+        return self.session(output_dir, run_name, interval, metadata)
+
+
+PROFILER = Profiler()
+
+
+def profiled_step(frame_attr: Optional[str] = None):
+    """
+    Marks a method as a pipeline step recorded by the shared `PROFILER`.
+
+    The step is named after the runtime class of the object and the method, e.g.
+    'ExcelLoadStrategy.load'.
+
+    :param frame_attr: Attribute holding the DataFrame the step produces, e.g. 'df_a1'.
+    :return: Decorator for instance methods.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return method(*args, **kwargs)
+            name = f"{type(args[0]).__name__}.{method.__name__}"
+            return PROFILER.call(name, method, args, kwargs, frame_attr)
+        return wrapper
+    return decorator
@@ -1,6 +1,32 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import NamedTuple
+from instrumentation.profiler import PROFILER
 from load.strategies.abstract_load_strategy import LoadStrategy
 
 
+class LoadResult(NamedTuple):
+    """
+    Outcome of a single report write.
+    """
+    table_type: str
+    path: str
+    seconds: float
+
+
+def _timed_load(strategy: LoadStrategy, save_path: str) -> LoadResult:
+    """
+    Runs one load strategy and measures its duration.
+
+    :param strategy: Load strategy to execute.
+    :param save_path: Directory passed to the strategy.
+    :return: LoadResult with the saved path and write duration.
+    """
+    started = time.perf_counter()
+    path = strategy.load(save_path)
+    return LoadResult(getattr(strategy, "table_type", ""), path, time.perf_counter() - started)
+
+
 class Load:
     def __init__(self, strategy: LoadStrategy) -> None:
         """
@@ -26,11 +52,33 @@ class Load:
         """
         self._strategy = strategy
 
-    def load_data(self):
+    def load_data(self, save_path: str):
         """
+        :param save_path: Destination passed to the strategy, e.g. the output directory.
         :return: Load the data to database by the current strategy.
         """
-        self._strategy.load()
+        return self._strategy.load(save_path)
 
+    @staticmethod
+    def load_concurrently(strategies: list, save_path: str, max_workers: int = 3,
+                          use_processes: bool = False) -> list:
+        """
+        Runs several load strategies at the same time on a bounded pool.
 
+        Threads suit writers that release the GIL (Parquet, Arrow IPC, CSV); openpyxl-based
+        xlsx writing is pure Python, so several xlsx reports are better written with processes.
+        While the profiler traces memory, the reports are written one at a time: the traced peak
+        is process wide, so concurrent writes would reset each other's peaks.
 
+        :param strategies: Load strategies to execute.
+        :param save_path: Directory passed to every strategy.
+        :param max_workers: Maximum number of concurrent writes.
+        :param use_processes: Use a process pool instead of a thread pool.
+        :return: List of LoadResult (table type, saved path, seconds), in the order of `strategies`.
+        """
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        if PROFILER.traces_memory:
+            max_workers = 1
+        with executor_class(max_workers=max_workers) as executor:
+            futures = [executor.submit(_timed_load, strategy, save_path) for strategy in strategies]
+            return [future.result() for future in futures]
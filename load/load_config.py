@@ -0,0 +1,16 @@
+from pipeline.registry import LazyRegistry
+
+# Strategy classes are imported on first use, so reading the formats does not import pandas or pyarrow.
+LOAD_STRATEGIES = LazyRegistry({
+    "xlsx": "load.strategies.excel_load_strategy:ExcelLoadStrategy",
+    "parquet": "load.strategies.parquet_load_strategy:ParquetLoadStrategy",
+    "csv": "load.strategies.csv_load_strategy:CsvLoadStrategy",
+    "arrow": "load.strategies.arrow_load_strategy:ArrowLoadStrategy",
+    "sqlite": "load.strategies.sqlite_load_strategy:SqliteLoadStrategy",
+})
+
+REPORT_FORMATS = {
+    "A1": "xlsx",
+    "B1": "xlsx",
+    "C1": "xlsx",
+}
@@ -1,3 +1,8 @@
+import argparse
+import os
+import uuid
+from typing import Callable
+
 
 class LoadUtils:
 
@@ -7,11 +12,84 @@ class LoadUtils:
         Generates the report filename in the format EP<YY><MM><TableType>,
         e.g., EP2412C1 for December 2024 C1 report.
 
-        :param table_type: Report table identifier, e.g. 'A1', 'B1', 'C1'.
+        :param raport_type: Report table identifier, e.g. 'A1', 'B1', 'C1'.
         :param year: Full year, e.g. 2024.
         :param month: Month as integer, e.g. 4 or 12.
         :return: Formatted filename string.
         """
-        year_suffix = str(year)[-2:]
+        year_suffix = str(year)[-2:].zfill(2)
         month_str = str(month).zfill(2)
         return f"EP{year_suffix}{month_str}{raport_type}"
+
+    @staticmethod
+    def get_load_strategy(file_format: str):
+        """
+        Returns the load strategy class for an output format.
+
+        :param file_format: One of the keys of `LOAD_STRATEGIES`, e.g. 'xlsx', 'parquet', 'csv', 'arrow'.
+        :return: LoadStrategy subclass taking (df, table_type, year, month).
+        :raises ValueError: If the format is not supported.
+        """
+        from load.load_config import LOAD_STRATEGIES
+
+        if file_format not in LOAD_STRATEGIES:
+            raise ValueError(f"Unsupported report format: {file_format}. Available: {list(LOAD_STRATEGIES)}")
+        return LOAD_STRATEGIES[file_format]
+
+    @staticmethod
+    def parse_format_option(option: str) -> tuple:
+        """
+        Parses a REPORT=FORMAT command line option; used as the argparse `type` of --format, so a
+        wrong report or format is reported as a usage error before anything is read.
+
+        :param option: Option value, e.g. 'A1=parquet'.
+        :return: (report type, format) tuple.
+        :raises argparse.ArgumentTypeError: If the option is malformed or the report or format is unknown.
+        """
+        from load.load_config import LOAD_STRATEGIES, REPORT_FORMATS
+
+        report_type, separator, file_format = option.partition("=")
+        if not separator:
+            raise argparse.ArgumentTypeError(f"expected REPORT=FORMAT, got '{option}'")
+        if report_type not in REPORT_FORMATS:
+            raise argparse.ArgumentTypeError(f"unknown report '{report_type}', available: {', '.join(REPORT_FORMATS)}")
+        if file_format not in LOAD_STRATEGIES:
+            raise argparse.ArgumentTypeError(f"unsupported format '{file_format}', "
+                                             f"available: {', '.join(LOAD_STRATEGIES)}")
+        return report_type, file_format
+
+    @staticmethod
+    def atomic_write(full_path: str, writer: Callable[[str], None]) -> str:
+        """
+        Writes a file so that readers see either the previous version or the complete new one.
+
+        - The writer saves to a hidden temporary file in the destination directory,
+          keeping the extension so format detection (e.g. by pandas) still works.
+        - The temporary file is flushed to disk with fsync.
+        - It then replaces the destination atomically, and the directory entry is synced where supported.
+
+        :param full_path: Final path of the file.
+        :param writer: Callable writing the content to the path it receives.
+        :return: The final path.
+        """
+        directory, filename = os.path.split(full_path)
+        stem, extension = os.path.splitext(filename)
+        temp_path = os.path.join(directory, f".~{stem}.{uuid.uuid4().hex}{extension}")
+
+        try:
+            writer(temp_path)
+            with open(temp_path, "rb+") as file:
+                os.fsync(file.fileno())
+            os.replace(temp_path, full_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        if hasattr(os, "O_DIRECTORY"):
+            directory_fd = os.open(directory or ".", os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(directory_fd)
+            finally:
+                os.close(directory_fd)
+        return full_path
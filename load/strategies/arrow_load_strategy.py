@@ -0,0 +1,20 @@
+import pyarrow as pa
+import pyarrow.ipc as ipc
+from load.strategies.file_load_strategy import FileLoadStrategy
+
+
+class ArrowLoadStrategy(FileLoadStrategy):
+    """
+    Saves a report as an Arrow IPC file, which readers can memory-map without decoding.
+    """
+
+    extension = "arrow"
+
+    def _write(self, full_path: str) -> None:
+        """
+        :param full_path: Destination path of the .arrow file.
+        """
+        table = pa.Table.from_pandas(self.df, preserve_index=False)
+        with pa.OSFile(full_path, "wb") as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
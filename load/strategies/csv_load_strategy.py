@@ -0,0 +1,15 @@
+from load.strategies.file_load_strategy import FileLoadStrategy
+
+
+class CsvLoadStrategy(FileLoadStrategy):
+    """
+    Saves a report as a UTF-8 CSV file.
+    """
+
+    extension = "csv"
+
+    def _write(self, full_path: str) -> None:
+        """
+        :param full_path: Destination path of the .csv file.
+        """
+        self.df.to_csv(full_path, index=False, encoding="utf-8")
@@ -1,33 +1,15 @@
-import os
-import pandas as pd
-from load.load_utils import LoadUtils
-from load.strategies.abstract_load_strategy import LoadStrategy
+from load.strategies.file_load_strategy import FileLoadStrategy
 
 
-class ExcelLoadStrategy(LoadStrategy):
-    def __init__(self, df: pd.DataFrame, table_type: str, year: int, month: int):
-        """
-        Initializes the Excel load strategy.
+class ExcelLoadStrategy(FileLoadStrategy):
+    """
+    Saves a report as an Excel (.xlsx) file.
+    """
 
-        :param df: DataFrame to be saved.
-        :param table_type: Report type (e.g., "A1", "B1", "C1").
-        :param year: Full year (e.g., 2024).
-        :param month: Month as an integer (1–12).
-        """
-        self.df = df
-        self.table_type = table_type
-        self.year = int(str(year)[-2:])
-        self.month = month
+    extension = "xlsx"
 
-    def load(self, save_path: str) -> str:
+    def _write(self, full_path: str) -> None:
         """
-        Saves the DataFrame as an Excel file with the proper filename format.
-
-        :param save_path: Directory where the file should be saved.
-        :return: Full path to the saved Excel file.
+        :param full_path: Destination path of the .xlsx file.
         """
-        filename = LoadUtils.generate_report_filename(self.table_type, self.year, self.month)
-        full_path = os.path.join(save_path, f"{filename}.xlsx")
         self.df.to_excel(full_path, index=False)
-        print(f" Saved report {self.table_type} to: {full_path}")
-        return full_path
@@ -0,0 +1,61 @@
+import os
+from abc import abstractmethod
+import pandas as pd
+from load.load_utils import LoadUtils
+from load.strategies.abstract_load_strategy import LoadStrategy
+from instrumentation.profiler import profiled_step
+
+
+class FileLoadStrategy(LoadStrategy):
+    """
+    Base class for strategies saving a report as a single EP<YY><MM><TableType> file.
+
+    Subclasses define the file `extension` and how the DataFrame is written.
+    """
+
+    extension = ""
+
+    def __init__(self, df: pd.DataFrame, table_type: str, year: int, month: int):
+        """
+        Initializes the file load strategy.
+
+        :param df: DataFrame to be saved.
+        :param table_type: Report type (e.g., "A1", "B1", "C1").
+        :param year: Full or two-digit year (e.g., 2024 or "24").
+        :param month: Month as an integer (1–12).
+        """
+        self.df = df
+        self.table_type = table_type
+        self.year = int(str(year)[-2:])
+        self.month = month
+
+    def filename(self) -> str:
+        """
+        :return: Report filename with extension, e.g. EP2412C1.xlsx.
+        """
+        return f"{LoadUtils.generate_report_filename(self.table_type, self.year, self.month)}.{self.extension}"
+
+    @abstractmethod
+    def _write(self, full_path: str) -> None:
+        """
+        Writes `self.df` to the given path.
+
+        :param full_path: Destination file path.
+        """
+        pass
+
+    @profiled_step("df")
+    def load(self, save_path: str) -> str:
+        """
+        Saves the DataFrame in the directory with the proper filename format.
+
+        The file is written atomically (see `LoadUtils.atomic_write`), so a crash never
+        leaves a half-written report under the final name.
+
+        :param save_path: Directory where the file should be saved.
+        :return: Full path to the saved file.
+        """
+        full_path = os.path.join(save_path, self.filename())
+        LoadUtils.atomic_write(full_path, self._write)
+        print(f" Saved report {self.table_type} to: {full_path}")
+        return full_path
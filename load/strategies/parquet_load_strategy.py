@@ -0,0 +1,15 @@
+from load.strategies.file_load_strategy import FileLoadStrategy
+
+
+class ParquetLoadStrategy(FileLoadStrategy):
+    """
+    Saves a report as a Parquet file.
+    """
+
+    extension = "parquet"
+
+    def _write(self, full_path: str) -> None:
+        """
+        :param full_path: Destination path of the .parquet file.
+        """
+        self.df.to_parquet(full_path, index=False, engine="pyarrow")
@@ -0,0 +1,213 @@
+import os
+import sqlite3
+import pandas as pd
+from load.strategies.abstract_load_strategy import LoadStrategy
+from instrumentation.profiler import profiled_step
+
+
+class SqliteLoadStrategy(LoadStrategy):
+    """
+    Saves a report into a SQLite database, one table per report type (e.g. GUS_A1).
+
+    Rows are keyed by (YEAR, PERIOD, TABLE, RAIRPORT, LINE), where LINE is the position of the row
+    within its period; report rows have no natural key (B1 repeats its columns per aircraft type).
+    The period comes first in the key, so the rows of a period can be read without a table scan.
+    YEAR is stored as a four-digit INTEGER, whatever the report column holds. Loading a period
+    again deletes its rows and inserts the new ones in the same transaction, so a corrected month
+    replaces exactly its own rows and readers never see a mix of both versions.
+
+    The report is written in one transaction with batched `executemany` calls. The database uses
+    WAL journaling, so readers are not blocked while a period is being loaded. Tables are
+    clustered by their key (WITHOUT ROWID), so the rows of a period stay together as years of
+    months accumulate.
+    """
+
+    database_name = "reports.sqlite"
+    key_columns = ["YEAR", "PERIOD", "TABLE", "RAIRPORT"]
+    year_column = "YEAR"
+    line_column = "LINE"
+    batch_size = 10_000
+    busy_timeout = 60.0
+
+    def __init__(self, df: pd.DataFrame, table_type: str, year: int, month: int):
+        """
+        Initializes the database load strategy.
+
+        :param df: DataFrame to be saved.
+        :param table_type: Report type (e.g., "A1", "B1", "C1").
+        :param year: Full or two-digit year (e.g., 2024 or "24").
+        :param month: Month as an integer (1–12).
+        """
+        self.df = df
+        self.table_type = table_type
+        self.year = self.full_year(year)
+        self.month = month
+
+    @staticmethod
+    def full_year(year) -> int:
+        """
+        :param year: Full or two-digit year, as an integer or a string (e.g., 2024, "2024" or "24").
+        :return: Four-digit year; two-digit years are years of the 2000s, like the report periods.
+        """
+        year = int(year)
+        return year + 2000 if year < 100 else year
+
+    def database_path(self, save_path: str) -> str:
+        """
+        :param save_path: Output directory, or the path of a .sqlite/.db file.
+        :return: Path of the database file.
+        """
+        if save_path.lower().endswith((".sqlite", ".db")):
+            return save_path
+        return os.path.join(save_path, self.database_name)
+
+    def table_name(self) -> str:
+        """
+        :return: Name of the report table, e.g. GUS_A1.
+        """
+        return f"GUS_{self.table_type}"
+
+    @staticmethod
+    def _quote(name: str) -> str:
+        """
+        :return: SQL identifier; report columns contain spaces, e.g. "PAX ON BOARD".
+        """
+        return '"' + name.replace('"', '""') + '"'
+
+    def _sql_type(self, column: str, dtype) -> str:
+        """
+        :return: SQLite column type for a report column of a pandas dtype.
+        """
+        if column == self.year_column or pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+            return "INTEGER"
+        if pd.api.types.is_float_dtype(dtype):
+            return "REAL"
+        return "TEXT"
+
+    def _ensure_table(self, connection: sqlite3.Connection) -> None:
+        """
+        Creates the report table, or adds the report columns it does not have yet.
+        """
+        table = self._quote(self.table_name())
+        key = [*self.key_columns, self.line_column]
+        definitions = [f"{self._quote(column)} {self._sql_type(column, dtype)}"
+                       for column, dtype in self.df.dtypes.items()]
+        definitions.append(f"{self._quote(self.line_column)} INTEGER NOT NULL")
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(definitions)}, "
+            f"PRIMARY KEY ({', '.join(self._quote(column) for column in key)})) WITHOUT ROWID"
+        )
+
+        existing = {row[1]: row[2] for row in connection.execute(f"PRAGMA table_info({table})")}
+        if existing.get(self.year_column, "INTEGER") != "INTEGER":
+            self._migrate_year(connection, list(existing))
+        for column, dtype in self.df.dtypes.items():
+            if column not in existing:
+                connection.execute(f"ALTER TABLE {table} ADD COLUMN {self._quote(column)} "
+                                   f"{self._sql_type(column, dtype)}")
+
+    def _migrate_year(self, connection: sqlite3.Connection, columns: list) -> None:
+        """
+        Rebuilds a table written with two-digit TEXT years, storing YEAR as a four-digit INTEGER.
+
+        :param columns: Columns of the existing table, in their order.
+        """
+        table = self._quote(self.table_name())
+        old_table = self._quote(f"{self.table_name()}_two_digit_years")
+        connection.execute(f"ALTER TABLE {table} RENAME TO {old_table}")
+        types = {row[1]: row[2] for row in connection.execute(f"PRAGMA table_info({old_table})")}
+        key = [*self.key_columns, self.line_column]
+        definitions = [f"{self._quote(column)} "
+                       f"{'INTEGER' if column == self.year_column else types[column]}"
+                       f"{' NOT NULL' if column == self.line_column else ''}" for column in columns]
+        connection.execute(
+            f"CREATE TABLE {table} ({', '.join(definitions)}, "
+            f"PRIMARY KEY ({', '.join(self._quote(column) for column in key)})) WITHOUT ROWID"
+        )
+        year = self._quote(self.year_column)
+        selected = [f"CASE WHEN CAST({year} AS INTEGER) < 100 THEN CAST({year} AS INTEGER) + 2000 "
+                    f"ELSE CAST({year} AS INTEGER) END" if column == self.year_column else self._quote(column)
+                    for column in columns]
+        connection.execute(f"INSERT INTO {table} ({', '.join(self._quote(column) for column in columns)}) "
+                           f"SELECT {', '.join(selected)} FROM {old_table}")
+        connection.execute(f"DROP TABLE {old_table}")
+
+    def _key_frame(self) -> pd.DataFrame:
+        """
+        :return: Key columns of the report, with YEAR as four-digit years.
+        """
+        keys = self.df[self.key_columns].copy()
+        keys[self.year_column] = [self.full_year(year) for year in keys[self.year_column]]
+        return keys
+
+    def _rows(self) -> list:
+        """
+        :return: Report rows as tuples of Python values (None for missing values), followed by LINE.
+        """
+        columns = []
+        for column in self.df.columns:
+            series = self.df[column]
+            if column == self.year_column:
+                columns.append([self.full_year(year) for year in series])
+            else:
+                columns.append(series.astype(object).where(series.notna(), None).tolist())
+        lines = self.df.groupby(self.key_columns, sort=False, dropna=False).cumcount().tolist()
+        return list(zip(*columns, lines))
+
+    def _insert_sql(self) -> str:
+        """
+        :return: INSERT statement of one report row.
+        """
+        columns = [*self.df.columns, self.line_column]
+        return (f"INSERT INTO {self._quote(self.table_name())} "
+                f"({', '.join(self._quote(column) for column in columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})")
+
+    def _delete_periods(self, connection: sqlite3.Connection) -> None:
+        """
+        Deletes the rows of every (YEAR, PERIOD, TABLE, RAIRPORT) slice present in the report.
+        """
+        slices = self._key_frame().drop_duplicates()
+        condition = " AND ".join(f"{self._quote(column)} IS ?" for column in self.key_columns)
+        connection.executemany(
+            f"DELETE FROM {self._quote(self.table_name())} WHERE {condition}",
+            [tuple(None if pd.isna(value) else value for value in key)
+             for key in slices.astype(object).itertuples(index=False, name=None)],
+        )
+
+    @profiled_step("df")
+    def load(self, save_path: str) -> str:
+        """
+        Replaces the periods of the report in its table in a single transaction.
+
+        :param save_path: Output directory (the database is `database_name` inside it) or database file path.
+        :return: Path of the database file.
+        :raises ValueError: If the report lacks one of the key columns.
+        """
+        missing_columns = [column for column in self.key_columns if column not in self.df.columns]
+        if missing_columns:
+            raise ValueError(f"Missing key columns in report {self.table_type}: {missing_columns}")
+
+        path = self.database_path(save_path)
+        rows = self._rows()
+        sql = self._insert_sql()
+
+        connection = sqlite3.connect(path, timeout=self.busy_timeout, isolation_level=None)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._ensure_table(connection)
+                self._delete_periods(connection)
+                for start in range(0, len(rows), self.batch_size):
+                    connection.executemany(sql, rows[start:start + self.batch_size])
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        finally:
+            connection.close()
+
+        print(f" Saved report {self.table_type} to: {path} (table {self.table_name()})")
+        return path
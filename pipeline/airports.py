@@ -0,0 +1,216 @@
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional
+from load.load_utils import LoadUtils
+from pipeline.batch import BatchRunner, _init_worker, _process_month
+from transform.transform_utils import TransformUtils
+
+AIRPORTS_DIR = os.path.join("boxes", "airports")
+
+
+def airport_paths(rairport: str, root: str = AIRPORTS_DIR) -> dict:
+    """
+    Lists the directories of one reporting airport, all under `root/<ICAO code>`.
+
+    :param rairport: ICAO code of the reporting airport, e.g. "EPGD".
+    :param root: Directory of all airports.
+    :return: Dictionary with the "inbox" root (holding `inflot/inbox` and `total_table/inbox`),
+        "output" (reports, manifest and partials) and "history" directories.
+    """
+    base = os.path.join(root, rairport)
+    return {
+        "inbox": base,
+        "output": os.path.join(base, "reports"),
+        "history": os.path.join(base, "history"),
+    }
+
+
+def output_dirs(airports: dict, root: str = AIRPORTS_DIR) -> dict:
+    """
+    Resolves the output directory of every airport: its "output_dir", or the one of `airport_paths`.
+
+    Report files and the manifest are not named after the airport, so two airports writing to the
+    same directory would overwrite each other's reports, manifest and partials.
+
+    :param airports: ICAO code -> input paths, as returned by `load_airports`.
+    :param root: Directory of the per-airport directories.
+    :return: ICAO code -> output directory.
+    :raises ValueError: If two airports share an output directory.
+    """
+    directories = {}
+    owners = {}
+    for rairport, entry in airports.items():
+        directories[rairport] = entry.get("output_dir", airport_paths(rairport, root)["output"])
+        key = os.path.normcase(os.path.abspath(directories[rairport]))
+        if key in owners:
+            raise ValueError(f"Airports {owners[key]} and {rairport} share the output directory {directories[rairport]}")
+        owners[key] = rairport
+    return directories
+
+
+def load_airports(path: str, root: str = AIRPORTS_DIR) -> dict:
+    """
+    Reads the airports configuration, a JSON object mapping the ICAO code of every reporting
+    airport to its inputs:
+
+        {"EPGD": {"inflot_dir": "exports/gdansk", "total_path": "exports/gdansk/TOTAL.xlsx"}}
+
+    An airport may also give its own "output_dir" instead of the one under the airports directory;
+    output directories must differ between airports (see `output_dirs`).
+
+    :param path: Path of the JSON file.
+    :param root: Directory of the per-airport directories.
+    :return: ICAO code -> input paths.
+    :raises ValueError: If the file does not describe any airport, an entry is not valid or two
+        airports share an output directory.
+    """
+    with open(path, encoding="utf-8") as file:
+        airports = json.load(file)
+    if not isinstance(airports, dict) or not airports:
+        raise ValueError(f"{path} does not describe any airport")
+    for rairport, entry in airports.items():
+        if not re.fullmatch(r"[A-Z]{4}", rairport):
+            raise ValueError(f"Airport {rairport!r} is not an ICAO code")
+        missing = [key for key in ("inflot_dir", "total_path") if key not in entry]
+        if missing:
+            raise ValueError(f"Airport {rairport} has no {', '.join(missing)}")
+    output_dirs(airports, root)
+    return airports
+
+
+class MultiAirportRunner:
+    """
+    Generates the reports of many reporting airports on one pool of worker processes.
+
+    Every airport is a `BatchRunner` with its own Inflot exports, TOTAL workbook, inbox, output
+    directory (reports, manifest, partials) and history store, so airports never share a file.
+    The runners are prepared in the parent process (preflight, TOTAL parsed and cached, plan);
+    every worker then memory-maps the CARGO sheet of each airport once and takes (airport, month)
+    tasks from a single queue. Workers are not split between airports, so a pool stays busy as
+    long as any airport has months left, and throughput grows with the number of workers.
+    """
+
+    def __init__(self, airports: dict, root: str = AIRPORTS_DIR, max_workers: Optional[int] = None,
+                 cache_dir: str = os.path.join("boxes", "cache"), formats: Optional[dict] = None,
+                 incremental: bool = True, history: bool = False, preflight: bool = True,
+                 partials: bool = False) -> None:
+        """
+        :param airports: ICAO code -> input paths, as returned by `load_airports`.
+        :raises ValueError: If two airports share an output directory.
+        :param root: Directory of the per-airport directories, see `airport_paths`.
+        :param max_workers: Number of worker processes, defaults to the number of CPUs.
+        :param cache_dir: Directory of the FrameCache shared by all airports.
+        :param formats: Output format per report type; missing reports use `REPORT_FORMATS`.
+        :param incremental: Skip reports that are up to date according to each airport's manifest.
+        :param history: Store the flight records in each airport's history store.
+        :param preflight: Check the header rows of the inputs of each airport first.
+        :param partials: Store the A1/C1 aggregates of every month in each airport's output directory,
+            for rollups.
+        """
+        self.max_workers = max_workers
+        self.runners = {}
+        directories = output_dirs(airports, root)
+        for rairport, entry in airports.items():
+            paths = airport_paths(rairport, root)
+            self.runners[rairport] = BatchRunner(
+                entry["inflot_dir"], entry["total_path"], directories[rairport],
+                max_workers=max_workers, cache_dir=cache_dir, formats=formats, incremental=incremental,
+                history_dir=paths["history"] if history else None, preflight=preflight,
+                rairport=rairport, inbox_root=paths["inbox"], partials=partials,
+            )
+
+    def prepare(self) -> list:
+        """
+        Prepares every airport; an airport whose TOTAL workbook cannot be used is reported and skipped.
+
+        :return: (ICAO code, `_process_month` arguments) tuples, alternating between airports so
+            all of them progress at the same pace.
+        """
+        queues = []
+        for rairport, runner in self.runners.items():
+            try:
+                queues.append([(rairport, task) for task in runner.prepare()])
+            except (FileNotFoundError, ValueError) as error:
+                print(f" {rairport}: skipped, {error}")
+        tasks = []
+        for index in range(max(map(len, queues), default=0)):
+            tasks.extend(queue[index] for queue in queues if index < len(queue))
+        return tasks
+
+    def run(self) -> dict:
+        """
+        Processes the outdated months of every airport in parallel. A month that fails is kept in
+        the `failures` of its airport's runner and the other months are still built.
+
+        :return: ICAO code -> result dictionaries of its built months, sorted by period.
+        """
+        tasks = self.prepare()
+        results = {rairport: [] for rairport in self.runners}
+        if not tasks:
+            return results
+
+        total_sources = {rairport: runner.total_source for rairport, runner in self.runners.items()
+                         if runner.total_source is not None}
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                 initargs=(total_sources,)) as executor:
+            futures = {executor.submit(_process_month, *task): rairport for rairport, task in tasks}
+            for future in as_completed(futures):
+                rairport = futures[future]
+                result = future.result()
+                if self.runners[rairport].record(result):
+                    results[rairport].append(result)
+
+        return {rairport: sorted(months, key=lambda result: result["period"]) for rairport, months in results.items()}
+
+    def failures(self) -> dict:
+        """
+        :return: (ICAO code, Inflot path) -> period and error message of every month that failed in
+            the last `run`.
+        """
+        return {(rairport, inflot_path): failure for rairport, runner in self.runners.items()
+                for inflot_path, failure in runner.failures.items()}
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(prog="airports", description="Generate GUS A1/B1/C1 reports for many "
+                                                                  "reporting airports in parallel.")
+    parser.add_argument("config", help="JSON file mapping ICAO codes to their inflot_dir and total_path.")
+    parser.add_argument("--root", default=AIRPORTS_DIR, help="Directory of the per-airport directories.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    parser.add_argument("--format", action="append", default=[], type=LoadUtils.parse_format_option,
+                        metavar="REPORT=FORMAT",
+                        help="Output format of a report, e.g. A1=parquet. Can be repeated.")
+    parser.add_argument("--force", action="store_true", help="Rebuild all reports, even those up to date.")
+    parser.add_argument("--history", action="store_true",
+                        help="Store the flight records in each airport's history store.")
+    parser.add_argument("--partials", action="store_true",
+                        help="Store the monthly A1/C1 aggregates the rollup command merges.")
+    args = parser.parse_args(argv)
+    TransformUtils.enable_copy_on_write()
+
+    try:
+        airports = load_airports(args.config, args.root)
+    except (OSError, ValueError) as error:
+        print(error, file=sys.stderr)
+        sys.exit(1)
+
+    formats = dict(args.format)
+    started = time.perf_counter()
+    runner = MultiAirportRunner(airports, args.root, args.workers, formats=formats, incremental=not args.force,
+                                history=args.history, partials=args.partials)
+    results = runner.run()
+    months = sum(len(airport_results) for airport_results in results.values())
+    failures = runner.failures()
+    print(f" {len(results)} airports, {months} months built, {len(failures)} failed "
+          f"in {time.perf_counter() - started:.2f}s")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional
+import pandas as pd
+from extract.extract_utils import ExtractUtils
+from extract.frame_cache import FrameCache
+from extract.strategies.inflot_extract_strategy import InflotExtractStrategy
+from extract.strategies.total_table_extract_strategy import TotalTableExtractStrategy
+from instrumentation.profiler import PROFILER
+from load.load import Load
+from load.load_config import REPORT_FORMATS
+from load.load_utils import LoadUtils
+from pipeline.history_store import HISTORY_DIR, FlightHistoryStore
+from pipeline.manifest import MANIFEST_NAME, BuildManifest, TotalFingerprints
+from pipeline.preflight import INFLOT_PATTERNS, Preflight
+from pipeline.rollup import PARTIAL_REPORTS, PARTIALS_NAME, PartialStore
+from transform.inflot_schema import DTYPE_BACKENDS, INFLOT_SCHEMAS
+from transform.report_runner import ReportRunner
+from transform.rollup import ReportPartial
+from transform.strategies.report_config import DEFAULT_RAIRPORT
+from transform.transform_utils import TransformUtils
+
+TOTAL_READ_OPTIONS = {"sheet_name": "CARGO", "header": None}
+
+# CARGO sheets of the current worker process per reporting airport, set once by `_init_worker`.
+_worker_totals = {}
+
+
+def _init_worker(total_sources: dict) -> None:
+    """
+    Makes the CARGO sheets available to a worker process.
+
+    :param total_sources: Reporting airport -> path of the cached Arrow file with its CARGO sheet,
+        memory-mapped here, or the DataFrame itself when it could not be cached.
+    """
+    # Workers started with "spawn" do not inherit the option set by the command.
+    TransformUtils.enable_copy_on_write()
+    for rairport, total_source in total_sources.items():
+        if isinstance(total_source, pd.DataFrame):
+            _worker_totals[rairport] = total_source
+        else:
+            _worker_totals[rairport] = FrameCache(os.path.dirname(total_source)).load(total_source)
+
+
+def _process_month(inflot_path: str, output_dir: str, cache_dir: str, formats: dict,
+                   history_dir: Optional[str] = None, rairport: str = DEFAULT_RAIRPORT,
+                   inbox_path: Optional[str] = None, dtype_backend: str = "numpy",
+                   partials_dir: Optional[str] = None) -> dict:
+    """
+    Extracts one Inflot export, builds its reports and saves them.
+
+    :param inflot_path: Path to the monthly Inflot export.
+    :param output_dir: Directory where the reports are written.
+    :param cache_dir: Directory of the FrameCache shared by all workers.
+    :param formats: Output format per report to build, e.g. {"A1": "xlsx", "C1": "parquet"}; reports
+        needed only as dependencies (A1 for B1) are computed but not saved.
+    :param history_dir: Directory of the FlightHistoryStore receiving the flight records, None to skip it.
+    :param rairport: Reporting airport of the export; its CARGO sheet was given to `_init_worker`.
+    :param inbox_path: Inflot inbox the export is copied to, the default inbox when None.
+    :param dtype_backend: Key of `INFLOT_SCHEMAS` giving the dtypes of the extracted columns.
+    :param partials_dir: Directory of the PartialStore receiving the A1/C1 aggregates of the month,
+        None to skip it.
+    :return: Dictionary with the period, saved report paths and stage timings in seconds. When the
+        month fails, a dictionary with the Inflot path, the period (None if the export could not be
+        read) and the "error" message instead; the error is returned rather than raised, since
+        some exceptions (e.g. of pyarrow) cannot be sent back from a worker process.
+    """
+    run_name = os.path.splitext(os.path.basename(inflot_path))[0]
+    progress = {"period": None}
+    try:
+        with PROFILER.session_from_env(run_name, {"inflot": inflot_path, "rairport": rairport}):
+            return _run_month(inflot_path, output_dir, cache_dir, formats, history_dir, rairport, inbox_path,
+                              dtype_backend, partials_dir, progress)
+    except Exception as error:
+        return {"inflot": inflot_path, "rairport": rairport, "period": progress["period"],
+                "error": f"{type(error).__name__}: {error}"}
+
+
+def _run_month(inflot_path: str, output_dir: str, cache_dir: str, formats: dict,
+               history_dir: Optional[str] = None, rairport: str = DEFAULT_RAIRPORT,
+               inbox_path: Optional[str] = None, dtype_backend: str = "numpy",
+               partials_dir: Optional[str] = None, progress: Optional[dict] = None) -> dict:
+    """
+    Body of `_process_month`, profiled as one run when `ETL_PROFILE_DIR` is set.
+
+    :param progress: Receives the "period" of the export as soon as it is extracted.
+    """
+    started = time.perf_counter()
+    df_inflot = InflotExtractStrategy(inflot_path, cache=FrameCache(cache_dir), schema=INFLOT_SCHEMAS[dtype_backend],
+                                      inbox_path=inbox_path).retrive_data()
+    if isinstance(df_inflot, str):
+        raise FileNotFoundError(df_inflot)
+    extract_seconds = time.perf_counter() - started
+    if progress is not None:
+        progress["period"] = TransformUtils.get_middle_record_data(df_inflot).strftime("%y%m")
+
+    result = build_reports(df_inflot, _worker_totals[rairport], output_dir, formats, history_dir, partials_dir,
+                           rairport)
+    result["inflot"] = inflot_path
+    result["timings"] = {"extract": extract_seconds, **result["timings"], "total": time.perf_counter() - started}
+    return result
+
+
+def build_reports(df_inflot: pd.DataFrame, df_total: pd.DataFrame, output_dir: str, formats: dict,
+                  history_dir: Optional[str] = None, partials_dir: Optional[str] = None,
+                  rairport: str = DEFAULT_RAIRPORT) -> dict:
+    """
+    Transforms one extracted Inflot export and saves its reports.
+
+    :param df_inflot: Extracted Inflot export.
+    :param df_total: CARGO sheet of the TOTAL table.
+    :param output_dir: Directory where the reports are written.
+    :param formats: Output format per report to build; reports needed only as dependencies are not saved.
+    :param history_dir: Directory of the FlightHistoryStore receiving the flight records of the
+        export, None to skip it.
+    :param partials_dir: Directory of the PartialStore receiving the mergeable A1/C1 aggregates of
+        the month for rollups, None (default) to skip it. A1 and C1 are then computed even when not
+        requested.
+    :param rairport: ICAO code of the reporting airport the export belongs to.
+    :return: Dictionary with the period, saved report paths and transform/load timings in seconds
+        (and the history path and timing when stored).
+    """
+    timings = {}
+    stage_started = time.perf_counter()
+    date = TransformUtils.get_middle_record_data(df_inflot)
+    with ReportRunner(df_inflot, df_total, rairport=rairport) as runner:
+        reports = runner.run()
+        frames = reports.compute(list(formats))
+        if partials_dir is not None:
+            PartialStore(partials_dir).save(ReportPartial.from_bundle(reports, df_total, date.year, date.month))
+    year, month = reports.get_year_month()
+    timings["transform"] = time.perf_counter() - stage_started
+
+    stage_started = time.perf_counter()
+    loaders = [
+        LoadUtils.get_load_strategy(formats[report_type])(df, report_type, year, month)
+        for report_type, df in frames.items()
+    ]
+    saved = {result.table_type: result.path for result in Load.load_concurrently(loaders, output_dir)}
+    timings["load"] = time.perf_counter() - stage_started
+
+    result = {"period": f"{year}{str(month).zfill(2)}", "year": int(date.strftime("%Y")), "month": date.month,
+              "rairport": rairport, "reports": saved, "timings": timings}
+    if history_dir is not None:
+        stage_started = time.perf_counter()
+        result["history"] = FlightHistoryStore(history_dir).write(df_inflot, result["year"], result["month"])
+        timings["history"] = time.perf_counter() - stage_started
+    return result
+
+
+class BatchRunner:
+    """
+    Generates A1/B1/C1 reports for many months at once.
+
+    The TOTAL workbook is parsed once in the parent process and cached as an Arrow file; every
+    worker process memory-maps that file once when it starts, so the CARGO sheet is not parsed
+    again nor pickled with each task.
+
+    Built reports are recorded in a `BuildManifest` in the output directory. Later runs build
+    only the reports whose Inflot export, CARGO period region, configuration or format changed.
+
+    `run` is `prepare`, the tasks on a process pool and `record` of every result; a
+    `MultiAirportRunner` does the same for many runners on one shared pool. A month that fails is
+    reported and kept in `failures`, and the other months are still built.
+    """
+
+    def __init__(self, inflot_dir: str, total_path: str, output_dir: str,
+                 max_workers: Optional[int] = None, cache_dir: str = os.path.join("boxes", "cache"),
+                 formats: Optional[dict] = None, incremental: bool = True,
+                 manifest_path: Optional[str] = None, history_dir: Optional[str] = None,
+                 preflight: bool = True, rairport: str = DEFAULT_RAIRPORT,
+                 inbox_root: Optional[str] = None, dtype_backend: str = "numpy", partials: bool = False) -> None:
+        """
+        :param inflot_dir: Directory containing monthly Inflot exports (.xls/.xlsx).
+        :param total_path: Path to the TOTAL workbook.
+        :param output_dir: Directory where the EPyymmXX reports are written.
+        :param max_workers: Number of worker processes, defaults to the number of CPUs.
+        :param cache_dir: Directory of the FrameCache used for parsed workbooks.
+        :param formats: Output format per report type; missing reports use `REPORT_FORMATS`.
+        :param incremental: Skip reports that are up to date according to the manifest; when False,
+            every report is built again (and recorded).
+        :param manifest_path: Path of the manifest file, `MANIFEST_NAME` in `output_dir` by default.
+        :param history_dir: Directory of the FlightHistoryStore receiving the flight records of every
+            processed export, None (default) to skip it.
+        :param preflight: Check the header rows of all inputs first; exports failing the check are
+            skipped and a failing TOTAL workbook stops the run before anything is parsed.
+        :param rairport: ICAO code of the reporting airport of the exports.
+        :param inbox_root: Directory holding the `inflot/inbox` and `total_table/inbox` directories the
+            inputs are copied to, `boxes` by default.
+        :param dtype_backend: Dtypes of the extracted Inflot columns, one of `DTYPE_BACKENDS`; the
+            reports are the same with every backend.
+        :param partials: Store the A1/C1 aggregates of every month in the PartialStore of the output
+            directory, for rollups. Months whose partial is missing are then built again.
+        """
+        self.inflot_dir = inflot_dir
+        self.total_path = total_path
+        self.output_dir = output_dir
+        self.max_workers = max_workers
+        self.cache_dir = cache_dir
+        self.formats = {**REPORT_FORMATS, **(formats or {})}
+        self.incremental = incremental
+        self.manifest_path = manifest_path or os.path.join(output_dir, MANIFEST_NAME)
+        self.history_dir = history_dir
+        self.preflight = preflight
+        self.rairport = rairport
+        self.inbox_root = inbox_root
+        self.dtype_backend = dtype_backend
+        self.partials_dir = os.path.join(output_dir, PARTIALS_NAME) if partials else None
+        self.total_source = None
+        self.manifest = None
+        self.total = None
+        self.plan = {}
+        self.failures = {}
+
+    def inbox_path(self, kind: str) -> Optional[str]:
+        """
+        :param kind: "inflot" or "total_table".
+        :return: Inbox directory of the input kind, None for the default inbox of the extract strategy.
+        """
+        return os.path.join(self.inbox_root, kind, "inbox") if self.inbox_root else None
+
+    def inflot_files(self) -> list:
+        """
+        :return: Sorted paths of the Inflot exports found in `inflot_dir`.
+        """
+        files = []
+        for pattern in INFLOT_PATTERNS:
+            files.extend(glob.glob(os.path.join(self.inflot_dir, pattern)))
+        return sorted(files)
+
+    def _preflight(self, files: list) -> list:
+        """
+        Checks the header rows of the TOTAL workbook and of every Inflot export in parallel.
+
+        :param files: Paths of the Inflot exports.
+        :return: Paths of the exports that passed the check.
+        :raises ValueError: If the TOTAL workbook failed the check.
+        """
+        total_result, *results = Preflight.check_files(files, self.total_path, self.max_workers)
+        total_result.raise_for_errors()
+        for result in results:
+            if not result.ok:
+                print(result)
+        return [result.path for result in results if result.ok]
+
+    def _prepare_total(self) -> tuple:
+        """
+        Parses the TOTAL workbook once.
+
+        :return: Path of the cached Arrow file, or the DataFrame when it has not been cached,
+            and the parsed CARGO sheet.
+        """
+        cache = FrameCache(self.cache_dir)
+        df_total = TotalTableExtractStrategy(self.total_path, cache=cache,
+                                             inbox_path=self.inbox_path("total_table")).retrive_data()
+        if isinstance(df_total, str):
+            raise FileNotFoundError(df_total)
+
+        read_options = {**TOTAL_READ_OPTIONS, "engine": ExtractUtils.read_engine(self.total_path)}
+        entry_path = cache.entry_path(cache.make_key(self.total_path, **read_options))
+        return (entry_path if os.path.isfile(entry_path) else df_total), df_total
+
+    def _plan(self, files: list, manifest: BuildManifest, total: TotalFingerprints) -> dict:
+        """
+        Decides which reports of every Inflot export have to be built.
+
+        :param files: Paths of the Inflot exports.
+        :param manifest: Manifest of the previous runs.
+        :param total: Fingerprints of the current CARGO sheet.
+        :return: Inflot path -> (content fingerprint, report types to build), for exports with
+            at least one report to build. When partials are stored, a month whose partial is
+            missing is built again, so rollups can use it.
+        """
+        cache = FrameCache(self.cache_dir)
+        partial_months = set(PartialStore(self.partials_dir).months()) if self.partials_dir else None
+        plan = {}
+        for path in files:
+            fingerprint = cache.fingerprint(path)
+            report_types = list(self.formats)
+            if self.incremental:
+                report_types = manifest.stale_reports(report_types, fingerprint, total, self.formats)
+                if (not report_types and partial_months is not None
+                        and manifest.period_of(fingerprint) not in partial_months):
+                    report_types = list(self.formats)
+            if report_types:
+                plan[path] = (fingerprint, report_types)
+            else:
+                print(f" {os.path.basename(path)}: reports up to date, skipped")
+        return plan
+
+    def prepare(self) -> list:
+        """
+        Checks the inputs, parses the TOTAL workbook and plans the reports to build.
+
+        After it, `total_source` holds what `_init_worker` needs for this runner's airport.
+
+        :return: Argument tuples of `_process_month`, one per Inflot export with outdated reports.
+        """
+        files = self.inflot_files()
+        if not files:
+            print(f"No Inflot exports found in {self.inflot_dir}")
+            return []
+        if self.preflight:
+            files = self._preflight(files)
+            if not files:
+                return []
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.total_source, df_total = self._prepare_total()
+        self.manifest = BuildManifest(self.manifest_path, self.rairport)
+        self.total = TotalFingerprints(df_total)
+        self.plan = self._plan(files, self.manifest, self.total)
+        return [
+            (path, self.output_dir, self.cache_dir,
+             {report_type: self.formats[report_type] for report_type in report_types},
+             self.history_dir, self.rairport, self.inbox_path("inflot"), self.dtype_backend,
+             self.partials_dir if set(PARTIAL_REPORTS) & set(report_types) else None)
+            for path, (_, report_types) in self.plan.items()
+        ]
+
+    def record(self, result: dict) -> bool:
+        """
+        Stores the reports of one processed month in the manifest, or its error in `failures`. The
+        reports of a failed month stay outdated in the manifest, so the next run builds them again.
+
+        :param result: Dictionary returned by `_process_month` for a task of `prepare`.
+        :return: True when the month was built.
+        """
+        if "error" in result:
+            self.failures[result["inflot"]] = {"period": result["period"], "error": result["error"]}
+            print(f" {self.rairport} {result['period'] or '????'}: failed, {result['error']} "
+                  f"({os.path.basename(result['inflot'])})")
+            return False
+        self.manifest.record_build(result, self.plan[result["inflot"]][0], self.total, self.formats)
+        self.manifest.save()
+        timings = result["timings"]
+        print(f" {self.rairport} {result['period']}: {', '.join(result['reports'])}, "
+              f"extract {timings['extract']:.2f}s, transform {timings['transform']:.2f}s, "
+              f"load {timings['load']:.2f}s, total {timings['total']:.2f}s ({os.path.basename(result['inflot'])})")
+        return True
+
+    def run(self) -> list:
+        """
+        Processes every Inflot export with outdated reports in parallel.
+
+        :return: One result dictionary per built month (see `_process_month`), sorted by period;
+            months that failed are in `failures`, Inflot path -> period and error message.
+        """
+        self.failures = {}
+        tasks = self.prepare()
+        if not tasks:
+            return []
+
+        results = []
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                 initargs=({self.rairport: self.total_source},)) as executor:
+            futures = [executor.submit(_process_month, *task) for task in tasks]
+            for future in as_completed(futures):
+                result = future.result()
+                if self.record(result):
+                    results.append(result)
+
+        return sorted(results, key=lambda result: result["period"])
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(prog="batch", description="Generate GUS A1/B1/C1 reports for many months.")
+    parser.add_argument("inflot_dir", help="Directory with monthly Inflot exports.")
+    parser.add_argument("total_path", help="Path to the TOTAL workbook.")
+    parser.add_argument("output_dir", help="Directory where the reports are saved.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    parser.add_argument("--format", action="append", default=[], type=LoadUtils.parse_format_option,
+                        metavar="REPORT=FORMAT",
+                        help="Output format of a report, e.g. A1=parquet. Can be repeated.")
+    parser.add_argument("--force", action="store_true", help="Rebuild all reports, even those up to date.")
+    parser.add_argument("--history", action="store_true", help="Store the flight records in the history store.")
+    parser.add_argument("--history-dir", default=HISTORY_DIR,
+                        help="Directory of the flight history store, used with --history.")
+    parser.add_argument("--partials", action="store_true",
+                        help="Store the monthly A1/C1 aggregates the rollup command merges.")
+    parser.add_argument("--rairport", default=DEFAULT_RAIRPORT, help="ICAO code of the reporting airport.")
+    parser.add_argument("--dtype-backend", choices=DTYPE_BACKENDS, default="numpy",
+                        help="Dtypes of the extracted Inflot text columns.")
+    args = parser.parse_args(argv)
+    TransformUtils.enable_copy_on_write()
+
+    formats = dict(args.format)
+    runner = BatchRunner(args.inflot_dir, args.total_path, args.output_dir, max_workers=args.workers,
+                         formats=formats, incremental=not args.force,
+                         history_dir=args.history_dir if args.history else None,
+                         rairport=args.rairport, dtype_backend=args.dtype_backend, partials=args.partials)
+    results = runner.run()
+    if runner.failures:
+        print(f" {len(results)} months built, {len(runner.failures)} failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,428 @@
+import argparse
+import ipaddress
+import json
+import os
+import socket
+import socketserver
+import threading
+from typing import Optional
+from extract.frame_cache import FrameCache
+from extract.strategies.inflot_extract_strategy import InflotExtractStrategy
+from extract.strategies.total_table_extract_strategy import TotalTableExtractStrategy
+from instrumentation.profiler import PROFILER
+from load.load_config import REPORT_FORMATS
+from load.load_utils import LoadUtils
+from pipeline.batch import build_reports
+from pipeline.daemon_client import DEFAULT_HOST, DEFAULT_PORT, add_client_commands, run_client
+from pipeline.history_store import HISTORY_DIR
+from pipeline.manifest import MANIFEST_NAME, BuildManifest, TotalFingerprints
+from pipeline.preflight import INFLOT_PATTERNS, Preflight
+from pipeline.rollup import PARTIAL_REPORTS, PARTIALS_NAME
+from transform.inflot_schema import DTYPE_BACKENDS, INFLOT_SCHEMAS
+from transform.strategies.cargo_utils.cargo_cache import CARGO_RESULTS_CACHE
+from transform.strategies.report_config import DEFAULT_RAIRPORT
+from transform.transform_utils import TransformUtils
+
+POLL_INTERVAL = 2.0
+
+# Files written by other programs while they are open or being saved, never read as exports.
+IGNORED_PREFIXES = ("~$", ".")
+
+
+def _file_state(path: str) -> Optional[tuple[int, int]]:
+    """
+    :return: Size and modification time of a file, None when it does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _is_loopback(host: str) -> bool:
+    """
+    :param host: Host name or address, e.g. "127.0.0.1", "::1" or "localhost".
+    :return: True when every address the host resolves to is a loopback address.
+    """
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, None)}
+    except socket.gaierror:
+        return False
+    return bool(addresses) and all(ipaddress.ip_address(address.split("%")[0]).is_loopback for address in addresses)
+
+
+class ReportDaemon:
+    """
+    Long-running report service.
+
+    The daemon keeps the parsed CARGO sheet, its cargo fact table and the transform configuration
+    in memory, watches the Inflot inbox and the TOTAL workbook, and rebuilds the affected reports
+    as soon as an input changes:
+    - a new or modified Inflot export builds the reports of its month,
+    - a modified TOTAL workbook is parsed again and rebuilds the months whose CARGO region changed.
+
+    Up-to-date reports are recognized with the same `BuildManifest` as `BatchRunner`, so the
+    daemon and batch runs can share an output directory. Exports in the inbox are read in place;
+    they are not copied into the inbox again.
+
+    An export whose reports cannot be built is reported (in the "refresh" response and in
+    `status`) and never stops the daemon. It is retried when it or the TOTAL workbook changes,
+    on a "refresh" and when its period is requested.
+
+    Clients talk to the daemon over a local TCP socket, see `pipeline.daemon_client.send_command`.
+    """
+
+    def __init__(self, total_path: str, output_dir: str, inflot_dir: str = os.path.join("boxes", "inflot", "inbox"),
+                 formats: Optional[dict] = None, cache_dir: str = os.path.join("boxes", "cache"),
+                 poll_interval: float = POLL_INTERVAL, history_dir: Optional[str] = None,
+                 rairport: str = DEFAULT_RAIRPORT, dtype_backend: str = "numpy", partials: bool = False) -> None:
+        """
+        :param total_path: Path to the TOTAL workbook.
+        :param output_dir: Directory where the EPyymmXX reports are written.
+        :param inflot_dir: Directory watched for Inflot exports (.xls/.xlsx).
+        :param formats: Output format per report type; missing reports use `REPORT_FORMATS`.
+        :param cache_dir: Directory of the FrameCache used for parsed workbooks.
+        :param poll_interval: Seconds between two checks of the watched files.
+        :param history_dir: Directory of the FlightHistoryStore receiving the flight records of every
+            processed export, None (default) to skip it.
+        :param rairport: ICAO code of the reporting airport of the watched exports.
+        :param dtype_backend: Dtypes of the extracted Inflot columns, a key of `INFLOT_SCHEMAS`.
+        :param partials: Store the A1/C1 aggregates of every processed month in the PartialStore of
+            the output directory, for rollups.
+        """
+        self.total_path = total_path
+        self.output_dir = output_dir
+        self.inflot_dir = inflot_dir
+        self.formats = {**REPORT_FORMATS, **(formats or {})}
+        self.poll_interval = poll_interval
+        self.history_dir = history_dir
+        self.rairport = rairport
+        self.schema = INFLOT_SCHEMAS[dtype_backend]
+        self.partials_dir = os.path.join(output_dir, PARTIALS_NAME) if partials else None
+        self.cache = FrameCache(cache_dir)
+        self.manifest = BuildManifest(os.path.join(output_dir, MANIFEST_NAME), rairport)
+        self.df_total = None
+        self.total = None
+        self.periods = {}
+        self.failures = {}
+        self._total_state = None
+        self._built_states = {}
+        self._failed_states = {}
+        self._pending_states = {}
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+
+    def inflot_files(self) -> list:
+        """
+        :return: Sorted paths of the Inflot exports in the inbox.
+        """
+        if not os.path.isdir(self.inflot_dir):
+            return []
+        patterns = tuple(pattern.lstrip("*") for pattern in INFLOT_PATTERNS)
+        return sorted(
+            entry.path for entry in os.scandir(self.inflot_dir)
+            if entry.is_file() and entry.name.lower().endswith(patterns) and not entry.name.startswith(IGNORED_PREFIXES)
+        )
+
+    def load_total(self) -> None:
+        """
+        Parses the TOTAL workbook and builds its cargo fact table, replacing the previous version.
+
+        :raises ValueError: If the workbook fails the preflight check of its CARGO header.
+        """
+        state = _file_state(self.total_path)
+        Preflight.check_total(self.total_path).raise_for_errors()
+        # Read in place: the workbook is reloaded on every change, copies would pile up in the inbox.
+        df_total = TotalTableExtractStrategy(self.total_path, cache=self.cache, copy_to_inbox=False).retrive_data()
+        if isinstance(df_total, str):
+            raise FileNotFoundError(df_total)
+        CARGO_RESULTS_CACHE.facts(df_total)
+        self.df_total = df_total
+        self.total = TotalFingerprints(df_total)
+        self._total_state = state
+        print(f" TOTAL loaded: {self.total_path}")
+
+    def process(self, inflot_path: str) -> Optional[dict]:
+        """
+        Builds the reports of one Inflot export that are not up to date.
+
+        :param inflot_path: Path to the Inflot export.
+        :return: Result of `build_reports`, or None when every report was up to date or the export
+            failed the preflight check.
+        :raises Exception: Any error of the build; the export is then not marked as built.
+        """
+        with self._lock:
+            state = _file_state(inflot_path)
+            fingerprint = self.cache.fingerprint(inflot_path)
+            report_types = self.manifest.stale_reports(list(self.formats), fingerprint, self.total, self.formats)
+
+            result = None
+            if report_types:
+                check = Preflight.check_inflot(inflot_path)
+                if not check.ok:
+                    # Not retried until the file changes again.
+                    self._built_states[inflot_path] = state
+                    print(check)
+                    return None
+                run_name = os.path.splitext(os.path.basename(inflot_path))[0]
+                with PROFILER.session_from_env(run_name, {"inflot": inflot_path}):
+                    df_inflot = InflotExtractStrategy(inflot_path, cache=self.cache, schema=self.schema,
+                                                      copy_to_inbox=False).retrive_data()
+                    if isinstance(df_inflot, str):
+                        raise FileNotFoundError(df_inflot)
+                    result = build_reports(df_inflot, self.df_total, self.output_dir,
+                                           {report_type: self.formats[report_type] for report_type in report_types},
+                                           self.history_dir,
+                                           self.partials_dir if set(PARTIAL_REPORTS) & set(report_types) else None,
+                                           self.rairport)
+                self.manifest.record_build(result, fingerprint, self.total, self.formats)
+                self.manifest.save()
+                print(f" {result['period']}: {', '.join(result['reports'])} rebuilt "
+                      f"({os.path.basename(inflot_path)})")
+
+            self._built_states[inflot_path] = state
+            period = self.manifest.period_of(fingerprint)
+            if period is not None:
+                self.periods[period] = inflot_path
+            return result
+
+    def process_safely(self, inflot_path: str) -> Optional[dict]:
+        """
+        Runs `process`, recording an error in `failures` instead of raising it, so one bad export
+        cannot stop the daemon. The export is not marked as built, see `poll` for its retries.
+
+        :param inflot_path: Path to the Inflot export.
+        :return: Result of `process`, None when it failed.
+        """
+        state = _file_state(inflot_path)
+        try:
+            result = self.process(inflot_path)
+        except Exception as error:
+            self.failures[inflot_path] = f"{type(error).__name__}: {error}"
+            self._failed_states[inflot_path] = state
+            print(f" {os.path.basename(inflot_path)} failed: {self.failures[inflot_path]}")
+            return None
+        self.failures.pop(inflot_path, None)
+        self._failed_states.pop(inflot_path, None)
+        return result
+
+    def _settled(self, path: str, state: tuple[int, int]) -> bool:
+        """
+        :return: True when a changed file had the same size and modification time in the previous
+            poll, i.e. it is not being written anymore.
+        """
+        if self._pending_states.get(path) == state:
+            del self._pending_states[path]
+            return True
+        self._pending_states[path] = state
+        return False
+
+    def poll(self, retry_failed: bool = False) -> list:
+        """
+        Checks the watched files once and rebuilds what changed.
+
+        A file that appears or changes is read once its size and modification time are the same in
+        two consecutive polls, so files still being copied or saved are not read. An export that
+        failed is retried when it changes or the TOTAL workbook is reloaded, not in every poll.
+
+        :param retry_failed: Also retry every export that failed and did not change since.
+        :return: Results of the reports built in this poll; exports that failed are in `failures`.
+        """
+        with self._lock:
+            for path in [path for path in self._built_states if _file_state(path) is None]:
+                del self._built_states[path]
+            for path in [path for path in self.failures if _file_state(path) is None]:
+                del self.failures[path]
+                del self._failed_states[path]
+
+            changed = []
+            total_state = _file_state(self.total_path)
+            if total_state is not None and total_state != self._total_state and self._settled(self.total_path,
+                                                                                             total_state):
+                try:
+                    self.load_total()
+                except Exception as error:
+                    print(f" TOTAL not reloaded, the previous version is kept: {error}")
+                    self._total_state = total_state
+                else:
+                    changed.extend(self._built_states)
+                    changed.extend(self.failures)
+            if retry_failed:
+                changed.extend(self.failures)
+
+            for path in self.inflot_files():
+                state = _file_state(path)
+                if state is not None and state not in (self._built_states.get(path), self._failed_states.get(path)) \
+                        and self._settled(path, state):
+                    changed.append(path)
+
+            results = []
+            for path in dict.fromkeys(changed):
+                result = self.process_safely(path)
+                if result is not None:
+                    results.append(result)
+            return results
+
+    def request(self, year: int, month: int, report_types: Optional[list] = None) -> dict:
+        """
+        Returns the reports of a period, rebuilding them first when they are not up to date.
+
+        :param year: Full year, e.g. 2025.
+        :param month: Month as integer (1–12).
+        :param report_types: Reports to return, all by default.
+        :return: Report identifier -> path of the report file.
+        :raises LookupError: If no Inflot export of the period is in the inbox.
+        """
+        with self._lock:
+            self.poll()
+            inflot_path = self.periods.get((year, month))
+            if inflot_path is None or _file_state(inflot_path) is None:
+                raise LookupError(f"No Inflot export for {year}-{str(month).zfill(2)} in {self.inflot_dir}")
+            self.process(inflot_path)
+
+            paths = {}
+            for report_type in report_types or list(self.formats):
+                entry = self.manifest.reports.get(LoadUtils.generate_report_filename(report_type, year, month))
+                if entry is None:
+                    raise LookupError(f"Unknown report type: {report_type}")
+                paths[report_type] = entry["path"]
+            return paths
+
+    def status(self) -> dict:
+        """
+        :return: Watched paths, known periods and cache statistics.
+        """
+        with self._lock:
+            return {
+                "rairport": self.rairport,
+                "total": self.total_path,
+                "inflot_dir": self.inflot_dir,
+                "output_dir": self.output_dir,
+                "periods": sorted(f"{year}-{str(month).zfill(2)}" for year, month in self.periods),
+                "failures": dict(self.failures),
+                "cargo_cache": CARGO_RESULTS_CACHE.stats(),
+            }
+
+    def handle(self, command: dict) -> dict:
+        """
+        Executes one client command.
+
+        :param command: {"command": "report", "year": 2025, "month": 3, "reports": ["A1"]},
+            {"command": "refresh"}, {"command": "status"} or {"command": "stop"}.
+        :return: Response with "status" set to "ok" or "error"; a "refresh" during which some exports
+            failed is an error response listing them in "failed".
+        """
+        if not isinstance(command, dict):
+            return {"status": "error", "message": "Invalid request: a JSON object is expected"}
+        name = command.get("command")
+        try:
+            if name == "report":
+                return {"status": "ok", "reports": self.request(int(command["year"]), int(command["month"]),
+                                                                 command.get("reports"))}
+            if name == "refresh":
+                with self._lock:
+                    built = [result["reports"] for result in self.poll(retry_failed=True)]
+                    failed = dict(self.failures)
+                response = {"status": "error" if failed else "ok", "built": built}
+                if failed:
+                    response.update(message=f"{len(failed)} exports failed", failed=failed)
+                return response
+            if name == "status":
+                return {"status": "ok", **self.status()}
+            if name == "stop":
+                self._stop.set()
+                return {"status": "ok"}
+            return {"status": "error", "message": f"Unknown command: {name}"}
+        except Exception as error:
+            return {"status": "error", "message": f"{type(error).__name__}: {error}"}
+
+    def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        """
+        Loads the inputs, builds outdated reports and then serves clients and watches the inputs
+        until a "stop" command is received or the process is interrupted.
+
+        :param host: Loopback address the server listens on. The commands, "stop" included, are not
+            authenticated, so the server is never exposed to other machines.
+        :param port: TCP port of the server.
+        :raises ValueError: If the host is not a loopback address.
+        """
+        if not _is_loopback(host):
+            raise ValueError(f"The report daemon only listens on a loopback address, got {host}")
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.load_total()
+        for path in self.inflot_files():
+            self.process_safely(path)
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                line = self.rfile.readline()
+                try:
+                    response = daemon.handle(json.loads(line))
+                except ValueError as error:
+                    response = {"status": "error", "message": f"Invalid request: {error}"}
+                self.wfile.write(json.dumps(response, default=str).encode("utf-8") + b"\n")
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        with socketserver.ThreadingTCPServer((host, port), Handler) as server:
+            server.daemon_threads = True
+            thread = threading.Thread(target=server.serve_forever, name="report-server", daemon=True)
+            thread.start()
+            print(f" Report daemon listening on {host}:{port}, watching {self.inflot_dir} and {self.total_path}")
+            try:
+                while not self._stop.wait(self.poll_interval):
+                    try:
+                        self.poll()
+                    except Exception as error:
+                        print(f" Watcher error: {error}")
+            except KeyboardInterrupt:
+                pass
+            finally:
+                server.shutdown()
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(prog="daemon", description="Resident GUS report service and its client.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Run the daemon.")
+    serve.add_argument("total_path", help="Path to the TOTAL workbook.")
+    serve.add_argument("output_dir", help="Directory where the reports are saved.")
+    serve.add_argument("--inbox", default=os.path.join("boxes", "inflot", "inbox"), help="Watched Inflot directory.")
+    serve.add_argument("--interval", type=float, default=POLL_INTERVAL, help="Seconds between two checks.")
+    serve.add_argument("--format", action="append", default=[], type=LoadUtils.parse_format_option,
+                       metavar="REPORT=FORMAT",
+                       help="Output format of a report, e.g. A1=parquet. Can be repeated.")
+    serve.add_argument("--history", action="store_true", help="Store the flight records in the history store.")
+    serve.add_argument("--history-dir", default=HISTORY_DIR,
+                       help="Directory of the flight history store, used with --history.")
+    serve.add_argument("--partials", action="store_true",
+                       help="Store the monthly A1/C1 aggregates the rollup command merges.")
+    serve.add_argument("--rairport", default=DEFAULT_RAIRPORT, help="ICAO code of the reporting airport.")
+    serve.add_argument("--dtype-backend", choices=DTYPE_BACKENDS, default="numpy",
+                       help="Dtypes of the extracted Inflot text columns.")
+
+    add_client_commands(commands)
+    args = parser.parse_args(argv)
+    TransformUtils.enable_copy_on_write()
+
+    if args.command == "serve":
+        if not _is_loopback(args.host):
+            parser.error(f"the daemon only listens on a loopback address, got --host {args.host}")
+        formats = dict(args.format)
+        ReportDaemon(args.total_path, args.output_dir, inflot_dir=args.inbox, formats=formats,
+                     poll_interval=args.interval,
+                     history_dir=args.history_dir if args.history else None,
+                     rairport=args.rairport, dtype_backend=args.dtype_backend,
+                     partials=args.partials).serve(args.host, args.port)
+        return
+
+    run_client(args)
+
+
+if __name__ == "__main__":
+    main()
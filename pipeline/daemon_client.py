@@ -0,0 +1,82 @@
+import argparse
+import json
+import socket
+import time
+from typing import Optional
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def send_command(command: dict, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, timeout: float = 600.0) -> dict:
+    """
+    Sends one command to a running `ReportDaemon`.
+
+    :param command: Command dictionary, see `ReportDaemon.handle`.
+    :param host: Address of the daemon.
+    :param port: TCP port of the daemon.
+    :param timeout: Seconds to wait for the answer; building reports can take a while.
+    :return: The daemon's response.
+    :raises OSError: If the daemon is not reachable.
+    :raises ValueError: If the daemon closes the connection without a reply or the reply is not JSON.
+    """
+    with socket.create_connection((host, port), timeout=timeout) as connection:
+        connection.sendall(json.dumps(command).encode("utf-8") + b"\n")
+        with connection.makefile("rb") as stream:
+            reply = stream.readline()
+    if not reply.strip():
+        raise ValueError("the connection was closed without a reply")
+    return json.loads(reply)
+
+
+def add_client_commands(commands) -> None:
+    """
+    Adds the client commands to an argparse subparsers object.
+    """
+    report = commands.add_parser("report", help="Request the reports of a period.")
+    report.add_argument("year", type=int)
+    report.add_argument("month", type=int)
+    report.add_argument("--report", action="append", dest="reports", help="Report type, e.g. A1. Can be repeated.")
+
+    commands.add_parser("refresh", help="Check the watched files now.")
+    commands.add_parser("status", help="Show the daemon state.")
+    commands.add_parser("stop", help="Stop the daemon.")
+
+
+def run_client(args: argparse.Namespace) -> None:
+    """
+    Sends the command parsed from the client arguments and prints the response.
+
+    :raises SystemExit: With code 1 when the daemon is not reachable or answers with an error.
+    """
+    command = {"command": args.command}
+    if args.command == "report":
+        command.update(year=args.year, month=args.month, reports=args.reports)
+    started = time.perf_counter()
+    try:
+        response = send_command(command, args.host, args.port)
+    except OSError as error:
+        print(f"Report daemon at {args.host}:{args.port} is not reachable: {error}")
+        raise SystemExit(1)
+    except ValueError as error:
+        print(f"Report daemon at {args.host}:{args.port} sent an invalid reply: {error}")
+        raise SystemExit(1)
+    print(json.dumps(response, indent=2))
+    print(f" Answered in {time.perf_counter() - started:.2f}s")
+    if response.get("status") != "ok":
+        raise SystemExit(1)
+
+
+def main(argv: Optional[list] = None) -> None:
+    """
+    Client of the report daemon; it does not import pandas, so it starts quickly.
+    """
+    parser = argparse.ArgumentParser(prog="client", description="Send a request to the report daemon.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    add_client_commands(parser.add_subparsers(dest="command", required=True))
+    run_client(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import argparse
+import glob
+import os
+import re
+from typing import Optional
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from extract.frame_cache import FrameCache
+from extract.input_schema import InputSchema
+from load.load_utils import LoadUtils
+from transform.inflot_schema import INFLOT_SCHEMA
+from transform.transform_utils import TransformUtils
+
+HISTORY_DIR = os.path.join("boxes", "history")
+PARTITION_FILE = "part-0.parquet"
+PARTITIONING = ds.partitioning(pa.schema([("year", pa.int16()), ("month", pa.int8())]), flavor="hive")
+
+# Arrow types of the stored columns, by pandas dtype of the extracted Inflot frame. Every partition
+# is written with the same types, so the partitions of different months read back as one table.
+ARROW_TYPES = {
+    "category": pa.dictionary(pa.int32(), pa.string()),
+    "Int16": pa.int16(),
+    "datetime64[ns]": pa.timestamp("ns"),
+}
+
+
+class FlightHistoryStore:
+    """
+    Local store of the normalized Inflot flight records of every month.
+
+    Records are kept in Parquet files partitioned Hive-style by period
+    (`year=2024/month=4/part-0.parquet`), with the column names cleaned the same way as in the
+    input schema. Reads go through `pyarrow.dataset`: partitions outside the requested period
+    range are skipped from their directory names, and only the requested columns (and the row
+    groups matching the filter) are decoded, so a multi-year analysis does not open the archived
+    Inflot workbooks nor the columns it does not use.
+
+    Writing a month replaces its partition atomically; loading the same export again is harmless.
+    """
+
+    def __init__(self, root: str = HISTORY_DIR, schema: InputSchema = INFLOT_SCHEMA) -> None:
+        """
+        :param root: Directory of the store. Created if missing.
+        :param schema: Input schema of the stored Inflot exports; declares the stored dtypes.
+        """
+        self.root = root
+        self.schema = schema
+        os.makedirs(self.root, exist_ok=True)
+
+    def partition_path(self, year: int, month: int) -> str:
+        """
+        :return: Path of the Parquet file holding one month.
+        """
+        return os.path.join(self.root, f"year={int(year)}", f"month={int(month)}", PARTITION_FILE)
+
+    def normalize(self, df_inflot: pd.DataFrame) -> pa.Table:
+        """
+        Converts an extracted Inflot export to the stored layout.
+
+        :param df_inflot: Inflot export as returned by `InflotExtractStrategy` with the Inflot schema.
+        :return: Arrow table with cleaned column names and the same column types for every month.
+        """
+        dataframe = df_inflot.set_axis([self.schema.clean_column_name(name) for name in df_inflot.columns], axis=1)
+        for name, dtype in dataframe.dtypes.items():
+            if isinstance(dtype, pd.CategoricalDtype) or TransformUtils.is_arrow_string(dtype):
+                # Category labels read from different workbooks may be numbers or text; text read
+                # with the "pyarrow" dtype backend is stored dictionary-encoded as well.
+                dataframe = dataframe.assign(**{name: dataframe[name].astype("string").astype("category")})
+
+        schema = pa.Schema.from_pandas(dataframe, preserve_index=False)
+        for position, dtype in enumerate(dataframe.dtypes):
+            if str(dtype) in ARROW_TYPES:
+                schema = schema.set(position, pa.field(schema.field(position).name, ARROW_TYPES[str(dtype)]))
+        return pa.Table.from_pandas(dataframe, schema=schema, preserve_index=False)
+
+    def write(self, df_inflot: pd.DataFrame, year: Optional[int] = None, month: Optional[int] = None) -> str:
+        """
+        Stores the flight records of one month, replacing the records stored for it before.
+
+        :param df_inflot: Extracted Inflot export.
+        :param year: Year of the export; read from its middle record when omitted.
+        :param month: Month of the export; read from its middle record when omitted.
+        :return: Path of the written partition file.
+        """
+        if year is None or month is None:
+            date = TransformUtils.get_middle_record_data(df_inflot)
+            year, month = date.year, date.month
+
+        table = self.normalize(df_inflot)
+        path = self.partition_path(year, month)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        LoadUtils.atomic_write(path, lambda temp_path: pq.write_table(table, temp_path, compression="zstd"))
+        return path
+
+    def partitions(self) -> list:
+        """
+        :return: Sorted (year, month) tuples of the stored months.
+        """
+        periods = []
+        for path in glob.glob(os.path.join(self.root, "year=*", "month=*", PARTITION_FILE)):
+            match = re.search(r"year=(\d+)[\\/]month=(\d+)", path)
+            if match:
+                periods.append((int(match.group(1)), int(match.group(2))))
+        return sorted(periods)
+
+    @staticmethod
+    def period_filter(start: Optional[tuple] = None, end: Optional[tuple] = None) -> Optional[ds.Expression]:
+        """
+        Builds a filter on the partition columns selecting a range of months.
+
+        :param start: First (year, month) included, None for no lower bound.
+        :param end: Last (year, month) included, None for no upper bound.
+        :return: Dataset expression, None when neither bound is given.
+        """
+        year, month = ds.field("year"), ds.field("month")
+        expression = None
+        if start is not None:
+            expression = (year > start[0]) | ((year == start[0]) & (month >= start[1]))
+        if end is not None:
+            upper = (year < end[0]) | ((year == end[0]) & (month <= end[1]))
+            expression = upper if expression is None else expression & upper
+        return expression
+
+    def dataset(self) -> ds.Dataset:
+        """
+        :return: Dataset over every stored partition.
+        """
+        return ds.dataset(self.root, format="parquet", partitioning=PARTITIONING,
+                          exclude_invalid_files=True, ignore_prefixes=[".", "_"])
+
+    def read_table(self, columns: Optional[list] = None, start: Optional[tuple] = None, end: Optional[tuple] = None,
+                   where: Optional[ds.Expression] = None) -> pa.Table:
+        """
+        Reads stored flight records with partition, column and row group pruning.
+
+        :param columns: Columns to read, e.g. ["Operacja", "TTL"]; the partition columns "year" and
+            "month" may be listed too. All columns when None.
+        :param start: First (year, month) read.
+        :param end: Last (year, month) read.
+        :param where: Additional dataset expression, e.g. `ds.field("Typ rejsu") == "Cargo"`.
+        :return: Arrow table of the matching records.
+        """
+        expression = self.period_filter(start, end)
+        if where is not None:
+            expression = where if expression is None else expression & where
+        return self.dataset().to_table(columns=columns, filter=expression)
+
+    def read(self, columns: Optional[list] = None, start: Optional[tuple] = None, end: Optional[tuple] = None,
+             where: Optional[ds.Expression] = None) -> pd.DataFrame:
+        """
+        Same as `read_table`, returned as a DataFrame with the dtypes of the extracted Inflot frame.
+        """
+        return self.read_table(columns, start, end, where).to_pandas(types_mapper={pa.int16(): pd.Int16Dtype()}.get)
+
+    def import_files(self, paths: list, cache_dir: str = os.path.join("boxes", "cache")) -> list:
+        """
+        Extracts archived Inflot exports and stores their flight records.
+
+        :param paths: Paths of the Inflot exports.
+        :param cache_dir: Directory of the FrameCache used for parsed workbooks.
+        :return: Paths of the written partition files.
+        """
+        from extract.strategies.inflot_extract_strategy import InflotExtractStrategy
+
+        cache = FrameCache(cache_dir)
+        written = []
+        for path in paths:
+            df_inflot = InflotExtractStrategy(path, cache=cache, schema=self.schema, copy_to_inbox=False).retrive_data()
+            if isinstance(df_inflot, str):
+                raise FileNotFoundError(df_inflot)
+            written.append(self.write(df_inflot))
+            print(f" {os.path.basename(path)} -> {written[-1]}")
+        return written
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(prog="history", description="Manage the store of monthly flight records.")
+    parser.add_argument("--root", default=HISTORY_DIR, help="Directory of the history store.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_command = commands.add_parser("import", help="Store the flight records of archived Inflot exports.")
+    import_command.add_argument("paths", nargs="+", help="Inflot exports or directories containing them.")
+    import_command.add_argument("--cache-dir", default=os.path.join("boxes", "cache"),
+                                help="Directory of the workbook cache.")
+    commands.add_parser("list", help="List the stored months.")
+    args = parser.parse_args(argv)
+
+    store = FlightHistoryStore(args.root)
+    if args.command == "import":
+        from pipeline.preflight import Preflight
+
+        paths = []
+        for path in args.paths:
+            paths.extend(Preflight.inflot_files(path) if os.path.isdir(path) else [path])
+        store.import_files(paths, args.cache_dir)
+        return
+
+    for year, month in store.partitions():
+        print(f" {year}-{str(month).zfill(2)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import hashlib
+import importlib.util
+import json
+import os
+from datetime import datetime
+from typing import Optional
+import pandas as pd
+from load.load_utils import LoadUtils
+from transform.strategies.cargo_utils.cargo_utils import CargoData
+from transform.strategies.report_config import DEFAULT_RAIRPORT
+
+MANIFEST_NAME = "manifest.json"
+
+# Transform configuration read by each report. B1 is built from A1, so it also depends on the A1 configuration.
+REPORT_CONFIG_MODULES = {
+    "A1": (
+        "transform.strategies.gus_a1.gus_a1_config",
+        "transform.strategies.cargo_utils.cargo_config",
+        "transform.strategies.report_config",
+    ),
+    "B1": (
+        "transform.strategies.gus_a1.gus_a1_config",
+        "transform.strategies.gus_b1.gus_b1_config",
+        "transform.strategies.cargo_utils.cargo_config",
+        "transform.strategies.report_config",
+    ),
+    "C1": (
+        "transform.strategies.gus_c1.gus_c1_config",
+        "transform.strategies.cargo_utils.cargo_config",
+        "transform.strategies.report_config",
+    ),
+}
+
+
+class TotalFingerprints:
+    """
+    Fingerprints of the parts of the CARGO sheet that the reports of one period read.
+
+    For a period, `CargoData.run` uses only the sheet row(s) of that period and the columns that
+    are not empty in it. The fingerprint covers exactly those cells and their header labels, so
+    a new month or a new airline column in TOTAL leaves the fingerprints of earlier months unchanged.
+    """
+
+    def __init__(self, df_total: pd.DataFrame) -> None:
+        """
+        :param df_total: Raw CARGO sheet as returned by `TotalTableExtractStrategy`.
+        """
+        self.prepared = CargoData(df_total).prepare()
+        self._digests = {}
+
+    def get(self, year: int, month: int) -> str:
+        """
+        :param year: Full year, e.g. 2025.
+        :param month: Month as integer (1–12).
+        :return: Hex digest of the CARGO region of the period.
+        """
+        if (year, month) not in self._digests:
+            region = CargoData(self.prepared).period_region(year, month)
+            digest = hashlib.blake2b(digest_size=20)
+            if not region.empty:
+                digest.update(repr(region.columns.tolist()).encode("utf-8"))
+                digest.update(repr(region.to_numpy(dtype=object).tolist()).encode("utf-8"))
+            self._digests[(year, month)] = digest.hexdigest()
+        return self._digests[(year, month)]
+
+
+class BuildManifest:
+    """
+    Record of the reports produced by previous runs and of the inputs they were built from.
+
+    Every report (e.g. EP2503A1) is stored with its output path and the fingerprints of:
+    - its Inflot export (file content),
+    - the region of the CARGO sheet it reads (see `TotalFingerprints`),
+    - the transform configuration modules listed in `REPORT_CONFIG_MODULES`,
+    - its output format,
+    - its reporting airport.
+
+    A report is up to date when all of them are unchanged and its output file still exists.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str, rairport: str = DEFAULT_RAIRPORT) -> None:
+        """
+        Reads the manifest; a missing or unreadable file gives an empty manifest.
+
+        :param path: Path of the JSON manifest file.
+        :param rairport: ICAO code of the reporting airport of the reports built from now on.
+        """
+        self.path = path
+        self.rairport = rairport
+        self.reports = {}
+        self._config_fingerprints = {}
+        try:
+            with open(path, encoding="utf-8") as file:
+                content = json.load(file)
+        except (OSError, ValueError):
+            return
+        if content.get("version") == self.VERSION:
+            self.reports = content.get("reports", {})
+
+    def config_fingerprint(self, report_type: str) -> str:
+        """
+        :param report_type: Report identifier, e.g. 'A1'.
+        :return: Hex digest of the source of the configuration modules the report depends on.
+        """
+        if report_type not in self._config_fingerprints:
+            digest = hashlib.blake2b(digest_size=20)
+            for module in REPORT_CONFIG_MODULES.get(report_type, ()):
+                with open(importlib.util.find_spec(module).origin, "rb") as file:
+                    digest.update(file.read())
+            self._config_fingerprints[report_type] = digest.hexdigest()
+        return self._config_fingerprints[report_type]
+
+    def inputs(self, report_type: str, inflot_fingerprint: str, total_fingerprint: str, file_format: str) -> dict:
+        """
+        :return: Input fingerprints of a report, in the form stored in the manifest.
+        """
+        return {
+            "inflot": inflot_fingerprint,
+            "total": total_fingerprint,
+            "config": self.config_fingerprint(report_type),
+            "format": file_format,
+            "rairport": self.rairport,
+        }
+
+    def period_of(self, inflot_fingerprint: str) -> Optional[tuple[int, int]]:
+        """
+        :param inflot_fingerprint: Content fingerprint of an Inflot export.
+        :return: Full year and month of the reports built from that export, None if there are none.
+        """
+        for entry in self.reports.values():
+            if entry["inputs"]["inflot"] == inflot_fingerprint:
+                return tuple(entry["period"])
+        return None
+
+    def is_fresh(self, report_name: str, inputs: dict) -> bool:
+        """
+        :param report_name: Report name, e.g. 'EP2503A1'.
+        :param inputs: Current input fingerprints, see `inputs`.
+        :return: True when the report was built from the same inputs and its file still exists.
+        """
+        entry = self.reports.get(report_name)
+        return entry is not None and entry["inputs"] == inputs and os.path.isfile(entry["path"])
+
+    def stale_reports(self, report_types: list, inflot_fingerprint: str, total: TotalFingerprints,
+                      formats: dict) -> list:
+        """
+        Selects the reports of one Inflot export that have to be built again.
+
+        :param report_types: Report identifiers to check.
+        :param inflot_fingerprint: Content fingerprint of the Inflot export.
+        :param total: Fingerprints of the current CARGO sheet.
+        :param formats: Output format per report type.
+        :return: Report identifiers whose inputs changed; all of them for an unknown export.
+        """
+        period = self.period_of(inflot_fingerprint)
+        if period is None:
+            return list(report_types)
+
+        year, month = period
+        total_fingerprint = total.get(year, month)
+        return [
+            report_type for report_type in report_types
+            if not self.is_fresh(LoadUtils.generate_report_filename(report_type, year, month),
+                                 self.inputs(report_type, inflot_fingerprint, total_fingerprint, formats[report_type]))
+        ]
+
+    def record(self, report_type: str, year: int, month: int, path: str, inputs: dict) -> None:
+        """
+        Stores a built report.
+
+        :param report_type: Report identifier.
+        :param year: Full year of the report period.
+        :param month: Month of the report period.
+        :param path: Path of the written report.
+        :param inputs: Input fingerprints the report was built from.
+        """
+        self.reports[LoadUtils.generate_report_filename(report_type, year, month)] = {
+            "period": [year, month],
+            "path": path,
+            "inputs": inputs,
+            "built": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    def record_build(self, result: dict, inflot_fingerprint: str, total: TotalFingerprints, formats: dict) -> None:
+        """
+        Stores every report of a month built by `build_reports`.
+
+        :param result: Dictionary returned by `build_reports`.
+        :param inflot_fingerprint: Content fingerprint of the Inflot export the reports were built from.
+        :param total: Fingerprints of the CARGO sheet the reports were built from.
+        :param formats: Output format per report type.
+        """
+        year, month = result["year"], result["month"]
+        total_fingerprint = total.get(year, month)
+        for report_type, path in result["reports"].items():
+            inputs = self.inputs(report_type, inflot_fingerprint, total_fingerprint, formats[report_type])
+            self.record(report_type, year, month, path, inputs)
+
+    def save(self) -> str:
+        """
+        Writes the manifest atomically.
+
+        :return: Path of the manifest file.
+        """
+        def write(path: str) -> None:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump({"version": self.VERSION, "reports": self.reports}, file, indent=2, sort_keys=True)
+
+        return LoadUtils.atomic_write(self.path, write)
@@ -0,0 +1,214 @@
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import pandas as pd
+from extract.extract_utils import ExtractUtils
+from extract.input_schema import InputSchema
+from transform.inflot_schema import INFLOT_SCHEMA
+from transform.strategies.cargo_utils.cargo_config import CARGO_AD_MAPPING
+from transform.strategies.cargo_utils.cargo_utils import CargoData
+
+CARGO_SHEET = "CARGO"
+# Title row followed by the airline / airport / IMPORT-EXPORT header levels read by `CargoData`.
+CARGO_HEADER_ROWS = 4
+INFLOT_PATTERNS = ("*.xls", "*.xlsx")
+
+
+class PreflightResult:
+    """
+    Outcome of the preflight check of one input file.
+    """
+
+    def __init__(self, path: str, kind: str) -> None:
+        """
+        :param path: Path of the checked file.
+        :param kind: "inflot" or "total".
+        """
+        self.path = path
+        self.kind = kind
+        self.errors = []
+        self.warnings = []
+        self.seconds = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """
+        :return: True when the file can be processed.
+        """
+        return not self.errors
+
+    def raise_for_errors(self) -> None:
+        """
+        :raises ValueError: If the check found errors.
+        """
+        if self.errors:
+            raise ValueError(f"{self.kind} file {self.path} failed the preflight check: {'; '.join(self.errors)}")
+
+    def __str__(self) -> str:
+        status = "ok" if self.ok else "FAILED"
+        lines = [f" {os.path.basename(self.path)} ({self.kind}): {status} in {self.seconds * 1000:.0f} ms"]
+        lines += [f"   error: {error}" for error in self.errors]
+        lines += [f"   warning: {warning}" for warning in self.warnings]
+        return "\n".join(lines)
+
+
+class Preflight:
+    """
+    Checks input workbooks against what the transforms need, reading only their header rows.
+
+    - Inflot exports: the header row must contain every column of the Inflot input schema (built
+      from the A1/C1 transform configs), and the first data row must start with a date, which
+      is the column the reporting period is read from.
+    - TOTAL workbook: the CARGO sheet must exist, and its first four rows must give `CargoData`
+      the ROK and MIESIĄC columns and at least one IMPORT/EXPORT freight column before
+      'RAZEM ZGR'.
+
+    A bad file is rejected in milliseconds, before any full parse of the workbooks.
+    """
+
+    @staticmethod
+    def check_inflot(path: str, schema: InputSchema = INFLOT_SCHEMA) -> PreflightResult:
+        """
+        :param path: Path of an Inflot export.
+        :param schema: Schema of the columns the transforms read.
+        :return: Result of the check.
+        """
+        result = PreflightResult(path, "inflot")
+        started = time.perf_counter()
+        try:
+            rows = ExtractUtils.read_rows(path, 2)
+        except Exception as error:
+            result.errors.append(f"cannot read the workbook: {error}")
+            rows = None
+
+        if rows is not None:
+            Preflight._check_inflot_rows(rows, schema, result)
+        result.seconds = time.perf_counter() - started
+        return result
+
+    @staticmethod
+    def _check_inflot_rows(rows: list, schema: InputSchema, result: PreflightResult) -> None:
+        """
+        Checks the header row and the first data row of an Inflot export.
+        """
+        if not rows:
+            result.errors.append("the sheet is empty")
+            return
+
+        header = [schema.clean_column_name(name) for name in rows[0]]
+        missing = [column for column in schema.columns if column not in header]
+        if missing:
+            result.errors.append(f"missing columns: {missing}")
+        duplicated = sorted({column for column in schema.columns if header.count(column) > 1})
+        if duplicated:
+            result.warnings.append(f"duplicated columns, the first one is read: {duplicated}")
+
+        if len(rows) < 2:
+            result.errors.append("the sheet has no flight rows")
+        elif pd.isna(pd.to_datetime(rows[1][0], errors="coerce")):
+            result.errors.append(f"the first column of the first flight row is not a date: {rows[1][0]!r}")
+
+    @staticmethod
+    def check_total(path: str) -> PreflightResult:
+        """
+        :param path: Path of the TOTAL workbook.
+        :return: Result of the check.
+        """
+        result = PreflightResult(path, "total")
+        started = time.perf_counter()
+        try:
+            rows = ExtractUtils.read_rows(path, CARGO_HEADER_ROWS, sheet_name=CARGO_SHEET)
+        except Exception as error:
+            result.errors.append(f"cannot read the {CARGO_SHEET} sheet: {error}")
+            rows = None
+
+        if rows is not None:
+            Preflight._check_cargo_header(rows, result)
+        result.seconds = time.perf_counter() - started
+        return result
+
+    @staticmethod
+    def _check_cargo_header(rows: list, result: PreflightResult) -> None:
+        """
+        Prepares the header rows of the CARGO sheet with `CargoData.header_info` and checks its
+        bottom header level.
+        """
+        if len(rows) < CARGO_HEADER_ROWS:
+            result.errors.append(f"the {CARGO_SHEET} sheet has {len(rows)} rows, its header needs {CARGO_HEADER_ROWS}")
+            return
+
+        # Empty cells become missing values, as in `pd.read_excel`, so CargoData fills the header levels.
+        df_header = pd.DataFrame(rows).replace("", None)
+        header = CargoData(df_header).header_info()
+        for label in ("ROK", "MIESIĄC"):
+            if label not in header["labels"]:
+                result.errors.append(f"no {label} column in the {CARGO_SHEET} header")
+
+        directions = set(header["directions"])
+        ad_labels = {label.upper() for label in CARGO_AD_MAPPING}
+        if not directions & ad_labels:
+            result.errors.append(f"no {'/'.join(sorted(ad_labels))} freight columns before 'RAZEM ZGR'")
+        unknown = sorted(directions - ad_labels)
+        if unknown:
+            result.warnings.append(f"freight columns with an unknown direction are ignored: {unknown}")
+
+    @staticmethod
+    def check_files(inflot_paths: list, total_path: Optional[str] = None,
+                    max_workers: Optional[int] = None) -> list:
+        """
+        Checks many files in parallel.
+
+        Header reads are short and mostly spent in decompression and I/O, so a thread pool is used;
+        no worker process (and no pandas import per worker) is needed.
+
+        :param inflot_paths: Paths of Inflot exports.
+        :param total_path: Optional path of the TOTAL workbook.
+        :param max_workers: Number of threads, chosen by `ThreadPoolExecutor` by default.
+        :return: Results in the order of the files, the TOTAL workbook first.
+        """
+        checks = [(Preflight.check_total, total_path)] if total_path else []
+        checks += [(Preflight.check_inflot, path) for path in inflot_paths]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="preflight") as executor:
+            futures = [executor.submit(check, path) for check, path in checks]
+            return [future.result() for future in futures]
+
+    @staticmethod
+    def inflot_files(directory: str) -> list:
+        """
+        :return: Sorted paths of the Inflot exports in a directory.
+        """
+        files = []
+        for pattern in INFLOT_PATTERNS:
+            files.extend(glob.glob(os.path.join(directory, pattern)))
+        return sorted(files)
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(prog="check", description="Check input workbooks by their header rows only.")
+    parser.add_argument("paths", nargs="*", help="Inflot exports or directories containing them.")
+    parser.add_argument("--total", help="Path to the TOTAL workbook.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of threads.")
+    args = parser.parse_args(argv)
+
+    paths = []
+    for path in args.paths:
+        paths.extend(Preflight.inflot_files(path) if os.path.isdir(path) else [path])
+    if not paths and not args.total:
+        parser.error("nothing to check")
+
+    started = time.perf_counter()
+    results = Preflight.check_files(paths, args.total, args.workers)
+    for result in results:
+        print(result)
+    failed = [result for result in results if not result.ok]
+    print(f" {len(results)} files checked in {time.perf_counter() - started:.2f}s, {len(failed)} failed")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import importlib
+import threading
+from collections.abc import Mapping
+
+
+class LazyRegistry(Mapping):
+    """
+    Registry of named objects that are imported only when they are first used.
+
+    Entries are given as 'module:attribute' strings, so listing or checking the registered names
+    never imports the modules (and pandas with them); `registry[name]` imports the module of that
+    one entry.
+    """
+
+    def __init__(self, targets: dict) -> None:
+        """
+        :param targets: Name -> 'module:attribute', e.g. {'xlsx': 'load.strategies.excel_load_strategy:ExcelLoadStrategy'}.
+        """
+        self.targets = dict(targets)
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, target: str) -> None:
+        """
+        Adds or replaces an entry.
+
+        :param name: Name of the entry.
+        :param target: 'module:attribute' of the registered object.
+        """
+        with self._lock:
+            self.targets[name] = target
+            self._loaded.pop(name, None)
+
+    def __getitem__(self, name: str):
+        with self._lock:
+            if name not in self._loaded:
+                module_name, attribute = self.targets[name].split(":", 1)
+                self._loaded[name] = getattr(importlib.import_module(module_name), attribute)
+            return self._loaded[name]
+
+    def __contains__(self, name) -> bool:
+        return name in self.targets
+
+    def __iter__(self):
+        return iter(self.targets)
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+
+EXTRACT_STRATEGIES = LazyRegistry({
+    "inflot": "extract.strategies.inflot_extract_strategy:InflotExtractStrategy",
+    "total": "extract.strategies.total_table_extract_strategy:TotalTableExtractStrategy",
+})
+
+TRANSFORM_STRATEGIES = LazyRegistry({
+    "A1": "transform.strategies.gus_a1.gus_a1_transform_strategy:A1TransformStrategy",
+    "B1": "transform.strategies.gus_b1.gus_b1_transform_strategy:B1TransformStrategy",
+    "C1": "transform.strategies.gus_c1.gus_c1_transform_strategy:C1TransformStrategy",
+})
+
+# Command line commands, each called with the arguments following the command name.
+COMMANDS = LazyRegistry({
+    "run": "pipeline.run:main",
+    "batch": "pipeline.batch:main",
+    "airports": "pipeline.airports:main",
+    "daemon": "pipeline.daemon:main",
+    "client": "pipeline.daemon_client:main",
+    "history": "pipeline.history_store:main",
+    "rollup": "pipeline.rollup:main",
+    "check": "pipeline.preflight:main",
+})
+
+COMMAND_HELP = {
+    "run": "Build the reports of one Inflot export.",
+    "batch": "Build the reports of every Inflot export in a directory.",
+    "airports": "Build the reports of many reporting airports in parallel.",
+    "daemon": "Run the report daemon or send it a request.",
+    "client": "Send a request to a running report daemon.",
+    "history": "Import Inflot exports into the flight history store or list its months.",
+    "rollup": "Build quarterly, annual or rolling 12-month reports from the monthly partials.",
+    "check": "Check Inflot exports and the TOTAL workbook by their header rows only.",
+}
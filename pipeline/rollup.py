@@ -0,0 +1,182 @@
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+from typing import Optional
+import pandas as pd
+from load.load import Load
+from load.load_config import REPORT_FORMATS
+from load.load_utils import LoadUtils
+from transform.rollup import ReportPartial
+from transform.strategies.report_config import DEFAULT_RAIRPORT
+from transform.transform_utils import TransformUtils
+
+PARTIALS_NAME = "partials"
+PARTIAL_FILES = {"df_a1": "A1.parquet", "df_c1": "C1.parquet", "df_freight": "FREIGHT.parquet"}
+# Reports a partial is made of; a month's partial is saved again only when one of them is rebuilt.
+PARTIAL_REPORTS = ("A1", "C1")
+ROLLUP_KINDS = ("quarter", "year", "rolling")
+
+
+class PartialStore:
+    """
+    Monthly `ReportPartial` states saved next to the reports.
+
+    Every month is a directory (`partials/2025-03/`) with one Parquet file per partial frame.
+    The files are small (group sums only), so loading a year of partials takes milliseconds.
+    """
+
+    def __init__(self, root: str) -> None:
+        """
+        :param root: Directory of the store, usually `PARTIALS_NAME` in the output directory.
+        """
+        self.root = root
+
+    def month_dir(self, year: int, month: int) -> str:
+        """
+        :return: Directory holding the partial of one month.
+        """
+        return os.path.join(self.root, f"{int(year)}-{str(int(month)).zfill(2)}")
+
+    def save(self, partial: ReportPartial) -> str:
+        """
+        Saves the partial of one month, replacing the one saved before.
+
+        :param partial: Partial covering exactly one month.
+        :return: Directory of the saved partial.
+        :raises ValueError: If the partial covers more than one month.
+        """
+        if len(partial.periods) != 1:
+            raise ValueError(f"Only monthly partials are stored, got {partial.periods}")
+
+        directory = self.month_dir(*partial.periods[0])
+        os.makedirs(directory, exist_ok=True)
+        for attribute, filename in PARTIAL_FILES.items():
+            df = getattr(partial, attribute)
+            LoadUtils.atomic_write(os.path.join(directory, filename), lambda path: df.to_parquet(path, index=False))
+        return directory
+
+    def load(self, year: int, month: int) -> ReportPartial:
+        """
+        :return: Partial of one month.
+        :raises FileNotFoundError: If the month has no stored partial.
+        """
+        directory = self.month_dir(year, month)
+        frames = {}
+        for attribute, filename in PARTIAL_FILES.items():
+            path = os.path.join(directory, filename)
+            if not os.path.isfile(path):
+                raise FileNotFoundError(f"No partial for {year}-{str(month).zfill(2)}: {path} is missing")
+            frames[attribute] = pd.read_parquet(path)
+        return ReportPartial([(year, month)], **frames)
+
+    def months(self) -> list:
+        """
+        :return: Sorted (year, month) tuples of the stored partials.
+        """
+        months = []
+        for directory in glob.glob(os.path.join(self.root, "*-*")):
+            match = re.fullmatch(r"(\d{4})-(\d{2})", os.path.basename(directory))
+            if match and all(os.path.isfile(os.path.join(directory, name)) for name in PARTIAL_FILES.values()):
+                months.append((int(match.group(1)), int(match.group(2))))
+        return sorted(months)
+
+    def merged(self, months: list) -> ReportPartial:
+        """
+        :param months: (year, month) tuples to merge.
+        :return: Partial of all the months.
+        :raises FileNotFoundError: If some months have no stored partial.
+        """
+        missing = sorted(set(months) - set(self.months()))
+        if missing:
+            raise FileNotFoundError(f"No partials for {', '.join(f'{y}-{str(m).zfill(2)}' for y, m in missing)}; "
+                                    f"build the reports of these months with --partials first")
+        return ReportPartial.merge([self.load(year, month) for year, month in months])
+
+
+def rollup_window(kind: str, year: int, number: Optional[int] = None) -> tuple[str, list]:
+    """
+    Lists the months of a rollup period.
+
+    :param kind: "quarter", "year" or "rolling" (the 12 months ending with a given month).
+    :param year: Year of the period (for "rolling", of its last month).
+    :param number: Quarter (1-4) or last month (1-12) of a rolling period; unused for "year".
+    :return: PERIOD label of the reports (e.g. "Q1", "YR", "R03") and the (year, month) tuples.
+    :raises ValueError: If the kind or number is not valid.
+    """
+    if kind == "quarter":
+        if number not in range(1, 5):
+            raise ValueError(f"Quarter must be 1-4, got {number}")
+        return f"Q{number}", [(year, month) for month in range(3 * number - 2, 3 * number + 1)]
+    if kind == "year":
+        return "YR", [(year, month) for month in range(1, 13)]
+    if kind == "rolling":
+        if number not in range(1, 13):
+            raise ValueError(f"Last month must be 1-12, got {number}")
+        months = [(year - (1 if offset >= number else 0), (number - 1 - offset) % 12 + 1) for offset in range(12)]
+        return f"R{str(number).zfill(2)}", sorted(months)
+    raise ValueError(f"Unknown rollup period: {kind}. Available: {list(ROLLUP_KINDS)}")
+
+
+def build_rollup(output_dir: str, kind: str, year: int, number: Optional[int] = None,
+                 formats: Optional[dict] = None, save_dir: Optional[str] = None,
+                 rairport: str = DEFAULT_RAIRPORT) -> dict:
+    """
+    Builds and saves the reports of a quarter, year or rolling 12 months from the monthly partials.
+
+    :param output_dir: Directory of the monthly reports, containing the partial store.
+    :param kind: Rollup period kind, see `rollup_window`.
+    :param year: Year of the period.
+    :param number: Quarter or last month, see `rollup_window`.
+    :param formats: Output format per report type; missing reports use `REPORT_FORMATS`.
+    :param save_dir: Directory where the rollup reports are written, `output_dir` by default.
+    :param rairport: ICAO code of the reporting airport the monthly reports were built for.
+    :return: Dictionary with the PERIOD label, saved report paths and merge/load timings in seconds.
+    """
+    formats = {**REPORT_FORMATS, **(formats or {})}
+    label, months = rollup_window(kind, year, number)
+
+    started = time.perf_counter()
+    reports = PartialStore(os.path.join(output_dir, PARTIALS_NAME)).merged(months).reports(label, list(formats), rairport)
+    merge_seconds = time.perf_counter() - started
+
+    save_dir = save_dir or output_dir
+    os.makedirs(save_dir, exist_ok=True)
+    started = time.perf_counter()
+    loaders = [LoadUtils.get_load_strategy(formats[report_type])(df, report_type, year, label)
+               for report_type, df in reports.items()]
+    saved = {result.table_type: result.path for result in Load.load_concurrently(loaders, save_dir)}
+    return {"period": label, "reports": saved,
+            "timings": {"merge": merge_seconds, "load": time.perf_counter() - started}}
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(prog="rollup", description="Build quarterly, annual or rolling 12-month "
+                                                                "reports from the monthly partials.")
+    parser.add_argument("output_dir", help="Directory of the monthly reports.")
+    parser.add_argument("kind", choices=ROLLUP_KINDS, help="Rollup period.")
+    parser.add_argument("year", type=int, help="Year of the period (of its last month for 'rolling').")
+    parser.add_argument("number", type=int, nargs="?", help="Quarter (1-4) or last month of 'rolling' (1-12).")
+    parser.add_argument("--format", action="append", default=[], type=LoadUtils.parse_format_option,
+                        metavar="REPORT=FORMAT",
+                        help="Output format of a report, e.g. A1=parquet. Can be repeated.")
+    parser.add_argument("--save-dir", help="Directory of the rollup reports, the output directory by default.")
+    parser.add_argument("--rairport", default=DEFAULT_RAIRPORT, help="ICAO code of the reporting airport.")
+    args = parser.parse_args(argv)
+    TransformUtils.enable_copy_on_write()
+
+    formats = dict(args.format)
+    try:
+        result = build_rollup(args.output_dir, args.kind, args.year, args.number, formats, args.save_dir,
+                              args.rairport)
+    except (FileNotFoundError, ValueError) as error:
+        print(error, file=sys.stderr)
+        sys.exit(1)
+    timings = result["timings"]
+    print(f" {args.year} {result['period']}: merge {timings['merge']:.3f}s, load {timings['load']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
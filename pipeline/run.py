@@ -0,0 +1,82 @@
+import argparse
+import os
+from typing import Optional
+from extract.frame_cache import FrameCache
+from instrumentation.profiler import PROFILER
+from load.load_config import REPORT_FORMATS
+from load.load_utils import LoadUtils
+from pipeline.batch import build_reports
+from pipeline.history_store import HISTORY_DIR
+from pipeline.preflight import Preflight
+from pipeline.rollup import PARTIALS_NAME
+from pipeline.registry import EXTRACT_STRATEGIES
+from transform.inflot_schema import DTYPE_BACKENDS, INFLOT_SCHEMAS
+from transform.strategies.report_config import DEFAULT_RAIRPORT
+from transform.transform_utils import TransformUtils
+
+
+def run(inflot_path: str, total_path: str, output_dir: str, formats: Optional[dict] = None,
+        cache_dir: str = os.path.join("boxes", "cache"), history_dir: Optional[str] = None,
+        rairport: str = DEFAULT_RAIRPORT, dtype_backend: str = "numpy", partials: bool = False) -> dict:
+    """
+    Extracts one Inflot export and the TOTAL workbook, then builds and saves the reports.
+
+    :param inflot_path: Path to the Inflot export.
+    :param total_path: Path to the TOTAL workbook.
+    :param output_dir: Directory where the reports are written.
+    :param formats: Output format per report type; missing reports use `REPORT_FORMATS`.
+    :param cache_dir: Directory of the FrameCache used for parsed workbooks.
+    :param history_dir: Directory of the FlightHistoryStore receiving the flight records, None (default) to skip it.
+    :param rairport: ICAO code of the reporting airport of the export.
+    :param dtype_backend: Dtypes of the extracted Inflot columns, a key of `INFLOT_SCHEMAS`.
+    :param partials: Store the A1/C1 aggregates of the month in the PartialStore of the output
+        directory, for rollups.
+    :return: Result of `build_reports`.
+    :raises ValueError: If an input fails the preflight check of its header rows.
+    """
+    with PROFILER.session_from_env("main", {"inflot": inflot_path, "total": total_path}):
+        for result in Preflight.check_files([inflot_path], total_path):
+            result.raise_for_errors()
+        cache = FrameCache(cache_dir)
+        df_inflot = EXTRACT_STRATEGIES["inflot"](inflot_path, cache=cache,
+                                                 schema=INFLOT_SCHEMAS[dtype_backend]).retrive_data()
+        if isinstance(df_inflot, str):
+            raise FileNotFoundError(df_inflot)
+        df_total = EXTRACT_STRATEGIES["total"](total_path, cache=cache).retrive_data()
+        if isinstance(df_total, str):
+            raise FileNotFoundError(df_total)
+
+        os.makedirs(output_dir, exist_ok=True)
+        return build_reports(df_inflot, df_total, output_dir, {**REPORT_FORMATS, **(formats or {})}, history_dir,
+                             os.path.join(output_dir, PARTIALS_NAME) if partials else None, rairport)
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(prog="run", description="Generate GUS A1/B1/C1 reports for one Inflot export.")
+    parser.add_argument("inflot_path", help="Path to the Inflot export.")
+    parser.add_argument("total_path", help="Path to the TOTAL workbook.")
+    parser.add_argument("output_dir", help="Directory where the reports are saved.")
+    parser.add_argument("--format", action="append", default=[], type=LoadUtils.parse_format_option,
+                        metavar="REPORT=FORMAT",
+                        help="Output format of a report, e.g. A1=parquet. Can be repeated.")
+    parser.add_argument("--cache-dir", default=os.path.join("boxes", "cache"), help="Directory of the workbook cache.")
+    parser.add_argument("--history", action="store_true", help="Store the flight records in the history store.")
+    parser.add_argument("--history-dir", default=HISTORY_DIR,
+                        help="Directory of the flight history store, used with --history.")
+    parser.add_argument("--partials", action="store_true",
+                        help="Store the monthly A1/C1 aggregates the rollup command merges.")
+    parser.add_argument("--rairport", default=DEFAULT_RAIRPORT, help="ICAO code of the reporting airport.")
+    parser.add_argument("--dtype-backend", choices=DTYPE_BACKENDS, default="numpy",
+                        help="Dtypes of the extracted Inflot text columns.")
+    args = parser.parse_args(argv)
+    TransformUtils.enable_copy_on_write()
+
+    formats = dict(args.format)
+    result = run(args.inflot_path, args.total_path, args.output_dir, formats, args.cache_dir,
+                 args.history_dir if args.history else None, args.rairport, args.dtype_backend, args.partials)
+    timings = result["timings"]
+    print(f" {result['period']}: transform {timings['transform']:.2f}s, load {timings['load']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
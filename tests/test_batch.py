@@ -0,0 +1,56 @@
+import os
+import pytest
+from benchmarks.synthetic import generate_inflot, generate_total_cargo, write_inflot_excel, write_total_excel
+from pipeline.batch import BatchRunner, main
+
+FORMATS = {"A1": "csv", "B1": "csv", "C1": "csv"}
+
+
+@pytest.fixture
+def inputs(tmp_path) -> dict:
+    """
+    Exports of January and February 2025, and one of May 2027, a month missing from TOTAL.
+    """
+    inflot_dir = tmp_path / "inflot"
+    inflot_dir.mkdir()
+    for year, month in [(2025, 1), (2025, 2), (2027, 5)]:
+        write_inflot_excel(generate_inflot(300, year=year, month=month, seed=month),
+                           str(inflot_dir / f"inflot_{str(year)[-2:]}{str(month).zfill(2)}.xlsx"))
+    return {
+        "inflot_dir": str(inflot_dir),
+        "total_path": write_total_excel(generate_total_cargo(2024, 2025), str(tmp_path / "total.xlsx")),
+        "output_dir": str(tmp_path / "reports"),
+        "cache_dir": str(tmp_path / "cache"),
+        "inbox_root": str(tmp_path / "boxes"),
+    }
+
+
+def runner(inputs: dict) -> BatchRunner:
+    return BatchRunner(inputs["inflot_dir"], inputs["total_path"], inputs["output_dir"], max_workers=1,
+                       cache_dir=inputs["cache_dir"], formats=FORMATS, inbox_root=inputs["inbox_root"])
+
+
+def test_failed_month_does_not_stop_the_others(inputs):
+    batch = runner(inputs)
+    results = batch.run()
+
+    assert [result["period"] for result in results] == ["2501", "2502"]
+    assert all(os.path.isfile(path) for result in results for path in result["reports"].values())
+    failure = batch.failures[os.path.join(inputs["inflot_dir"], "inflot_2705.xlsx")]
+    assert failure["period"] == "2705" and failure["error"].startswith("LookupError")
+
+
+def test_second_run_builds_only_the_failed_month_again(inputs):
+    runner(inputs).run()
+    batch = runner(inputs)
+    assert batch.run() == []
+    assert list(batch.plan) == [os.path.join(inputs["inflot_dir"], "inflot_2705.xlsx")]
+    assert len(batch.failures) == 1
+
+
+def test_command_exits_with_an_error_when_a_month_failed(inputs, monkeypatch):
+    monkeypatch.chdir(os.path.dirname(inputs["output_dir"]))
+    with pytest.raises(SystemExit) as exit_info:
+        main([inputs["inflot_dir"], inputs["total_path"], inputs["output_dir"], "--workers", "1",
+              "--format", "A1=csv", "--format", "B1=csv", "--format", "C1=csv"])
+    assert exit_info.value.code == 1
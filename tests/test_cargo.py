@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+from benchmarks.synthetic import generate_total_cargo
+from transform.strategies.cargo_utils.cargo_facts import CargoFacts
+from transform.strategies.cargo_utils.cargo_utils import CargoData
+
+
+@pytest.fixture
+def cargo_sheet() -> pd.DataFrame:
+    """
+    Small CARGO sheet: DHL to WAW and KTW, an empty LOT column, columns dropped by keyword and a
+    UPS column after 'RAZEM ZGR'.
+    """
+    header = [
+        ("ROK", None, None), ("MIESIĄC", None, None),
+        ("DHL", "WAW", "IMPORT"), ("DHL", "WAW", "EXPORT"), ("DHL", "KTW", "Import"), ("LOT", "WAW", "IMPORT"),
+        ("Inne", "WAW", "IMPORT"), ("Truck Welcome", "WAW", "EXPORT"),
+        ("RAZEM ZGR", None, None), ("UPS", "WAW", "IMPORT"),
+    ]
+    rows = [["CARGO - TABELA TOTAL"] + [None] * (len(header) - 1)]
+    rows.extend([column[level] for column in header] for level in range(3))
+    rows.append([2025, "I", 1000, 2000, 500, None, 9000, 9000, 9000, 9000])
+    rows.append([2025, "II", 3000, None, None, 4000, 9000, 9000, 9000, 9000])
+    return pd.DataFrame(rows)
+
+
+def test_header_info_ignores_dropped_and_trimmed_columns(cargo_sheet):
+    info = CargoData(cargo_sheet).header_info()
+    assert info["labels"] == ["ROK", "MIESIĄC", "IMPORT", "EXPORT", "IMPORT", "IMPORT"]
+    assert info["directions"] == ["EXPORT", "IMPORT"]
+
+
+def test_run_aggregates_the_freight_of_the_period(cargo_sheet):
+    df = CargoData(cargo_sheet).run(2025, 1)
+    assert df.to_dict("list") == {
+        "AIRLINEC": ["BCS", "BCS", "BCS"],
+        "PAIRPORT": ["EPKT", "EPWA", "EPWA"],
+        "AD": [1, 1, 2],
+        "FREIGHT ON BOARD": [0.5, 1.0, 2.0],
+    }
+
+
+def test_run_skips_empty_cells_of_the_period(cargo_sheet):
+    df = CargoData(cargo_sheet).run(2025, 2)
+    assert df.to_dict("list") == {
+        "AIRLINEC": ["BCS", "LOT"],
+        "PAIRPORT": ["EPWA", "EPWA"],
+        "AD": [1, 1],
+        "FREIGHT ON BOARD": [3.0, 4.0],
+    }
+
+
+def test_raw_sheet_is_not_modified(cargo_sheet):
+    expected = cargo_sheet.copy()
+    CargoData(cargo_sheet).run(2025, 1)
+    pd.testing.assert_frame_equal(cargo_sheet, expected)
+
+
+def test_period_region_is_empty_for_a_missing_period(cargo_sheet):
+    cargo = CargoData(cargo_sheet)
+    cargo.prepare()
+    assert cargo.period_region(2027, 5).empty
+
+
+def test_fact_table_gives_the_result_of_run_for_every_period():
+    df_total = generate_total_cargo(2024, 2025, airlines=12)
+    facts = CargoFacts(df_total)
+    assert len(facts.sheet_periods) == 24
+    for year, month in sorted(facts.sheet_periods):
+        pd.testing.assert_frame_equal(facts.for_period(year, month), CargoData(df_total).run(year, month))
+
+
+def test_fact_table_rejects_a_period_missing_from_the_sheet(cargo_sheet):
+    facts = CargoFacts(cargo_sheet)
+    assert facts.for_period(2025, 2)["FREIGHT ON BOARD"].tolist() == [3.0, 4.0]
+    with pytest.raises(LookupError):
+        facts.for_period(2025, 3)
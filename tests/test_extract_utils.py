@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+from benchmarks.synthetic import generate_inflot, write_inflot_excel
+from extract.extract_config import READ_ENGINE_ENV
+from extract.extract_utils import ExtractUtils
+from extract.strategies.inflot_extract_strategy import InflotExtractStrategy
+from transform.inflot_schema import DTYPE_BACKENDS, INFLOT_SCHEMAS
+
+
+@pytest.fixture(scope="module")
+def inflot_path(tmp_path_factory) -> str:
+    return write_inflot_excel(generate_inflot(1_000, year=2025, month=2, seed=2),
+                              str(tmp_path_factory.mktemp("inflot") / "inflot.xlsx"))
+
+
+def test_chunks_add_up_to_the_whole_sheet(inflot_path):
+    chunks = list(ExtractUtils.iter_excel_chunks(inflot_path, chunk_size=300))
+    assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+    expected = pd.read_excel(inflot_path)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected, check_dtype=False)
+
+
+def test_chunks_keep_only_the_requested_columns(inflot_path):
+    chunk = next(ExtractUtils.iter_excel_chunks(inflot_path, chunk_size=50, usecols=[0, 2]))
+    assert list(chunk.columns) == list(pd.read_excel(inflot_path, nrows=0).columns[[0, 2]])
+
+
+@pytest.mark.parametrize("backend", DTYPE_BACKENDS)
+def test_every_chunk_gets_the_schema_dtypes(inflot_path, backend):
+    schema = INFLOT_SCHEMAS[backend]
+    expected = InflotExtractStrategy(inflot_path, schema=schema, copy_to_inbox=False).retrive_data()
+    chunks = list(InflotExtractStrategy(inflot_path, schema=schema, copy_to_inbox=False).iter_chunks(300))
+
+    assert len(chunks) == 4
+    for chunk in chunks:
+        # Categories are those of the chunk, so only the dtype names are compared.
+        pd.testing.assert_series_equal(chunk.dtypes.astype(str), expected.dtypes.astype(str))
+    text = {column: object for column, dtype in expected.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)}
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True).astype(text), expected.astype(text))
+
+
+def test_default_read_engines(monkeypatch):
+    monkeypatch.delenv(READ_ENGINE_ENV, raising=False)
+    assert ExtractUtils.read_engine("inflot.xls") == "xlrd"
+    assert ExtractUtils.read_engine("inflot.xlsx") == "openpyxl"
+    monkeypatch.setenv(READ_ENGINE_ENV, "auto")
+    assert ExtractUtils.read_engine("inflot.xlsx") == "openpyxl"
+
+
+def test_unusable_read_engine_is_rejected(monkeypatch):
+    with pytest.raises(ValueError):
+        ExtractUtils.read_engine("inflot.xlsx", "xlrd")
+    monkeypatch.setattr(ExtractUtils, "engine_available", staticmethod(lambda engine: False))
+    with pytest.raises(ValueError):
+        ExtractUtils.read_engine("inflot.xlsx", "calamine")
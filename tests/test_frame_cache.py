@@ -0,0 +1,75 @@
+import datetime
+import os
+import shutil
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from extract.frame_cache import FrameCache
+
+
+def write_workbook(path, rows: int = 20, offset: int = 0) -> str:
+    pd.DataFrame({"code": [f"EP{i + offset:03d}" for i in range(rows)],
+                  "count": range(offset, offset + rows)}).to_excel(path, index=False)
+    return str(path)
+
+
+def entries(cache: FrameCache) -> set:
+    return {name for name in os.listdir(cache.cache_dir) if name.endswith(FrameCache.EXTENSION)}
+
+
+@pytest.fixture
+def cache(tmp_path) -> FrameCache:
+    return FrameCache(str(tmp_path / "cache"))
+
+
+def test_mixed_object_column_round_trips(cache):
+    df = pd.DataFrame({
+        "mixed": pd.Series(["EPGD", 7, 2.5, np.nan, None, datetime.datetime(2025, 2, 1), True], dtype=object),
+        "count": range(7),
+    })
+    path = cache.entry_path("mixed")
+    assert cache.store(df, path)
+    pd.testing.assert_frame_equal(cache.load(path), df)
+
+
+def test_warm_read_does_not_parse_the_workbook(cache, tmp_path, monkeypatch):
+    path = write_workbook(tmp_path / "a.xlsx")
+    expected = cache.read_excel(path, engine="openpyxl")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the workbook was parsed again")
+
+    monkeypatch.setattr(pd, "read_excel", fail)
+    pd.testing.assert_frame_equal(cache.read_excel(path, engine="openpyxl"), expected)
+    copy = shutil.copy(path, tmp_path / "copy.xlsx")
+    pd.testing.assert_frame_equal(cache.read_excel(copy, engine="openpyxl"), expected)
+
+
+def test_changed_content_or_options_give_a_new_key(cache, tmp_path):
+    path = write_workbook(tmp_path / "a.xlsx")
+    key = cache.make_key(path, sheet_name=0)
+    assert cache.make_key(path, sheet_name=0, header=None) != key
+    assert cache.make_key(path, sheet_name=0, engine="calamine") != key
+
+    time.sleep(0.01)
+    write_workbook(tmp_path / "a.xlsx", offset=1)
+    assert cache.make_key(path, sheet_name=0) != key
+    assert cache.read_excel(path)["count"].tolist()[0] == 1
+
+
+def test_least_recently_used_entry_is_evicted(cache, tmp_path):
+    paths = [write_workbook(tmp_path / f"{name}.xlsx", offset=index * 100) for index, name in enumerate("abc")]
+    keys = [cache.make_key(path) for path in paths]
+    cache.read_excel(paths[0])
+    cache.read_excel(paths[1])
+    sizes = [os.path.getsize(cache.entry_path(key)) for key in keys[:2]]
+    cache.max_bytes = sum(sizes) + min(sizes) // 2
+
+    now = time.time()
+    os.utime(cache.entry_path(keys[0]), (now - 100, now - 100))
+    os.utime(cache.entry_path(keys[1]), (now - 50, now - 50))
+    cache.read_excel(paths[0])
+    cache.read_excel(paths[2])
+
+    assert entries(cache) == {os.path.basename(cache.entry_path(key)) for key in (keys[0], keys[2])}
@@ -0,0 +1,61 @@
+import argparse
+import os
+import pytest
+from load.load_utils import LoadUtils
+
+
+def write_text(text: str):
+    def writer(path: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+    return writer
+
+
+def test_atomic_write_replaces_the_file(tmp_path):
+    path = str(tmp_path / "EP2502A1.csv")
+    assert LoadUtils.atomic_write(path, write_text("old")) == path
+    LoadUtils.atomic_write(path, write_text("new"))
+    assert open(path, encoding="utf-8").read() == "new"
+    assert os.listdir(tmp_path) == ["EP2502A1.csv"]
+
+
+def test_atomic_write_keeps_the_extension_of_the_temporary_file(tmp_path):
+    seen = []
+
+    def writer(path: str) -> None:
+        seen.append(path)
+        write_text("x")(path)
+
+    LoadUtils.atomic_write(str(tmp_path / "EP2502A1.parquet"), writer)
+    assert os.path.dirname(seen[0]) == str(tmp_path)
+    assert seen[0].endswith(".parquet") and os.path.basename(seen[0]).startswith(".~")
+
+
+def test_failed_write_keeps_the_previous_version(tmp_path):
+    path = str(tmp_path / "EP2502A1.csv")
+    LoadUtils.atomic_write(path, write_text("old"))
+
+    def failing_writer(temp_path: str) -> None:
+        write_text("partial")(temp_path)
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        LoadUtils.atomic_write(path, failing_writer)
+    assert open(path, encoding="utf-8").read() == "old"
+    assert os.listdir(tmp_path) == ["EP2502A1.csv"]
+
+
+def test_report_filename():
+    assert LoadUtils.generate_report_filename("C1", 2024, 12) == "EP2412C1"
+    assert LoadUtils.generate_report_filename("A1", "25", 3) == "EP2503A1"
+
+
+def test_format_option_is_parsed():
+    assert LoadUtils.parse_format_option("A1=parquet") == ("A1", "parquet")
+    assert LoadUtils.parse_format_option("C1=sqlite") == ("C1", "sqlite")
+
+
+@pytest.mark.parametrize("option", ["A1", "Z1=csv", "A1=xls", "=csv"])
+def test_invalid_format_option_is_a_usage_error(option):
+    with pytest.raises(argparse.ArgumentTypeError):
+        LoadUtils.parse_format_option(option)
@@ -0,0 +1,70 @@
+import os
+import pytest
+from benchmarks.synthetic import generate_total_cargo
+from pipeline.manifest import BuildManifest, TotalFingerprints
+
+FORMATS = {"A1": "xlsx", "B1": "xlsx", "C1": "xlsx"}
+
+
+@pytest.fixture
+def df_total():
+    return generate_total_cargo(2024, 2025, airlines=12)
+
+
+@pytest.fixture
+def manifest(tmp_path, df_total) -> BuildManifest:
+    """
+    Manifest of a build of the February 2025 reports from the export "inflot-1".
+    """
+    manifest = BuildManifest(str(tmp_path / "manifest.json"))
+    reports = {}
+    for report_type in FORMATS:
+        reports[report_type] = str(tmp_path / f"EP2502{report_type}.xlsx")
+        open(reports[report_type], "w").close()
+    manifest.record_build({"year": 2025, "month": 2, "reports": reports}, "inflot-1", TotalFingerprints(df_total),
+                          FORMATS)
+    manifest.save()
+    return BuildManifest(manifest.path)
+
+
+def test_reports_of_a_recorded_build_are_up_to_date(manifest, df_total):
+    assert manifest.period_of("inflot-1") == (2025, 2)
+    assert manifest.stale_reports(list(FORMATS), "inflot-1", TotalFingerprints(df_total), FORMATS) == []
+
+
+def test_every_report_of_a_new_export_is_stale(manifest, df_total):
+    assert manifest.stale_reports(list(FORMATS), "inflot-2", TotalFingerprints(df_total), FORMATS) == ["A1", "B1", "C1"]
+
+
+def test_changed_format_or_missing_file_makes_only_that_report_stale(manifest, df_total, tmp_path):
+    total = TotalFingerprints(df_total)
+    assert manifest.stale_reports(list(FORMATS), "inflot-1", total, {**FORMATS, "B1": "csv"}) == ["B1"]
+    os.remove(tmp_path / "EP2502C1.xlsx")
+    assert manifest.stale_reports(list(FORMATS), "inflot-1", total, FORMATS) == ["C1"]
+
+
+def test_other_reporting_airport_makes_every_report_stale(manifest, df_total):
+    other = BuildManifest(manifest.path, rairport="EPWA")
+    assert other.stale_reports(list(FORMATS), "inflot-1", TotalFingerprints(df_total), FORMATS) == ["A1", "B1", "C1"]
+
+
+def test_cargo_change_of_the_period_makes_every_report_stale(manifest, df_total):
+    row = df_total.index[(df_total[0] == 2025) & (df_total[1] == "II")][0]
+    column = df_total.columns[df_total.loc[row].notna()][2]
+    df_total.loc[row, column] = df_total.loc[row, column] + 1
+    assert manifest.stale_reports(list(FORMATS), "inflot-1", TotalFingerprints(df_total), FORMATS) == ["A1", "B1", "C1"]
+
+
+def test_cargo_change_of_another_period_keeps_the_fingerprint(df_total):
+    before = TotalFingerprints(df_total)
+    row = df_total.index[(df_total[0] == 2025) & (df_total[1] == "III")][0]
+    df_total.loc[row, 2] = 123_456
+    after = TotalFingerprints(df_total)
+    assert after.get(2025, 2) == before.get(2025, 2)
+    assert after.get(2025, 3) != before.get(2025, 3)
+
+
+def test_unreadable_manifest_is_empty(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert BuildManifest(str(path)).reports == {}
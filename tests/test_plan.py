@@ -0,0 +1,98 @@
+import pandas as pd
+import pytest
+from benchmarks.synthetic import generate_inflot
+from transform.inflot_schema import INFLOT_SCHEMAS
+from transform.plan import Aggregate, Derive, Filter, LogicalPlan, PlanNode, PlanOptimizer, Project
+from transform.strategies.gus_a1.gus_a1_transform_strategy import A1TransformStrategy
+
+
+def assert_same_result(plan: LogicalPlan, df: pd.DataFrame) -> None:
+    """
+    Checks that the optimized plan gives the same frame as the steps as recorded.
+    """
+    expected = plan.execute(df, optimize=False).reset_index(drop=True)
+    pd.testing.assert_frame_equal(plan.execute(df).reset_index(drop=True), expected)
+
+
+@pytest.fixture
+def df() -> pd.DataFrame:
+    return pd.DataFrame({"x": [1, 2, 3], "y": [10, 20, 30], "kind": ["a", "b", "a"]})
+
+
+def test_derivations_of_the_same_column_are_not_fused(df):
+    plan = LogicalPlan([
+        Derive("x", lambda frame: frame["x"] + 1, ["x"]),
+        Derive("x", lambda frame: frame["x"] * 10, ["x"]),
+        Project(["x"]),
+    ])
+    assert plan.execute(df)["x"].tolist() == [20, 30, 40]
+    assert_same_result(plan, df)
+    assert sum(isinstance(node, Derive) for node in plan.optimize().nodes) == 2
+
+
+def test_derivation_reading_a_derived_column_is_not_fused(df):
+    plan = LogicalPlan([
+        Derive("z", lambda frame: frame["x"] + frame["y"], ["x", "y"]),
+        Derive("w", lambda frame: frame["z"] * 2, ["z"]),
+        Project(["w"]),
+    ])
+    assert_same_result(plan, df)
+    assert sum(isinstance(node, Derive) for node in plan.optimize().nodes) == 2
+
+
+def test_independent_derivations_are_fused(df):
+    nodes = PlanOptimizer.fuse_derivations([
+        Derive("z", lambda frame: frame["x"] + 1, ["x"]),
+        Derive("w", lambda frame: frame["y"] + 1, ["y"]),
+    ])
+    assert len(nodes) == 1
+    assert nodes[0].outputs() == ["z", "w"]
+
+
+def test_filter_is_pushed_before_derivations_it_does_not_read(df):
+    plan = LogicalPlan([
+        Derive("z", lambda frame: frame["x"] * 2, ["x"]),
+        Filter("kind", ["a"]),
+        Project(["kind", "z"]),
+    ])
+    optimized = plan.optimize().nodes
+    assert optimized.index(next(node for node in optimized if isinstance(node, Filter))) < \
+        optimized.index(next(node for node in optimized if isinstance(node, Derive)))
+    assert_same_result(plan, df)
+
+
+def test_filter_stays_after_the_derivation_of_its_column(df):
+    plan = LogicalPlan([
+        Derive("kind", lambda frame: frame["kind"].str.upper(), ["kind"]),
+        Filter("kind", ["A"]),
+        Project(["kind", "x"]),
+    ])
+    assert isinstance(plan.optimize().nodes[0], Project)
+    assert plan.execute(df)["x"].tolist() == [1, 3]
+    assert_same_result(plan, df)
+
+
+def test_unused_derivations_are_pruned(df):
+    plan = LogicalPlan([
+        Derive("z", lambda frame: frame["x"] + 1, ["x"]),
+        Derive("unused", lambda frame: frame["y"] + 1, ["y"]),
+        Aggregate(["kind"], {"z": "sum"}),
+    ])
+    optimized = plan.optimize()
+    assert "unused" not in optimized.explain()
+    assert_same_result(plan, df)
+
+
+def test_plan_node_is_abstract():
+    with pytest.raises(TypeError):
+        PlanNode()
+
+
+@pytest.mark.parametrize("backend", ["plain", "numpy", "pyarrow"])
+def test_a1_plan_gives_the_same_result_optimized(backend):
+    df_inflot = generate_inflot(5_000, year=2025, month=2, seed=3)
+    if backend != "plain":
+        schema = INFLOT_SCHEMAS[backend]
+        df_inflot = schema.apply(df_inflot.iloc[:, schema.select_columns(list(df_inflot.columns))])
+    plan = A1TransformStrategy(df_inflot, pd.DataFrame()).build_plan()
+    assert_same_result(plan, df_inflot)
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+from benchmarks.synthetic import generate_inflot, generate_total_cargo
+from transform.inflot_schema import DTYPE_BACKENDS, INFLOT_SCHEMAS
+from transform.report_runner import ReportRunner
+from transform.strategies.cargo_utils.cargo_cache import CARGO_RESULTS_CACHE
+from transform.strategies.gus_a1.gus_a1_transform_strategy import A1TransformStrategy
+from transform.strategies.gus_b1.gus_b1_transform_strategy import B1TransformStrategy
+from transform.strategies.gus_c1.gus_c1_transform_strategy import C1TransformStrategy
+from transform.transform import Transform
+
+
+@pytest.fixture(scope="module")
+def df_inflot() -> pd.DataFrame:
+    return generate_inflot(3_000, year=2025, month=2, seed=1)
+
+
+@pytest.fixture(scope="module")
+def df_total() -> pd.DataFrame:
+    return generate_total_cargo(2024, 2025)
+
+
+@pytest.fixture(scope="module")
+def reports(df_inflot, df_total) -> dict:
+    with ReportRunner(df_inflot, df_total) as runner:
+        return runner.run().compute_all()
+
+
+def test_reports_are_not_empty(reports):
+    assert list(reports) == ["A1", "B1", "C1"]
+    assert all(len(df) for df in reports.values())
+    assert (reports["A1"]["FREIGHT ON BOARD"] > 0).any()
+    assert (reports["C1"]["FREIGHT"] > 0).any()
+
+
+def test_runner_gives_the_reports_of_the_strategies_run_one_by_one(df_inflot, df_total, reports):
+    CARGO_RESULTS_CACHE.clear()
+    df_a1 = Transform(A1TransformStrategy(df_inflot, df_total, "EPGD")).run()
+    pd.testing.assert_frame_equal(df_a1, reports["A1"])
+    pd.testing.assert_frame_equal(Transform(B1TransformStrategy(df_a1)).run(), reports["B1"])
+    pd.testing.assert_frame_equal(Transform(C1TransformStrategy(df_inflot, df_total, "EPGD")).run(), reports["C1"])
+
+
+def test_runner_builds_only_the_requested_reports(df_inflot, df_total):
+    with ReportRunner(df_inflot, df_total) as runner:
+        runner.run().compute(["C1"])
+        assert set(runner.instances) == {"C1"}
+
+
+@pytest.mark.parametrize("backend", DTYPE_BACKENDS)
+def test_schema_input_gives_the_same_reports(df_inflot, df_total, reports, backend):
+    schema = INFLOT_SCHEMAS[backend]
+    df_schema = schema.apply(df_inflot.iloc[:, schema.select_columns(list(df_inflot.columns))])
+    with ReportRunner(df_schema, df_total) as runner:
+        for report_type, df in runner.run().compute_all().items():
+            pd.testing.assert_frame_equal(df, reports[report_type])
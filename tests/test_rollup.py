@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+from benchmarks.synthetic import generate_inflot, generate_total_cargo
+from pipeline.rollup import PartialStore, rollup_window
+from transform.report_runner import ReportRunner
+from transform.rollup import ReportPartial
+
+
+@pytest.fixture(scope="module")
+def df_total() -> pd.DataFrame:
+    return generate_total_cargo(2024, 2025)
+
+
+def month_partial(df_total: pd.DataFrame, month: int) -> tuple[ReportPartial, dict]:
+    """
+    :return: Partial of a synthetic month of 2025 and the monthly reports it was built with.
+    """
+    with ReportRunner(generate_inflot(1_000, year=2025, month=month, seed=month), df_total) as runner:
+        bundle = runner.run()
+        reports = bundle.compute_all()
+        return ReportPartial.from_bundle(bundle, df_total, 2025, month), reports
+
+
+def test_partial_of_one_month_gives_the_monthly_reports(df_total):
+    partial, reports = month_partial(df_total, 2)
+    for report_type, df in partial.reports(2).items():
+        pd.testing.assert_frame_equal(df, reports[report_type], check_dtype=False)
+
+
+def test_stored_partials_are_merged(df_total, tmp_path):
+    store = PartialStore(str(tmp_path / "partials"))
+    partials = [month_partial(df_total, month)[0] for month in (1, 2)]
+    for partial in partials:
+        store.save(partial)
+
+    assert store.months() == [(2025, 1), (2025, 2)]
+    merged = store.merged([(2025, 1), (2025, 2)]).reports("Q1", ["A1"])["A1"]
+    expected = ReportPartial.merge(partials).reports("Q1", ["A1"])["A1"]
+    pd.testing.assert_frame_equal(merged, expected, check_dtype=False)
+    with pytest.raises(FileNotFoundError):
+        store.merged(rollup_window("quarter", 2025, 1)[1])
+
+
+def test_rollup_windows():
+    assert rollup_window("quarter", 2025, 2) == ("Q2", [(2025, 4), (2025, 5), (2025, 6)])
+    assert rollup_window("year", 2025)[1] == [(2025, month) for month in range(1, 13)]
+    label, months = rollup_window("rolling", 2025, 3)
+    assert label == "R03" and months[0] == (2024, 4) and months[-1] == (2025, 3) and len(months) == 12
+    with pytest.raises(ValueError):
+        rollup_window("quarter", 2025, 5)
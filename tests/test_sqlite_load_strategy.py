@@ -0,0 +1,56 @@
+import sqlite3
+import pandas as pd
+import pytest
+from load.strategies.sqlite_load_strategy import SqliteLoadStrategy
+
+
+def report(period: int, freight: list) -> pd.DataFrame:
+    return pd.DataFrame({
+        "YEAR": ["25"] * len(freight),
+        "PERIOD": [period] * len(freight),
+        "TABLE": ["A1"] * len(freight),
+        "RAIRPORT": ["EPGD"] * len(freight),
+        "FREIGHT ON BOARD": freight,
+    })
+
+
+def read_table(path: str) -> list:
+    with sqlite3.connect(path) as connection:
+        return connection.execute('SELECT "YEAR", typeof("YEAR"), "PERIOD", "LINE", "FREIGHT ON BOARD" '
+                                  'FROM GUS_A1 ORDER BY "PERIOD", "LINE"').fetchall()
+
+
+def test_year_is_a_four_digit_integer(tmp_path):
+    path = SqliteLoadStrategy(report(2, [1.5]), "A1", "25", 2).load(str(tmp_path))
+    assert read_table(path) == [(2025, "integer", 2, 0, 1.5)]
+
+
+def test_reloading_a_period_replaces_only_its_rows(tmp_path):
+    SqliteLoadStrategy(report(1, [1.0, 2.0]), "A1", 2025, 1).load(str(tmp_path))
+    SqliteLoadStrategy(report(2, [3.0, 4.0, 5.0]), "A1", 2025, 2).load(str(tmp_path))
+    path = SqliteLoadStrategy(report(2, [6.0]), "A1", 2025, 2).load(str(tmp_path))
+    assert read_table(path) == [
+        (2025, "integer", 1, 0, 1.0),
+        (2025, "integer", 1, 1, 2.0),
+        (2025, "integer", 2, 0, 6.0),
+    ]
+
+
+def test_table_with_two_digit_text_years_is_migrated(tmp_path):
+    path = str(tmp_path / "reports.sqlite")
+    with sqlite3.connect(path) as connection:
+        connection.execute('CREATE TABLE GUS_A1 ("YEAR" TEXT, "PERIOD" INTEGER, "TABLE" TEXT, "RAIRPORT" TEXT, '
+                           '"FREIGHT ON BOARD" REAL, "LINE" INTEGER NOT NULL, '
+                           'PRIMARY KEY ("YEAR", "PERIOD", "TABLE", "RAIRPORT", "LINE")) WITHOUT ROWID')
+        connection.executemany("INSERT INTO GUS_A1 VALUES (?, ?, ?, ?, ?, ?)",
+                               [("25", 1, "A1", "EPGD", 1.0, 0), ("25", 2, "A1", "EPGD", 9.0, 0)])
+
+    SqliteLoadStrategy(report(2, [2.0]), "A1", 2025, 2).load(path)
+    assert read_table(path) == [(2025, "integer", 1, 0, 1.0), (2025, "integer", 2, 0, 2.0)]
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall() == [("GUS_A1",)]
+
+
+def test_report_without_key_columns_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        SqliteLoadStrategy(report(2, [1.0]).drop(columns="RAIRPORT"), "A1", 2025, 2).load(str(tmp_path))
@@ -0,0 +1,51 @@
+from extract.input_schema import InputSchema
+from transform.strategies.gus_a1.gus_a1_config import REPORT_MAPPINGS as A1_REPORT_MAPPINGS
+from transform.strategies.gus_c1.gus_c1_config import REPORT_MAPPINGS as C1_REPORT_MAPPINGS
+
+# Inflot columns used by the transforms besides the keys of the report mappings.
+INFLOT_EXTRA_COLUMNS = ["Typ rejsu", "TTL", "Infant"]
+
+# Compact dtypes of the Inflot columns; columns not listed keep the dtype inferred by pandas.
+INFLOT_DTYPES = {
+    "Typ rejsu": "category",
+    "Operacja": "category",
+    "Port ICAO": "category",
+    "Przewoźnik ICAO": "category",
+    "Model samolotu": "category",
+    "TTL": "Int16",
+    "Infant": "Int16",
+    "Tranzyt": "Int16",
+    "PAX Capacity": "Int16",
+}
+
+# Dtype of the text columns with the "pyarrow" backend: flight types and ICAO codes stay in Arrow
+# string arrays, so filters, mappings and groupbys run on Arrow compute kernels. Counts keep the
+# nullable Int16 dtype, whose kernels are already native. The transforms convert counts to the
+# dtypes of plain input before filling blanks (`TransformUtils.plain_counts`) and text back after
+# aggregation (`TransformUtils.uncategorize`), so both backends give the same output as plain input.
+ARROW_STRING_DTYPE = "string[pyarrow]"
+
+DTYPE_BACKENDS = ("numpy", "pyarrow")
+
+
+def build_inflot_schema(backend: str = "numpy") -> InputSchema:
+    """
+    Builds the Inflot input schema from the A1 and C1 transform configs.
+
+    :param backend: "numpy" for categorical text columns, "pyarrow" for Arrow-backed strings.
+    :return: InputSchema with every Inflot column the transforms read.
+    :raises ValueError: If the backend is unknown.
+    """
+    if backend not in DTYPE_BACKENDS:
+        raise ValueError(f"Unknown dtype backend: {backend}. Available: {list(DTYPE_BACKENDS)}")
+
+    columns = list(dict.fromkeys([*A1_REPORT_MAPPINGS, *C1_REPORT_MAPPINGS, *INFLOT_EXTRA_COLUMNS]))
+    dtypes = {column: INFLOT_DTYPES[column] for column in columns if column in INFLOT_DTYPES}
+    if backend == "pyarrow":
+        dtypes = {column: ARROW_STRING_DTYPE if dtype == "category" else dtype for column, dtype in dtypes.items()}
+    return InputSchema(columns, dtypes)
+
+
+INFLOT_SCHEMA = build_inflot_schema()
+
+INFLOT_SCHEMAS = {"numpy": INFLOT_SCHEMA, "pyarrow": build_inflot_schema("pyarrow")}
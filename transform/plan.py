@@ -0,0 +1,313 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+import pandas as pd
+from instrumentation.profiler import profiled_step
+from transform.transform_utils import TransformUtils
+
+
+class PlanNode(ABC):
+    """
+    Step of a `LogicalPlan`: a DataFrame operation with the columns it reads and writes.
+
+    The `execute` methods are profiled steps, so profiles show the time of every executed node
+    (e.g. 'Filter.execute') under the step running the plan.
+    """
+
+    def inputs(self) -> list:
+        """
+        :return: Columns the step reads.
+        """
+        return []
+
+    def outputs(self) -> list:
+        """
+        :return: Columns the step adds or replaces.
+        """
+        return []
+
+    @abstractmethod
+    def execute(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """
+        :param dataframe: Input of the step.
+        :return: New DataFrame; the input is never modified.
+        """
+
+    @abstractmethod
+    def describe(self) -> str:
+        """
+        :return: One-line description used by `LogicalPlan.explain`.
+        """
+
+
+class Rename(PlanNode):
+    """
+    Cleans the column names and renames them, see `TransformUtils.rename_columns`.
+    """
+
+    def __init__(self, mapping: dict) -> None:
+        """
+        :param mapping: Cleaned source column name -> new name.
+        """
+        self.mapping = mapping
+
+    @profiled_step()
+    def execute(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        return TransformUtils.rename_columns(dataframe, self.mapping)
+
+    def describe(self) -> str:
+        return "Rename " + ", ".join(f"{old} -> {new}" for old, new in self.mapping.items())
+
+
+class Derive(PlanNode):
+    """
+    Adds or replaces columns computed row by row from other columns.
+
+    Columns are computed in order, so a column may read one derived before it in the same node.
+    """
+
+    def __init__(self, column: Optional[str] = None, function: Optional[Callable] = None,
+                 inputs: Optional[list] = None, columns: Optional[dict] = None) -> None:
+        """
+        :param column: Name of the derived column.
+        :param function: Called with the DataFrame, returns the values of the column.
+        :param inputs: Columns the function reads.
+        :param columns: Several derivations at once, name -> (function, inputs), instead of the above.
+        """
+        self.columns = dict(columns or {})
+        if column is not None:
+            self.columns[column] = (function, list(inputs or []))
+
+    def inputs(self) -> list:
+        outputs = set()
+        inputs = []
+        for column, (_, column_inputs) in self.columns.items():
+            inputs += [name for name in column_inputs if name not in outputs and name not in inputs]
+            outputs.add(column)
+        return inputs
+
+    def outputs(self) -> list:
+        return list(self.columns)
+
+    @profiled_step()
+    def execute(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        return dataframe.assign(**{column: function for column, (function, _) in self.columns.items()})
+
+    def describe(self) -> str:
+        return "Derive " + ", ".join(f"{column} <- {inputs}" for column, (_, inputs) in self.columns.items())
+
+
+class Filter(PlanNode):
+    """
+    Keeps the rows whose value of a column is in a list, see `TransformUtils.keep_relevant_rows`.
+    """
+
+    def __init__(self, column: str, values: list) -> None:
+        """
+        :param column: Column the rows are filtered on.
+        :param values: Values of the kept rows.
+        """
+        self.column = column
+        self.values = values
+
+    def inputs(self) -> list:
+        return [self.column]
+
+    @profiled_step()
+    def execute(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        return TransformUtils.keep_relevant_rows(dataframe, self.column, self.values)
+
+    def describe(self) -> str:
+        return f"Filter {self.column} in {self.values}"
+
+
+class Project(PlanNode):
+    """
+    Keeps the given columns, in the given order, see `TransformUtils.keep_relevant_columns`.
+    """
+
+    def __init__(self, columns: list) -> None:
+        """
+        :param columns: Columns to keep.
+        """
+        self.columns = list(columns)
+
+    def inputs(self) -> list:
+        return list(self.columns)
+
+    @profiled_step()
+    def execute(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        return TransformUtils.keep_relevant_columns(dataframe, self.columns)
+
+    def describe(self) -> str:
+        return f"Project {self.columns}"
+
+
+class Aggregate(PlanNode):
+    """
+    Groups the rows and aggregates every group into one row.
+    """
+
+    def __init__(self, keys: list, aggregations: dict, observed: bool = True) -> None:
+        """
+        :param keys: Group key columns.
+        :param aggregations: Column -> aggregation function or name, as accepted by `DataFrameGroupBy.agg`.
+        :param observed: Only combinations of categorical keys present in the data form groups.
+        """
+        self.keys = list(keys)
+        self.aggregations = aggregations
+        self.observed = observed
+
+    def inputs(self) -> list:
+        return self.keys + [column for column in self.aggregations if column not in self.keys]
+
+    @profiled_step()
+    def execute(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        return dataframe.groupby(self.keys, as_index=False, observed=self.observed).agg(self.aggregations)
+
+    def describe(self) -> str:
+        aggregations = {column: getattr(function, "__name__", function) for column, function in self.aggregations.items()}
+        return f"Aggregate by {self.keys}: {aggregations}"
+
+
+class PlanOptimizer:
+    """
+    Rewrites a list of plan nodes into an equivalent one that does less work.
+
+    - Filters are pushed down to the start of the plan: before projections and before derived
+      columns they do not read, so later steps run on the kept rows only.
+    - Columns are pruned: derived columns no later step reads are dropped, and a projection to
+      the columns the plan needs is added right after the leading renames.
+    - Consecutive independent derivations are fused into one node, which builds one new frame
+      instead of one per derivation.
+
+    Renames and aggregations are barriers: nothing is moved across them.
+    """
+
+    @staticmethod
+    def optimize(nodes: list) -> list:
+        """
+        :param nodes: Plan nodes in execution order.
+        :return: Optimized nodes in execution order.
+        """
+        nodes = PlanOptimizer.push_down_filters(nodes)
+        nodes = PlanOptimizer.prune_columns(nodes)
+        return PlanOptimizer.fuse_derivations(nodes)
+
+    @staticmethod
+    def push_down_filters(nodes: list) -> list:
+        """
+        :return: Nodes with every filter moved before the projections and derivations preceding it,
+            as long as it does not read a column they derive.
+        """
+        optimized = []
+        for node in nodes:
+            position = len(optimized)
+            if isinstance(node, Filter):
+                while position > 0:
+                    previous = optimized[position - 1]
+                    movable = isinstance(previous, Project) or (
+                        isinstance(previous, Derive) and not set(node.inputs()) & set(previous.outputs()))
+                    if not movable:
+                        break
+                    position -= 1
+            optimized.insert(position, node)
+        return optimized
+
+    @staticmethod
+    def prune_columns(nodes: list) -> list:
+        """
+        :return: Nodes without unused derived columns, starting with a projection to the source
+            columns the plan reads when the plan ends with a projection or an aggregation.
+        """
+        required = None
+        pruned = []
+        for node in reversed(nodes):
+            if isinstance(node, Rename):
+                pruned.append(node)
+                continue
+            if isinstance(node, Derive) and required is not None:
+                kept = {}
+                for column, (function, inputs) in reversed(node.columns.items()):
+                    if column in required:
+                        kept[column] = (function, inputs)
+                        required = (required - {column}) | set(inputs)
+                if not kept:
+                    continue
+                node = Derive(columns=dict(reversed(kept.items())))
+            elif isinstance(node, (Project, Aggregate)):
+                required = set(node.inputs())
+            elif required is not None:
+                required |= set(node.inputs())
+            pruned.append(node)
+        pruned.reverse()
+
+        if required is None:
+            return pruned
+        start = 0
+        while start < len(pruned) and isinstance(pruned[start], Rename):
+            start += 1
+        if start < len(pruned) and isinstance(pruned[start], Project) and set(pruned[start].columns) == required:
+            return pruned
+        order = [column for node in pruned[start:] for column in node.inputs() if column in required]
+        return pruned[:start] + [Project(list(dict.fromkeys(order)))] + pruned[start:]
+
+    @staticmethod
+    def fuse_derivations(nodes: list) -> list:
+        """
+        :return: Nodes with consecutive derivations merged into one, unless the second one reads or
+            rewrites a column derived by the first; merging would then drop the first derivation.
+        """
+        fused = []
+        for node in nodes:
+            if isinstance(node, Derive) and fused and isinstance(fused[-1], Derive) \
+                    and not set(node.inputs() + node.outputs()) & set(fused[-1].outputs()):
+                fused[-1] = Derive(columns={**fused[-1].columns, **node.columns})
+            else:
+                fused.append(node)
+        return fused
+
+
+class LogicalPlan:
+    """
+    Transform steps recorded as data and executed in one go.
+
+    Steps are added with `then` and nothing runs until `execute`, which first rewrites the steps
+    with `PlanOptimizer`; `explain` shows the steps that will run.
+    """
+
+    def __init__(self, nodes: Optional[list] = None) -> None:
+        """
+        :param nodes: Plan nodes in execution order.
+        """
+        self.nodes = list(nodes or [])
+
+    def then(self, node: PlanNode) -> "LogicalPlan":
+        """
+        :param node: Step to run after the current ones.
+        :return: New plan ending with the step.
+        """
+        return LogicalPlan(self.nodes + [node])
+
+    def optimize(self) -> "LogicalPlan":
+        """
+        :return: Equivalent optimized plan.
+        """
+        return LogicalPlan(PlanOptimizer.optimize(self.nodes))
+
+    def execute(self, dataframe: pd.DataFrame, optimize: bool = True) -> pd.DataFrame:
+        """
+        :param dataframe: Input of the first step; it is not modified.
+        :param optimize: Run the optimized plan; False runs the steps as recorded.
+        :return: Output of the last step.
+        """
+        for node in (self.optimize() if optimize else self).nodes:
+            dataframe = node.execute(dataframe)
+        return dataframe
+
+    def explain(self, optimized: bool = True) -> str:
+        """
+        :param optimized: Describe the optimized plan; False describes the steps as recorded.
+        :return: Steps in execution order, one per line.
+        """
+        nodes = (self.optimize() if optimized else self).nodes
+        return "\n".join(f"{position}. {node.describe()}" for position, node in enumerate(nodes, start=1))
@@ -0,0 +1,195 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+import pandas as pd
+from instrumentation.profiler import PROFILER
+from transform.transform import Transform
+from transform.transform_utils import TransformUtils
+from transform.strategies.gus_a1.gus_a1_transform_strategy import A1TransformStrategy
+from transform.strategies.gus_b1.gus_b1_transform_strategy import B1TransformStrategy
+from transform.strategies.gus_c1.gus_c1_transform_strategy import C1TransformStrategy
+from transform.strategies.report_config import DEFAULT_RAIRPORT
+
+
+# Report type -> (strategy class, constructor arguments). An argument is either one of the
+# runner inputs ("inflot", "total", "rairport") or the name of another report whose result it needs.
+REPORT_STRATEGIES = {
+    "A1": (A1TransformStrategy, ("inflot", "total", "rairport")),
+    "B1": (B1TransformStrategy, ("A1",)),
+    "C1": (C1TransformStrategy, ("inflot", "total", "rairport")),
+}
+
+
+class ReportBundle:
+    """
+    Lazy collection of transformed reports.
+
+    A report is computed the first time it is requested, together with the reports it depends
+    on; every report is computed at most once.
+    """
+
+    def __init__(self, runner: "ReportRunner") -> None:
+        """
+        :param runner: Runner that computes and memoizes the reports.
+        """
+        self._runner = runner
+
+    def __getitem__(self, report_type: str) -> pd.DataFrame:
+        """
+        :param report_type: Report identifier, e.g. 'A1', 'B1', 'C1'.
+        :return: The transformed report DataFrame.
+        """
+        return self._runner.result(report_type)
+
+    def __contains__(self, report_type: str) -> bool:
+        return report_type in self._runner.strategies
+
+    def keys(self) -> list:
+        """
+        :return: Identifiers of all reports in the bundle.
+        """
+        return list(self._runner.strategies)
+
+    def get_year_month(self) -> tuple[str, int]:
+        """
+        Returns the reporting period without computing any report.
+
+        :return: Two-digit year and month, as returned by `A1TransformStrategy.get_year_month`.
+        """
+        date = TransformUtils.get_middle_record_data(self._runner.inputs["inflot"])
+        return date.strftime("%y"), date.month
+
+    def partial(self, report_type: str) -> pd.DataFrame:
+        """
+        :param report_type: Identifier of a report whose strategy has `get_partial`, e.g. 'A1' or 'C1'.
+        :return: Mergeable partial state of the report, computed on first request.
+        """
+        self._runner.result(report_type)
+        return self._runner.instances[report_type].get_partial()
+
+    def compute(self, report_types: list) -> dict:
+        """
+        Computes the given reports and the reports they depend on, running independent reports concurrently.
+
+        :param report_types: Report identifiers, e.g. ['B1', 'C1'].
+        :return: Dictionary mapping each requested report identifier to its DataFrame.
+        """
+        futures = {report_type: self._runner.submit(report_type) for report_type in report_types}
+        return {report_type: future.result() for report_type, future in futures.items()}
+
+    def compute_all(self) -> dict:
+        """
+        Computes every report, running independent reports concurrently.
+
+        :return: Dictionary mapping report identifier to its DataFrame.
+        """
+        return self.compute(self.keys())
+
+
+class ReportRunner:
+    """
+    Runs transform strategies according to their declared dependencies.
+
+    Reports without a dependency between them (A1 and C1) are executed concurrently on a thread
+    pool, except while the profiler traces memory, whose peaks are only meaningful for one step
+    at a time (see `Profiler`); each strategy is run exactly once and its result is reused by dependent reports. The
+    strategy objects are kept in `instances`, so state other than the report (e.g. the monthly
+    partial aggregates) can be read after they have run.
+    """
+
+    def __init__(self, df_inflot: pd.DataFrame, df_total: pd.DataFrame,
+                 strategies: Optional[dict] = None, max_workers: int = 2,
+                 rairport: str = DEFAULT_RAIRPORT) -> None:
+        """
+        :param df_inflot: Extracted Inflot report.
+        :param df_total: Extracted CARGO sheet of the TOTAL table.
+        :param strategies: Report declarations in the format of `REPORT_STRATEGIES`.
+        :param max_workers: Maximum number of reports computed at the same time.
+        :param rairport: ICAO code of the reporting airport the Inflot report belongs to.
+        """
+        self.inputs = {"inflot": df_inflot, "total": df_total, "rairport": rairport}
+        self.strategies = strategies if strategies is not None else REPORT_STRATEGIES
+        self.max_workers = max_workers
+        self.instances = {}
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def run(self) -> ReportBundle:
+        """
+        :return: Lazy bundle of reports; nothing is computed until a report is requested.
+        """
+        return ReportBundle(self)
+
+    def dependencies(self, report_type: str) -> list:
+        """
+        :param report_type: Report identifier.
+        :return: Reports that must be computed before the given one.
+        """
+        _, arguments = self.strategies[report_type]
+        return [argument for argument in arguments if argument in self.strategies]
+
+    def submit(self, report_type: str) -> Future:
+        """
+        Schedules a report and its dependencies, unless they have already been scheduled.
+
+        Dependencies are always submitted before the report itself, so a worker waiting for them
+        never blocks the pool.
+
+        :param report_type: Report identifier.
+        :return: Future holding the transformed DataFrame.
+        """
+        if report_type not in self.strategies:
+            raise KeyError(f"Unknown report type: {report_type}")
+
+        with self._lock:
+            if report_type in self._futures:
+                return self._futures[report_type]
+
+        dependencies = {name: self.submit(name) for name in self.dependencies(report_type)}
+
+        with self._lock:
+            if report_type not in self._futures:
+                if self._executor is None:
+                    max_workers = 1 if PROFILER.traces_memory else self.max_workers
+                    self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                                        thread_name_prefix="report")
+                self._futures[report_type] = self._executor.submit(self._transform, report_type, dependencies)
+            return self._futures[report_type]
+
+    def result(self, report_type: str) -> pd.DataFrame:
+        """
+        :param report_type: Report identifier.
+        :return: The transformed report, computed on first request.
+        """
+        return self.submit(report_type).result()
+
+    def close(self) -> None:
+        """
+        Shuts down the worker pool once the scheduled reports have finished.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "ReportRunner":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _transform(self, report_type: str, dependencies: dict) -> pd.DataFrame:
+        """
+        Builds the strategy for a report and runs it through `Transform`.
+
+        :param report_type: Report identifier.
+        :param dependencies: Futures of the reports this one depends on.
+        :return: The transformed DataFrame.
+        """
+        strategy_class, arguments = self.strategies[report_type]
+        values = [
+            dependencies[argument].result() if argument in dependencies else self.inputs[argument]
+            for argument in arguments
+        ]
+        strategy = strategy_class(*values)
+        self.instances[report_type] = strategy
+        return Transform(strategy).run()
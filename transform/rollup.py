@@ -0,0 +1,132 @@
+from typing import Optional
+import pandas as pd
+from transform.report_runner import ReportBundle
+from transform.strategies.cargo_utils.cargo_cache import CARGO_RESULTS_CACHE
+from transform.strategies.cargo_utils.freight_allocation import FreightAllocation
+from transform.strategies.gus_a1.gus_a1_config import PARTIAL_KEYS as A1_PARTIAL_KEYS, \
+    PARTIAL_SUMS as A1_PARTIAL_SUMS, PARTIAL_ORDER as A1_PARTIAL_ORDER, CARGO_KEYS, \
+    REPORTS_COLUMNS as A1_REPORTS_COLUMNS
+from transform.strategies.gus_b1.gus_b1_transform_strategy import B1TransformStrategy
+from transform.strategies.gus_c1.gus_c1_config import PARTIAL_KEYS as C1_PARTIAL_KEYS, \
+    PARTIAL_SUMS as C1_PARTIAL_SUMS, BUCKETS, REPORTS_COLUMNS as C1_REPORTS_COLUMNS
+from transform.strategies.report_config import COUNTRY, DEFAULT_RAIRPORT
+
+FREIGHT_COLUMN = "FREIGHT ON BOARD"
+
+
+class ReportPartial:
+    """
+    Mergeable aggregation state of the A1/B1/C1 reports of one or more months.
+
+    It holds the A1 and C1 group sums before the freight is allocated, and the freight of the
+    CARGO sheet per airline, airport and direction (the allocation inputs). Partials of several
+    months are merged by summing per group key; the reports of the merged period are then built
+    by allocating its total freight with the same `FreightAllocation` rules as a monthly report.
+    A partial of one month therefore gives back the monthly reports, and a quarter or a year is
+    built from the stored monthly partials without reading any Inflot export or TOTAL workbook.
+
+    Freight of an airline, airport and direction is allocated over the whole period, so it can
+    land on a row whose month had no cargo of that key; the sums per key match the CARGO sheet.
+    """
+
+    def __init__(self, periods: list, df_a1: pd.DataFrame, df_c1: pd.DataFrame, df_freight: pd.DataFrame) -> None:
+        """
+        :param periods: Sorted (year, month) tuples covered by the partial.
+        :param df_a1: A1 group sums (`PARTIAL_KEYS` and `PARTIAL_SUMS` of the A1 config).
+        :param df_c1: C1 group sums (`PARTIAL_KEYS` and `PARTIAL_SUMS` of the C1 config).
+        :param df_freight: Freight per `CARGO_KEYS`, in the FREIGHT ON BOARD column.
+        """
+        self.periods = periods
+        self.df_a1 = df_a1
+        self.df_c1 = df_c1
+        self.df_freight = df_freight
+
+    @staticmethod
+    def from_bundle(bundle: ReportBundle, df_total: pd.DataFrame, year: int, month: int) -> "ReportPartial":
+        """
+        Takes the partial state of one month from its computed reports.
+
+        :param bundle: Reports of the month; A1 and C1 are computed if they have not been yet.
+        :param df_total: CARGO sheet of the TOTAL table the reports were built with.
+        :param year: Full year of the month.
+        :param month: Month (1-12).
+        :return: Partial of the month.
+        """
+        bundle.compute(["A1", "C1"])
+        df_freight = CARGO_RESULTS_CACHE.get(df_total, year, month)[CARGO_KEYS + [FREIGHT_COLUMN]]
+        return ReportPartial([(year, month)], bundle.partial("A1"), bundle.partial("C1"), df_freight)
+
+    @staticmethod
+    def _sum(frames: list, keys: list, sums: list) -> pd.DataFrame:
+        """
+        :return: Rows of all frames summed per key.
+        """
+        return pd.concat(frames, ignore_index=True).groupby(keys, as_index=False, sort=False)[sums].sum()
+
+    @staticmethod
+    def merge(partials: list) -> "ReportPartial":
+        """
+        Merges the partials of distinct periods.
+
+        :param partials: Partials to merge.
+        :return: Partial covering all their periods.
+        :raises ValueError: If no partial is given or a month is covered twice.
+        """
+        if not partials:
+            raise ValueError("No partials to merge")
+        periods = sorted(period for partial in partials for period in partial.periods)
+        if len(set(periods)) != len(periods):
+            raise ValueError(f"Partials cover some months more than once: {periods}")
+
+        return ReportPartial(
+            periods,
+            ReportPartial._sum([partial.df_a1 for partial in partials], A1_PARTIAL_KEYS, A1_PARTIAL_SUMS),
+            ReportPartial._sum([partial.df_c1 for partial in partials], C1_PARTIAL_KEYS, C1_PARTIAL_SUMS),
+            ReportPartial._sum([partial.df_freight for partial in partials], CARGO_KEYS, [FREIGHT_COLUMN]),
+        )
+
+    def a1_report(self, year: str, period, rairport: str = DEFAULT_RAIRPORT) -> pd.DataFrame:
+        """
+        :param year: Value of the YEAR column (two-digit year).
+        :param period: Value of the PERIOD column, e.g. 3 or "Q1".
+        :param rairport: Value of the RAIRPORT column.
+        :return: A1 report of the partial's period.
+        """
+        df_a1 = self.df_a1.sort_values(A1_PARTIAL_KEYS, ascending=A1_PARTIAL_ORDER, kind="stable", ignore_index=True)
+        df_a1 = df_a1.assign(TABLE="A1", COUNTRY=COUNTRY, RAIRPORT=rairport, YEAR=year, PERIOD=period)
+        df_a1 = FreightAllocation.to_busiest_row(df_a1, self.df_freight, CARGO_KEYS)
+        return df_a1[A1_REPORTS_COLUMNS]
+
+    def c1_report(self, year: str, period, rairport: str = DEFAULT_RAIRPORT) -> pd.DataFrame:
+        """
+        :param year: Value of the YEAR column (two-digit year).
+        :param period: Value of the PERIOD column, e.g. 3 or "Q1".
+        :param rairport: Value of the RAIRPORT column.
+        :return: C1 report of the partial's period.
+        """
+        df_c1 = self.df_c1.assign(BUCKET=pd.Categorical(self.df_c1["BUCKET"], categories=BUCKETS))
+        df_c1 = df_c1.sort_values(C1_PARTIAL_KEYS, kind="stable", ignore_index=True)
+        df_freight = self.df_freight.rename(columns={FREIGHT_COLUMN: "FREIGHT"})
+        df_c1 = FreightAllocation.to_first_row(df_c1.drop(columns=["BUCKET"]), df_freight, "AIRLINEC", "FREIGHT")
+        df_c1 = df_c1.assign(TABLE="C1", COUNTRY=COUNTRY, RAIRPORT=rairport, YEAR=year, PERIOD=period)
+        return df_c1[C1_REPORTS_COLUMNS]
+
+    def reports(self, period, report_types: Optional[list] = None, rairport: str = DEFAULT_RAIRPORT) -> dict:
+        """
+        Builds the reports of the partial's period.
+
+        :param period: Value of the PERIOD column, e.g. "Q1"; YEAR is the year of the last month.
+        :param report_types: Reports to build, all of A1, B1 and C1 by default.
+        :param rairport: ICAO code of the reporting airport the partials belong to.
+        :return: Dictionary mapping report identifier to its DataFrame.
+        """
+        report_types = report_types or ["A1", "B1", "C1"]
+        year = str(self.periods[-1][0])[-2:]
+        reports = {}
+        if "A1" in report_types or "B1" in report_types:
+            reports["A1"] = self.a1_report(year, period, rairport)
+        if "B1" in report_types:
+            reports["B1"] = B1TransformStrategy(reports["A1"]).run()
+        if "C1" in report_types:
+            reports["C1"] = self.c1_report(year, period, rairport)
+        return {report_type: reports[report_type] for report_type in report_types}
@@ -0,0 +1,134 @@
+import threading
+import weakref
+import pandas as pd
+from transform.strategies.cargo_utils.cargo_facts import CargoFacts
+from transform.strategies.cargo_utils.cargo_utils import CargoData
+
+
+class CargoResultsCache:
+    """
+    Shared cache of aggregated cargo data.
+
+    Results are kept per TOTAL table object and reporting period, so the A1 and C1 strategies
+    (and repeated runs of them) never parse the CARGO sheet twice for a period. By default the
+    whole sheet is unpivoted once into a `CargoFacts` table and every period is looked up in it;
+    with `use_facts=False` each period runs its own `CargoData.run`.
+    Entries of a TOTAL table are dropped as soon as that table is garbage collected.
+    """
+
+    def __init__(self, use_facts: bool = True) -> None:
+        """
+        Initializes an empty cache with zeroed hit/miss counters.
+
+        :param use_facts: Answer periods from a fact table built once per TOTAL table.
+        """
+        self.use_facts = use_facts
+        self._results = {}
+        self._facts = {}
+        self._tracked_tables = set()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, cargo_table: pd.DataFrame, year: int, month: int) -> pd.DataFrame:
+        """
+        Returns aggregated cargo data for the given period, computing it only on the first request.
+
+        :param cargo_table: Raw CARGO sheet as returned by `TotalTableExtractStrategy`.
+        :param year: Full year, e.g. 2025.
+        :param month: Month as integer (1–12).
+        :return: Read-only view of the AIRLINEC/PAIRPORT/AD/FREIGHT ON BOARD frame.
+        :raises LookupError: If the CARGO sheet has no row for the period.
+        """
+        table_id = id(cargo_table)
+        key = (table_id, year, month)
+
+        with self._lock:
+            if key in self._results:
+                self.hits += 1
+            else:
+                self.misses += 1
+                if self.use_facts:
+                    result = self.facts(cargo_table).for_period(year, month)
+                else:
+                    result = CargoData(cargo_table).run(year, month)
+                self._results[key] = self._freeze(result)
+                self._track(cargo_table)
+
+            return self._results[key].copy(deep=False)
+
+    def facts(self, cargo_table: pd.DataFrame) -> CargoFacts:
+        """
+        Returns the fact table of a TOTAL table, building it on the first request.
+
+        Trend and backfill jobs can use it directly to read many periods at once.
+
+        :param cargo_table: Raw CARGO sheet as returned by `TotalTableExtractStrategy`.
+        :return: CargoFacts covering every period of the sheet.
+        """
+        table_id = id(cargo_table)
+        with self._lock:
+            if table_id not in self._facts:
+                self._facts[table_id] = CargoFacts(cargo_table)
+                self._track(cargo_table)
+            return self._facts[table_id]
+
+    def stats(self) -> dict:
+        """
+        :return: Dictionary with hit and miss counters and the number of cached periods.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._results),
+                    "fact_tables": len(self._facts)}
+
+    def clear(self) -> None:
+        """
+        Removes all cached results and resets the counters.
+        """
+        with self._lock:
+            self._results.clear()
+            self._facts.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _track(self, cargo_table: pd.DataFrame) -> None:
+        """
+        Registers a TOTAL table, so its entries are dropped when it is garbage collected.
+
+        :param cargo_table: Raw CARGO sheet.
+        """
+        table_id = id(cargo_table)
+        if table_id not in self._tracked_tables:
+            self._tracked_tables.add(table_id)
+            weakref.finalize(cargo_table, self._forget, table_id)
+
+    def _forget(self, table_id: int) -> None:
+        """
+        Drops every entry computed from the TOTAL table with the given id.
+
+        :param table_id: `id()` of a TOTAL table that has been garbage collected.
+        """
+        with self._lock:
+            self._tracked_tables.discard(table_id)
+            self._facts.pop(table_id, None)
+            for key in [key for key in self._results if key[0] == table_id]:
+                del self._results[key]
+
+    @staticmethod
+    def _freeze(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Rebuilds a DataFrame on top of non-writeable arrays, so in-place edits of a view raise
+        instead of changing the cached result.
+
+        :param df: Aggregated cargo DataFrame.
+        :return: Equivalent DataFrame backed by read-only arrays.
+        """
+        columns = {}
+        for column in df.columns:
+            values = df[column].to_numpy(copy=True)
+            values.flags.writeable = False
+            columns[column] = values
+        return pd.DataFrame(columns, copy=False)
+
+
+CARGO_RESULTS_CACHE = CargoResultsCache()
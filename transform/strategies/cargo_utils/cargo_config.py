@@ -1,6 +1,8 @@
 
 CARGO_DROP = ["TRUCK WELCOME", "RAZEM KRAJOWY", "INNE Welcome", "INNE"]
 
+CARGO_AD_MAPPING = {'IMPORT': 1, "Import": 1, 'EXPORT': 2, 'Export': 2}
+
 CARGO_AIRLINEC_MAPPING = {
                 'DHL': 'BCS',
                 'Fedex': 'FPO',
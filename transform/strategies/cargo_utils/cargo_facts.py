@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+from transform.strategies.cargo_utils.cargo_config import (
+    CARGO_AD_MAPPING,
+    CARGO_AIRLINEC_MAPPING,
+    CARGO_PAIRPORT_MAPPING,
+    MONTHS_MAPPING
+)
+from transform.strategies.cargo_utils.cargo_utils import CargoData
+from instrumentation.profiler import profiled_step
+
+ROMAN_MONTHS = {roman: month for month, roman in MONTHS_MAPPING.items()}
+
+
+class CargoFacts:
+    """
+    Long-format cargo fact table covering every period of the CARGO sheet.
+
+    The sheet is prepared and unpivoted once into rows of
+    (year, month, AIRLINEC, PAIRPORT, AD, FREIGHT ON BOARD), aggregated like `CargoData.run`
+    and indexed by (year, month). A period is then answered by an index lookup instead of a
+    new parse and transpose of the whole sheet.
+    """
+
+    def __init__(self, cargo_table: pd.DataFrame) -> None:
+        """
+        :param cargo_table: Raw CARGO sheet as returned by `TotalTableExtractStrategy`.
+        """
+        self.facts = pd.DataFrame()
+        self.sheet_periods = set()
+        self._build(cargo_table)
+
+    @profiled_step("facts")
+    def _build(self, cargo_table: pd.DataFrame) -> None:
+        """
+        Unpivots every month row of the sheet into cargo records.
+
+        A month row is one whose ROK is an integer and whose MIESIĄC is a Roman numeral; when a
+        period appears more than once, its first row is used. Empty cells are skipped and
+        non-numeric cells count as 0, as in `CargoData.run`.
+
+        :param cargo_table: Raw CARGO sheet.
+        """
+        cargo = CargoData(cargo_table)
+        prepared = cargo.prepare()
+        rok_idx, miesiac_idx = cargo.period_column_positions()
+
+        years = prepared.iloc[:, rok_idx].astype(str)
+        months = prepared.iloc[:, miesiac_idx].astype(str).str.upper().map(ROMAN_MONTHS)
+        periods = pd.DataFrame({"year": years, "month": months})[years.str.fullmatch(r"\d+") & months.notna()]
+        periods = periods[~periods.duplicated()].astype("int64")
+        self.sheet_periods = set(zip(periods["year"].tolist(), periods["month"].tolist()))
+
+        value_positions = np.setdiff1d(np.arange(prepared.shape[1]), [rok_idx, miesiac_idx])
+        values = prepared.to_numpy()[np.ix_(periods.index.to_numpy(), value_positions)].ravel()
+
+        columns = prepared.columns[value_positions]
+        airlines = pd.Series(columns.get_level_values(0)).map(CARGO_AIRLINEC_MAPPING).to_numpy()
+        airports = pd.Series(columns.get_level_values(1)).map(CARGO_PAIRPORT_MAPPING).to_numpy()
+        directions = pd.Series(columns.get_level_values(2)).map(CARGO_AD_MAPPING).to_numpy()
+
+        cells = pd.Series(values, dtype=object)
+        freight = pd.to_numeric(cells, errors="coerce")
+        text = cells.notna() & freight.isna()
+        blank = pd.Series(False, index=cells.index)
+        blank[text] = cells[text].astype(str).str.strip() == ""
+        mapped = np.tile(pd.notna(airlines) & pd.notna(airports) & pd.notna(directions), len(periods))
+        keep = (cells.notna() & ~blank).to_numpy() & mapped
+
+        columns_count = len(value_positions)
+        records = pd.DataFrame({
+            "year": np.repeat(periods["year"].to_numpy(), columns_count)[keep],
+            "month": np.repeat(periods["month"].to_numpy(), columns_count)[keep],
+            "AIRLINEC": np.tile(airlines, len(periods))[keep],
+            "PAIRPORT": np.tile(airports, len(periods))[keep],
+            "AD": np.tile(directions, len(periods))[keep].astype("int64"),
+            "FREIGHT ON BOARD": freight.to_numpy(dtype="float64")[keep] / 1000,
+        })
+
+        facts = records.groupby(["year", "month", "AIRLINEC", "PAIRPORT", "AD"], as_index=False).agg({
+            "FREIGHT ON BOARD": "sum"
+        })
+        self.facts = facts.set_index(["year", "month"]).sort_index()
+
+    def periods(self) -> list:
+        """
+        :return: Sorted (year, month) pairs with at least one cargo record.
+        """
+        return list(self.facts.index.unique())
+
+    def for_period(self, year: int, month: int) -> pd.DataFrame:
+        """
+        Returns the cargo data of one period, in the format of `CargoData.run`.
+
+        :param year: Full year, e.g. 2025.
+        :param month: Month as integer (1–12).
+        :return: AIRLINEC/PAIRPORT/AD/FREIGHT ON BOARD frame; empty when the month row of the
+            period has no freight.
+        :raises LookupError: If the sheet has no month row for the period, e.g. when the TOTAL
+            table has not been updated yet; `CargoData.run` fails for the same input.
+        """
+        if (year, month) not in self.sheet_periods:
+            raise LookupError(f"The CARGO sheet has no row for {year}-{str(month).zfill(2)}")
+        if (year, month) not in self.facts.index:
+            return self.facts.iloc[:0].reset_index(drop=True)
+        return self.facts.loc[[(year, month)]].reset_index(drop=True)
+
+    def between(self, start: tuple[int, int], end: tuple[int, int]) -> pd.DataFrame:
+        """
+        Returns the facts of every period from `start` to `end`, both included.
+
+        :param start: First (year, month).
+        :param end: Last (year, month).
+        :return: Facts with year and month columns.
+        """
+        return self.facts.loc[start:end].reset_index()
@@ -1,10 +1,14 @@
+import re
+import numpy as np
 import pandas as pd
 from transform.strategies.cargo_utils.cargo_config import (
     CARGO_DROP,
+    CARGO_AD_MAPPING,
     CARGO_AIRLINEC_MAPPING,
     CARGO_PAIRPORT_MAPPING,
     MONTHS_MAPPING
 )
+from instrumentation.profiler import profiled_step
 
 
 class CargoData:
@@ -15,46 +19,86 @@ class CargoData:
         """
         self.cargo_df: pd.DataFrame = cargo_table
 
+    @profiled_step("cargo_df")
     def _preparing_multiindex_columns(self) -> None:
         """
         Converts first few header rows into a MultiIndex and prepares the cargo DataFrame.
         """
-        headers = self.cargo_df.iloc[1:4].copy()
-        data = self.cargo_df.iloc[4:].copy().reset_index(drop=True)
+        # Copied, so filling the header cells never writes into the raw sheet.
+        headers = self.cargo_df.iloc[1:4].to_numpy(dtype=object, copy=True)
+        for level in range(1, len(headers)):
+            headers[level] = np.where(pd.isna(headers[level]), headers[level - 1], headers[level])
 
-        headers = headers.fillna(method="ffill", axis=0)
-        multi_cols = list(zip(*headers.values))
+        data = self.cargo_df.iloc[4:].to_numpy()
+        self.cargo_df = pd.DataFrame(data, columns=pd.MultiIndex.from_arrays(list(headers)))
 
-        self.cargo_df = pd.DataFrame(data.values, columns=pd.MultiIndex.from_tuples(multi_cols))
+    def _upper_level_labels(self, level: int) -> tuple[pd.Series, np.ndarray]:
+        """
+        :param level: Header level.
+        :return: Distinct upper-cased labels of the level followed by "NAN", and the code of each
+            column (-1, i.e. the last label, for empty header cells).
+        """
+        columns = self.cargo_df.columns
+        labels = pd.Series([*columns.levels[level].astype(str), "nan"], dtype=object).str.upper()
+        return labels, columns.codes[level]
+
+    def _header_labels(self, level: int) -> np.ndarray:
+        """
+        :param level: Header level.
+        :return: Upper-cased label of every column at the given level.
+        """
+        labels, codes = self._upper_level_labels(level)
+        return labels.to_numpy()[codes]
+
+    def _header_masks(self, matches) -> np.ndarray:
+        """
+        Evaluates a vectorized test on the upper-cased header labels of every column.
+
+        Each distinct label of a header level is converted and tested once; the results are
+        spread to the columns through the MultiIndex codes, so the cost grows with the number
+        of distinct airlines and airports rather than with the number of columns.
+
+        :param matches: Function taking a Series of upper-cased labels and returning a boolean Series.
+        :return: Boolean array of shape (header levels, columns).
+        """
+        masks = []
+        for level in range(self.cargo_df.columns.nlevels):
+            labels, codes = self._upper_level_labels(level)
+            masks.append(matches(labels).to_numpy(dtype=bool)[codes])
+        return np.vstack(masks)
 
+    @profiled_step("cargo_df")
     def _trim_at_razem_zgr(self) -> None:
         """
         Trims the DataFrame to only include columns before the first occurrence of 'RAZEM ZAGRANICZNY'.
         """
-        trim_idx = None
-        for i, col in enumerate(self.cargo_df.columns):
-            if any("RAZEM ZGR" in str(level).upper() for level in col):
-                trim_idx = i
-                break
+        razem_zgr = self._header_masks(lambda labels: labels.str.contains("RAZEM ZGR", regex=False)).any(axis=0)
+        positions = np.flatnonzero(razem_zgr)
 
-        if trim_idx is not None:
-            self.cargo_df = self.cargo_df.iloc[:, :trim_idx]
+        if positions.size:
+            self.cargo_df = self.cargo_df.iloc[:, :positions[0]]
 
+    @profiled_step("cargo_df")
     def _drop_columns(self, drop_column: list[str]) -> pd.DataFrame:
         """
         Removes unwanted columns based on keywords.
         :param drop_column: List of keywords to drop from MultiIndex columns.
         :return: Filtered DataFrame.
         """
-        drop_column_upper = [k.upper() for k in drop_column]
+        pattern = "|".join(re.escape(keyword.upper()) for keyword in drop_column)
+        drop = self._header_masks(lambda labels: labels.str.contains(pattern, regex=True)).any(axis=0)
 
-        def should_drop(col):
-            return any(any(k in str(level).upper() for k in drop_column_upper) for level in col)
-
-        filtered_cols = [col for col in self.cargo_df.columns if not should_drop(col)]
-        self.cargo_df = self.cargo_df.loc[:, filtered_cols]
+        self.cargo_df = self.cargo_df.loc[:, ~drop]
         return self.cargo_df
 
+    def period_column_positions(self) -> tuple[int, int]:
+        """
+        :return: Positions of the ROK and MIESIĄC columns of the prepared DataFrame.
+        """
+        bottom_labels = self._header_labels(2)
+        return np.flatnonzero(bottom_labels == "ROK")[0], np.flatnonzero(bottom_labels == "MIESIĄC")[0]
+
+    @profiled_step("cargo_df")
     def _filter_by_period_(self, year: int, month: int) -> None:
         """
         Filters the DataFrame by a given year and month.
@@ -62,10 +106,7 @@ class CargoData:
         :param month: Month to filter by.
         """
         roman_month = MONTHS_MAPPING.get(month)
-        colnames = self.cargo_df.columns
-
-        rok_idx = next((i for i, col in enumerate(colnames) if str(col[2]).upper() == "ROK"), None)
-        miesiac_idx = next((i for i, col in enumerate(colnames) if str(col[2]).upper() == "MIESIĄC"), None)
+        rok_idx, miesiac_idx = self.period_column_positions()
 
         rok_values = self.cargo_df.iloc[:, rok_idx].astype(str)
         miesiac_values = self.cargo_df.iloc[:, miesiac_idx].astype(str).str.upper()
@@ -73,42 +114,92 @@ class CargoData:
         mask = (rok_values == str(year)) & (miesiac_values == roman_month)
         self.cargo_df = self.cargo_df[mask].reset_index(drop=True)
 
+    @profiled_step("cargo_df")
     def _drop_empty_columns_for_selected_row(self) -> pd.DataFrame:
         """
         Drops columns with empty values in the first row.
         """
         row = self.cargo_df.iloc[0]
-        non_empty_cols = row[row.notna() & (row.astype(str).str.strip() != '')].index
-        self.cargo_df = self.cargo_df.loc[:, non_empty_cols]
+        non_empty = row.notna() & (row.astype(str).str.strip() != '')
+        self.cargo_df = self.cargo_df.loc[:, non_empty.to_numpy()]
         return self.cargo_df
 
+    @profiled_step("cargo_df")
     def _transpose_to_records(self) -> None:
         """
         Transposes the DataFrame so each row becomes a cargo record.
         """
-        self.cargo_df = self.cargo_df.T.reset_index()
-        self.cargo_df.columns = ['AIRLINEC', 'PAIRPORT', 'AD', 'FREIGHT ON BOARD']
+        self.cargo_df = self.cargo_df.T.reset_index().set_axis(['AIRLINEC', 'PAIRPORT', 'AD', 'FREIGHT ON BOARD'],
+                                                               axis=1)
 
+    @profiled_step("cargo_df")
     def _finalize_transposed_data(self) -> None:
         """
         Drops unused header rows and normalizes freight column.
         """
         self.cargo_df = self.cargo_df.drop(index=[0, 1]).reset_index(drop=True)
-        self.cargo_df['FREIGHT ON BOARD'] = pd.to_numeric(self.cargo_df['FREIGHT ON BOARD'], errors='coerce') / 1000
+        self.cargo_df = self.cargo_df.assign(**{
+            'FREIGHT ON BOARD': pd.to_numeric(self.cargo_df['FREIGHT ON BOARD'], errors='coerce') / 1000
+        })
 
+    @profiled_step("cargo_df")
     def _normalize_and_aggregate(self) -> None:
         """
         Normalizes values and aggregates data by AIRLINEC, PAIRPORT and AD.
         """
-        ad_mapping = {'IMPORT': 1, "Import": 1, 'EXPORT': 2, 'Export': 2}
-        self.cargo_df['AD'] = self.cargo_df['AD'].map(ad_mapping)
-        self.cargo_df["PAIRPORT"] = self.cargo_df["PAIRPORT"].map(CARGO_PAIRPORT_MAPPING)
-        self.cargo_df["AIRLINEC"] = self.cargo_df["AIRLINEC"].map(CARGO_AIRLINEC_MAPPING)
+        self.cargo_df = self.cargo_df.assign(
+            AD=self.cargo_df['AD'].map(CARGO_AD_MAPPING),
+            PAIRPORT=self.cargo_df["PAIRPORT"].map(CARGO_PAIRPORT_MAPPING),
+            AIRLINEC=self.cargo_df["AIRLINEC"].map(CARGO_AIRLINEC_MAPPING),
+        )
 
         self.cargo_df = self.cargo_df.groupby(['AIRLINEC', 'PAIRPORT', 'AD'], as_index=False).agg({
             'FREIGHT ON BOARD': 'sum'
         })
 
+    def prepare(self) -> pd.DataFrame:
+        """
+        Runs the steps that do not depend on the period: builds the MultiIndex header, drops the
+        CARGO_DROP columns and trims the sheet at 'RAZEM ZGR'.
+
+        :return: Prepared DataFrame with one row per month of the sheet.
+        """
+        self._preparing_multiindex_columns()
+        self._drop_columns(CARGO_DROP)
+        self._trim_at_razem_zgr()
+        return self.cargo_df
+
+    def header_info(self) -> dict:
+        """
+        Prepares the sheet (see `prepare`) and describes the bottom level of its header, the
+        IMPORT/EXPORT level. Only the four header rows are needed, so input checks can call it on
+        the first rows of the sheet.
+
+        :return: Dictionary with "labels", the upper-cased bottom label of every kept column, and
+            "directions", the distinct labels of the freight columns (all but ROK and MIESIĄC).
+        """
+        self.prepare()
+        labels = self._header_labels(2).tolist()
+        return {
+            "labels": labels,
+            "directions": sorted(set(labels) - {"ROK", "MIESIĄC", "NAN"}),
+        }
+
+    def period_region(self, year: int, month: int) -> pd.DataFrame:
+        """
+        Selects the cells `run` reads for a period: the sheet row(s) of the period and the columns
+        that are not empty in them. Expects a prepared sheet (see `prepare`).
+
+        :param year: Full year, e.g. 2025.
+        :param month: Month as integer (1–12).
+        :return: The region; empty when the sheet has no row for the period.
+        """
+        self._filter_by_period_(year, month)
+        if not self.cargo_df.empty:
+            self._drop_empty_columns_for_selected_row()
+        return self.cargo_df
+
+    @profiled_step("cargo_df")
     def run(self, year: int, month: int) -> pd.DataFrame:
         """
         Orchestrates the full transformation process for the cargo data.
@@ -116,15 +207,10 @@ class CargoData:
         :param month: Month to filter the data by.
         :return: Transformed and aggregated cargo DataFrame.
         """
-        self._preparing_multiindex_columns()
-        self._drop_columns(CARGO_DROP)
-        self._trim_at_razem_zgr()
+        self.prepare()
         self._filter_by_period_(year, month)
         self._drop_empty_columns_for_selected_row()
         self._transpose_to_records()
         self._finalize_transposed_data()
         self._normalize_and_aggregate()
-
-        self.cargo_df.to_excel(r"D:\Raporty\cargo.xlsx", index=False)
-
         return self.cargo_df
@@ -0,0 +1,49 @@
+import pandas as pd
+
+
+class FreightAllocation:
+    """
+    Distributes the freight of the CARGO sheet over the rows of a report.
+
+    The CARGO sheet gives freight per airline, airport and direction only, while report rows are
+    finer (A1 splits by aircraft type, C1 by flight-type bucket). The freight of a cargo key is
+    put on a single report row of that key and the other rows get 0, so summing the report over
+    the key gives the freight of the sheet. Monthly reports and rollups of several months use
+    the same rules.
+    """
+
+    @staticmethod
+    def to_busiest_row(dataframe: pd.DataFrame, df_cargo: pd.DataFrame, keys: list,
+                       weight: str = "PAX ON BOARD", column: str = "FREIGHT ON BOARD") -> pd.DataFrame:
+        """
+        Puts the freight of every cargo key on the report row of that key with the largest weight.
+
+        :param dataframe: Report rows containing the key and weight columns.
+        :param df_cargo: Freight per key, with the key columns and `column`.
+        :param keys: Columns joining the report and the cargo data, e.g. ["AIRLINEC", "PAIRPORT", "AD"].
+        :param weight: Column choosing the row; on ties, the first row of the key wins.
+        :param column: Freight column of `df_cargo`, added to the report.
+        :return: Report rows with `column` set on the busiest row of every key and 0 elsewhere.
+        """
+        df_merged = dataframe.merge(df_cargo, how="left", on=keys)
+        idx_busiest = df_merged.groupby(keys)[weight].idxmax()
+
+        freight = pd.Series(0.0, index=df_merged.index)
+        freight.loc[idx_busiest] = df_merged.loc[idx_busiest, column].fillna(0)
+        return df_merged.assign(**{column: freight})
+
+    @staticmethod
+    def to_first_row(dataframe: pd.DataFrame, df_cargo: pd.DataFrame, key: str, column: str) -> pd.DataFrame:
+        """
+        Sums the freight per key and puts it on the first report row of that key.
+
+        :param dataframe: Report rows containing the key column.
+        :param df_cargo: Freight records, with the key column and `column`; they are summed per key.
+        :param key: Column joining the report and the cargo data, e.g. "AIRLINEC".
+        :param column: Freight column of `df_cargo`, added to the report.
+        :return: Report rows with `column` set on the first row of every key and 0 elsewhere.
+        """
+        df_cargo_grouped = df_cargo.groupby(key, as_index=False).agg({column: "sum"})
+        df_merged = pd.merge(dataframe, df_cargo_grouped, how="left", on=key)
+        mask = df_merged.duplicated(subset=[key], keep="first")
+        return df_merged.assign(**{column: df_merged[column].mask(mask, 0.0).fillna(0.0)})
@@ -58,3 +58,15 @@ FLIGHT_TYPES = {
         'Cargo/Regularny': 1
     }
 }
+
+# Group keys and summed columns of the aggregated A1 rows before the freight is allocated. They
+# form the mergeable monthly partial state: a rollup of several months sums the partials per key.
+PARTIAL_KEYS = ["PAIRPORT", "AD", "SCHEDNS", "PASSFREIGH", "AIRLINEC", "AIRCRAFTTY"]
+PARTIAL_SUMS = ["PAX ON BOARD", "SEATAV", "FLIGHT"]
+
+# Sort order of PARTIAL_KEYS reproducing the row order of a monthly report, which is grouped on
+# the raw direction: 'O' sorts before 'P', so AD 2 comes before AD 1.
+PARTIAL_ORDER = [True, False, True, True, True, True]
+
+# Columns joining A1 rows with the freight of the CARGO sheet.
+CARGO_KEYS = ["AIRLINEC", "PAIRPORT", "AD"]
@@ -1,25 +1,39 @@
 import pandas as pd
 
+from transform.plan import Aggregate, Derive, Filter, LogicalPlan, Project, Rename
 from transform.strategies.abstract_transform_strategy import TransformStrategy
-from transform.strategies.cargo_utils.cargo_utils import CargoData
-from transform.strategies.gus_a1.gus_a1_config import REPORT_MAPPINGS, REPORTS_ROWS, FLIGHT_TYPES, REPORTS_COLUMNS
+from transform.strategies.cargo_utils.cargo_cache import CARGO_RESULTS_CACHE
+from transform.strategies.cargo_utils.freight_allocation import FreightAllocation
+from transform.strategies.gus_a1.gus_a1_config import REPORT_MAPPINGS, REPORTS_ROWS, FLIGHT_TYPES, REPORTS_COLUMNS, \
+    PARTIAL_KEYS, PARTIAL_SUMS, CARGO_KEYS
+from transform.strategies.report_config import COUNTRY, DEFAULT_RAIRPORT
 from transform.transform_utils import TransformUtils
+from instrumentation.profiler import profiled_step
 
 
 class A1TransformStrategy(TransformStrategy):
     """
     Strategy class for transforming data into the A1 report format.
+
+    The steps up to the aggregation only record nodes of a `LogicalPlan` (`build_plan`) and are not
+    profiled; the plan is optimized and executed at once by `_execute_plan`, so the row filter and
+    the column projection run before the derived columns are computed. Profiles show every executed
+    node under `_execute_plan`, and `explain` shows the executed plan.
     """
 
-    def __init__(self, df_inflot: pd.DataFrame, df_total: pd.DataFrame) -> None:
+    def __init__(self, df_inflot: pd.DataFrame, df_total: pd.DataFrame, rairport: str = DEFAULT_RAIRPORT) -> None:
         """
         Initializes the transformation strategy with the input DataFrame.
 
         :param df: Original Pandas DataFrame containing raw data.
+        :param rairport: ICAO code of the reporting airport, written in the RAIRPORT column.
         """
         self.df_total = df_total
         self.df_inflot = df_inflot
+        self.rairport = rairport
+        self.plan = LogicalPlan()
         self.df_a1 = pd.DataFrame()
+        self.df_partial = pd.DataFrame()
         self.year = None
         self.month = None
 
@@ -31,18 +45,24 @@ class A1TransformStrategy(TransformStrategy):
         """
         return self.df_a1
 
+    def get_partial(self) -> pd.DataFrame:
+        """
+        Returns the aggregated rows before the freight is allocated, available after `run`.
+
+        :return: Pandas DataFrame with the `PARTIAL_KEYS` and `PARTIAL_SUMS` columns.
+        """
+        return self.df_partial
+
     def _prepare_columns(self) -> None:
         """
         Cleans and renames columns in the DataFrame to match the A1 report structure.
 
-        - Copies data from the original DataFrame (`self.df`) to `self.df_a1`
+        - The plan starts from `self.df_inflot`, which is never modified; with copy-on-write
+          the data is shared until a column is written.
         - Renames columns using predefined mappings (`REPORT_MAPPINGS["A1"]`)
-
-        :return: Pandas DataFrame with renamed columns.
         """
         mapping = REPORT_MAPPINGS
-        self.df_a1 = self.df_inflot
-        self.df_a1 = TransformUtils.rename_columns(self.df_a1, mapping)
+        self.plan = self.plan.then(Rename(mapping))
 
     def _modify_fedex(self) -> None:
         """
@@ -52,11 +72,12 @@ class A1TransformStrategy(TransformStrategy):
         the airline code 'XXX' in the raw data should be replaced with 'FPO'.
 
         Returns:
-            None: The method modifies the DataFrame in place.
+            None: The method adds the correction to `self.plan`.
         """
 
         mapping = {"XXX": "FPO"}
-        self.df_a1 = TransformUtils.replacing_data(self.df_a1, "AIRLINEC", mapping)
+        self.plan = self.plan.then(Derive("AIRLINEC", lambda df: TransformUtils.replacing_data(df, "AIRLINEC", mapping)
+                                          ["AIRLINEC"], ["AIRLINEC"]))
 
 
     def _add_pax_onboard_column(self) -> None:
@@ -67,9 +88,18 @@ class A1TransformStrategy(TransformStrategy):
         - 'Infant' represents the number of infants onboard.
         - The sum of these two values gives the total count of passengers onboard, including infants.
 
-        :return: Pandas DataFrame with the added 'PAX ON BOARD' column.
+        Counts read with the Inflot schema get the dtypes of plain input first (see
+        `TransformUtils.plain_counts`), so the report columns do not depend on the input dtypes.
+
+        The columns are added to `self.plan`.
         """
-        self.df_a1["PAX ON BOARD"] = self.df_a1["TTL"].fillna(0) + self.df_a1["Infant"].fillna(0)
+        def pax_on_board(df: pd.DataFrame) -> pd.Series:
+            return TransformUtils.plain_counts(df["TTL"]).fillna(0) + TransformUtils.plain_counts(df["Infant"]).fillna(0)
+
+        self.plan = self.plan.then(Derive(columns={
+            "PAX ON BOARD": (pax_on_board, ["TTL", "Infant"]),
+            "SEATAV": (lambda df: TransformUtils.plain_counts(df["SEATAV"]), ["SEATAV"]),
+        }))
 
     def _create_new_columns(self) -> None:
         """
@@ -83,11 +113,17 @@ class A1TransformStrategy(TransformStrategy):
         1. Maps the 'Typ rejsu' column to the corresponding values for 'PASSFREIGH'.
         2. Maps the 'Typ rejsu' column to the corresponding values for 'SCHEDNS'.
 
-        :return: Pandas DataFrame with added 'PASSFREIGH' and 'SCHEDNS' columns.
+        The columns are added to `self.plan`. The codes are floats whether the derivation runs
+        before the row filter (unmapped flight types give missing values) or after it.
         """
-        self.df_a1["PASSFREIGH"] = self.df_a1["Typ rejsu"].map(FLIGHT_TYPES["PASSFREIGH"])
-        self.df_a1["SCHEDNS"] = self.df_a1["Typ rejsu"].map(FLIGHT_TYPES["SCHEDNS"])
-        self.df_a1["FLIGHT"] = self.df_a1['AD']
+        def flight_type_codes(mapping: dict):
+            return lambda df: TransformUtils.map_values(df["Typ rejsu"], mapping).astype("float64")
+
+        self.plan = self.plan.then(Derive(columns={
+            "PASSFREIGH": (flight_type_codes(FLIGHT_TYPES["PASSFREIGH"]), ["Typ rejsu"]),
+            "SCHEDNS": (flight_type_codes(FLIGHT_TYPES["SCHEDNS"]), ["Typ rejsu"]),
+            "FLIGHT": (lambda df: df["AD"], ["AD"]),
+        }))
 
     def _remove_unnecessary_rows(self) -> None:
         """
@@ -97,11 +133,10 @@ class A1TransformStrategy(TransformStrategy):
         required for the A1 report. It uses a predefined mapping (`REPORTS_ROWS["A1"]`)
         to determine which flight types should be retained.
 
-        Returns:
-        pd.DataFrame: A filtered DataFrame containing only relevant flight types.
+        The filter is added to `self.plan`; the optimizer moves it before the derived columns.
         """
         col_filter = "Typ rejsu"
-        self.df_a1 = TransformUtils.keep_relevant_rows(self.df_a1, col_filter, REPORTS_ROWS)
+        self.plan = self.plan.then(Filter(col_filter, REPORTS_ROWS))
 
     def _remove_unnecessary_columns(self) -> None:
         """
@@ -110,8 +145,8 @@ class A1TransformStrategy(TransformStrategy):
         are retained in the DataFrame. It filters the DataFrame using a predefined list
         of column names.
 
-        Returns:
-        pd.DataFrame: A DataFrame containing only the necessary columns for the report.
+        The projection is added to `self.plan`; the optimizer also prunes the source columns the
+        plan never reads before any other step.
         """
         mapping = [
             "PAIRPORT",
@@ -124,25 +159,59 @@ class A1TransformStrategy(TransformStrategy):
             "SEATAV",
             "FLIGHT"
         ]
-        self.df_a1 = TransformUtils.keep_relevant_columns(self.df_a1, mapping)
+        self.plan = self.plan.then(Project(mapping))
 
     def _aggregate_report(self) -> None:
         """
         Aggregates the report by summing PAX_ON_BOARD and SEATAV,
         and counting occurrences of AD (stored in a new column FLIGHT).
 
-        Returns:
-        pd.DataFrame: The aggregated DataFrame.
+        The aggregation is added to `self.plan`.
         """
-        self.df_a1 = self.df_a1.groupby(
+        self.plan = self.plan.then(Aggregate(
             ["PAIRPORT", "FLIGHT", "AD", "SCHEDNS", "PASSFREIGH", "AIRLINEC", "AIRCRAFTTY"],
-            as_index=False
-        ).agg({
-            "PAX ON BOARD": sum,
-            "SEATAV": sum,
-            "FLIGHT": "count"
-        })
+            {
+                "PAX ON BOARD": sum,
+                "SEATAV": sum,
+                "FLIGHT": "count"
+            },
+            observed=True
+        ))
+
+    def build_plan(self) -> LogicalPlan:
+        """
+        Records the steps from the renaming to the aggregation as a logical plan.
 
+        :return: The recorded plan, also kept in `self.plan`.
+        """
+        self.plan = LogicalPlan()
+        self._prepare_columns()
+        self._modify_fedex()
+        self._add_pax_onboard_column()
+        self._create_new_columns()
+        self._remove_unnecessary_rows()
+        self._remove_unnecessary_columns()
+        self._aggregate_report()
+        return self.plan
+
+    def explain(self, optimized: bool = True) -> str:
+        """
+        :param optimized: Describe the plan as executed; False describes the steps as recorded.
+        :return: Steps of the plan in execution order, see `LogicalPlan.explain`.
+        """
+        if not self.plan.nodes:
+            self.build_plan()
+        return self.plan.explain(optimized)
+
+    @profiled_step("df_a1")
+    def _execute_plan(self) -> None:
+        """
+        Optimizes and executes the recorded plan on `self.df_inflot`, then converts the categorical
+        group keys back to plain columns.
+        """
+        self.df_a1 = TransformUtils.uncategorize(self.plan.execute(self.df_inflot))
+
+    @profiled_step("df_a1")
     def _modify_AD_data(self) -> None:
         """
         Modify the 'AD' column values based on a predefined mapping.
@@ -156,6 +225,7 @@ class A1TransformStrategy(TransformStrategy):
         mapping = {"P": 1, "O": 2}
         self.df_a1 = TransformUtils.replacing_data(self.df_a1, 'AD', mapping)
 
+    @profiled_step("df_a1")
     def _format_remaining_data(self) -> pd.DataFrame:
         """
            Handles missing values in the DataFrame by applying a predefined strategy.
@@ -170,6 +240,7 @@ class A1TransformStrategy(TransformStrategy):
         self.df_a1 = TransformUtils.handle_null_values(self.df_a1)
         return self.df_a1
 
+    @profiled_step("df_a1")
     def _add_static_data(self) -> None:
         """
         Adds static values to specific columns in the DataFrame.
@@ -177,10 +248,9 @@ class A1TransformStrategy(TransformStrategy):
         Returns:
         pd.DataFrame: The updated DataFrame with static values added.
         """
-        self.df_a1["TABLE"] = 'A1'
-        self.df_a1["COUNTRY"] = 'EP'
-        self.df_a1["RAIRPORT"] = 'EPGD'
+        self.df_a1 = self.df_a1.assign(TABLE='A1', COUNTRY=COUNTRY, RAIRPORT=self.rairport)
 
+    @profiled_step("df_a1")
     def add_date_columns(self) -> None:
         """
         Extracts a reference date from the dataset and assigns year and period columns.
@@ -200,8 +270,7 @@ class A1TransformStrategy(TransformStrategy):
         date = TransformUtils.get_middle_record_data(self.df_inflot)
         self.year = date.strftime("%y")
         self.month = date.month
-        self.df_a1["YEAR"] = self.year
-        self.df_a1["PERIOD"] = self.month
+        self.df_a1 = self.df_a1.assign(YEAR=self.year, PERIOD=self.month)
 
     def get_year_month(self) -> tuple[int, int]:
         """
@@ -209,30 +278,26 @@ class A1TransformStrategy(TransformStrategy):
         """
         return self.year, self.month
 
-    def _fill_cargo_from_total(self) -> None:
-        total = CargoData(self.df_total)
+    @profiled_step("df_a1")
+    def _keep_partial(self) -> None:
+        """
+        Keeps the aggregated group keys and sums as the mergeable partial state of the month.
+        """
+        self.df_partial = self.df_a1[PARTIAL_KEYS + PARTIAL_SUMS]
 
+    @profiled_step("df_a1")
+    def _fill_cargo_from_total(self) -> None:
+        """
+        Adds 'FREIGHT ON BOARD' from the CARGO sheet, on the row with the most passengers of
+        every airline, airport and direction (see `FreightAllocation.to_busiest_row`).
+        """
         date = TransformUtils.get_middle_record_data(self.df_inflot)
         year = int(date.strftime("%Y"))
         month = date.month
-        df_cargo = total.run(year, month)
-        print(df_cargo)
-
-        df_merged = self.df_a1.merge(
-            df_cargo,
-            how='left',
-            on=['AIRLINEC', 'PAIRPORT', 'AD']
-
-        )
-
-        df_merged['FREIGHT ON BOARD FINAL'] = 0.0
-        idx_max_pax = df_merged.groupby(['AIRLINEC', 'PAIRPORT', 'AD'])['PAX ON BOARD'].idxmax()
-        df_merged.loc[idx_max_pax, 'FREIGHT ON BOARD FINAL'] = df_merged.loc[idx_max_pax, 'FREIGHT ON BOARD'].fillna(0)
-        df_merged['FREIGHT ON BOARD'] = df_merged['FREIGHT ON BOARD FINAL']
-        df_merged.drop(columns=['FREIGHT ON BOARD FINAL'], inplace=True)
-
-        self.df_a1 = df_merged
+        df_cargo = CARGO_RESULTS_CACHE.get(self.df_total, year, month)
+        self.df_a1 = FreightAllocation.to_busiest_row(self.df_a1, df_cargo, CARGO_KEYS)
 
+    @profiled_step("df_a1")
     def _reorder_columns(self) -> None:
         """
         Ensures the correct column order in the final DataFrame.
@@ -245,6 +310,7 @@ class A1TransformStrategy(TransformStrategy):
         """
         self.df_a1 = self.df_a1[REPORTS_COLUMNS]
 
+    @profiled_step("df_a1")
     def run(self):
         """
         Executes the entire transformation process step by step.
@@ -252,18 +318,14 @@ class A1TransformStrategy(TransformStrategy):
 
         :return: Fully transformed DataFrame ready for reporting.
         """
-        self._prepare_columns()
-        self._modify_fedex()
-        self._add_pax_onboard_column()
-        self._create_new_columns()
-        self._remove_unnecessary_rows()
-        self._remove_unnecessary_columns()
-        self._aggregate_report()
+        self.build_plan()
+        self._execute_plan()
         self._modify_AD_data()
         self._add_static_data()
         self.add_date_columns()
         self.get_year_month()
         self._format_remaining_data()
+        self._keep_partial()
         self._fill_cargo_from_total()
         self._reorder_columns()
         return self.df_a1
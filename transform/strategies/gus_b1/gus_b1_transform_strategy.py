@@ -2,6 +2,7 @@ import pandas as pd
 from transform.strategies.abstract_transform_strategy import TransformStrategy
 from transform.transform_utils import TransformUtils
 from transform.strategies.gus_b1.gus_b1_config import REPORTS_COLUMNS
+from instrumentation.profiler import profiled_step
 
 
 class B1TransformStrategy(TransformStrategy):
@@ -26,6 +27,7 @@ class B1TransformStrategy(TransformStrategy):
         return self.df_b1
 
 
+    @profiled_step("df_b1")
     def _change_columns_names(self) -> None:
         """
         Renames the column 'PAX ON BOARD' to 'PAX CARRIED'.
@@ -36,6 +38,7 @@ class B1TransformStrategy(TransformStrategy):
         """
         self.df_b1 = self.df_b1.rename(columns={"PAX ON BOARD": "PAX CARRIED"})
 
+    @profiled_step("df_b1")
     def _change_static_data(self) -> None:
         """
         Adds static values to specific columns required in the B1 report.
@@ -44,8 +47,9 @@ class B1TransformStrategy(TransformStrategy):
 
         :return: Pandas DataFrame with updated static values.
         """
-        self.df_b1["TABLE"] = 'B1'
+        self.df_b1 = self.df_b1.assign(TABLE='B1')
 
+    @profiled_step("df_b1")
     def _delete_unnecessary_columns(self) -> None:
         """
         Removes columns that are not required in the B1 report.
@@ -56,6 +60,7 @@ class B1TransformStrategy(TransformStrategy):
         """
         self.df_b1 = TransformUtils.keep_relevant_columns(self.df_b1, REPORTS_COLUMNS)
 
+    @profiled_step("df_b1")
     def _reorder_columns(self) -> None:
         """
         Ensures the correct column order in the final DataFrame.
@@ -67,6 +72,7 @@ class B1TransformStrategy(TransformStrategy):
         """
         self.df_b1 = self.df_b1[REPORTS_COLUMNS]
 
+    @profiled_step("df_b1")
     def run(self):
         """
         Executes the entire transformation process step by step.
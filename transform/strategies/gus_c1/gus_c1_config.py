@@ -46,4 +46,20 @@ MAPPING_TMY = [
 MAPPING_A1_TYPE = [
             "Rejsowy", "Przekierowany do GDN", "Czarterowy",
             "Czarterowy NREG", "Cargo", "Cargo/Regularny"
-        ]
\ No newline at end of file
+        ]
+
+BUCKETS = ["A1", "TMY"]
+
+# Bucket of every C1 flight type; C1 is aggregated per (bucket, AIRLINEC) in one grouped pass.
+FLIGHT_TYPE_BUCKETS = {
+    **{flight_type: "A1" for flight_type in MAPPING_A1_TYPE},
+    **{flight_type: "TMY" for flight_type in MAPPING_TMY},
+}
+
+# Flight type whose aircraft movements replace AIRCRAFTM of the TMY part.
+SANITARY_FLIGHT_TYPE = "Sanitarny"
+
+# Group keys and summed columns of the combined C1 rows before the freight is allocated; the
+# mergeable monthly partial state of C1 (see `C1TransformStrategy.get_partial`).
+PARTIAL_KEYS = ["BUCKET", "AIRLINEC"]
+PARTIAL_SUMS = ["PAX", "TRANSITPAX", "AIRCRAFTM", "AIRCRAFTMY"]
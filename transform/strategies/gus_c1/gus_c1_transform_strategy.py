@@ -1,9 +1,14 @@
+import numpy as np
 import pandas as pd
-from transform.strategies.cargo_utils.cargo_utils import CargoData
+from transform.strategies.cargo_utils.cargo_cache import CARGO_RESULTS_CACHE
+from transform.strategies.cargo_utils.freight_allocation import FreightAllocation
 from transform.strategies.abstract_transform_strategy import TransformStrategy
 from transform.transform_utils import TransformUtils
 from transform.strategies.gus_c1.gus_c1_config import REPORTS_COLUMNS, REPORT_MAPPINGS, REPORTS_ROWS, \
-    MAPPING_TMY, MAPPING_A1_TYPE
+    MAPPING_TMY, MAPPING_A1_TYPE, FLIGHT_TYPE_BUCKETS, BUCKETS, \
+    SANITARY_FLIGHT_TYPE
+from transform.strategies.report_config import COUNTRY, DEFAULT_RAIRPORT
+from instrumentation.profiler import profiled_step
 
 
 class C1TransformStrategy(TransformStrategy):
@@ -11,13 +16,17 @@ class C1TransformStrategy(TransformStrategy):
     Strategy class for transforming data into the C1 report format.
     """
 
-    def __init__(self, df_inflot: pd.DataFrame, df_total: pd.DataFrame) -> None:
+    def __init__(self, df_inflot: pd.DataFrame, df_total: pd.DataFrame, rairport: str = DEFAULT_RAIRPORT) -> None:
         """
         Initializes the transformation strategy with the input DataFrame.
+
+        :param rairport: ICAO code of the reporting airport, written in the RAIRPORT column.
         """
         self.df_inflot = df_inflot
         self.df_total = df_total
+        self.rairport = rairport
         self.df_c1 = pd.DataFrame()
+        self.df_partial = pd.DataFrame()
 
     def get_data(self) -> pd.DataFrame:
         """
@@ -25,19 +34,29 @@ class C1TransformStrategy(TransformStrategy):
         """
         return self.df_c1
 
+    def get_partial(self) -> pd.DataFrame:
+        """
+        Returns the combined per-airline sums before the freight is allocated, available after `run`.
+
+        :return: Pandas DataFrame with the BUCKET, AIRLINEC and summed columns.
+        """
+        return self.df_partial
+
+    @profiled_step("df_c1")
     def _prepare_columns(self) -> None:
         """
         Cleans and renames columns in the DataFrame to match the C1 report structure.
 
-        - Copies data from `df_inflot` to `df_c1`.
+        - Starts `df_c1` from `df_inflot`, which is never modified; with copy-on-write the data
+          is shared until a column is written.
         - Renames columns using predefined mappings (`REPORT_MAPPINGS`).
 
         :return: Pandas DataFrame with renamed columns.
         """
         mapping = REPORT_MAPPINGS
-        self.df_c1 = self.df_inflot
-        self.df_c1 = TransformUtils.rename_columns(self.df_c1, mapping)
+        self.df_c1 = TransformUtils.rename_columns(self.df_inflot, mapping)
 
+    @profiled_step("df_c1")
     def _add_columns(self) -> None:
         """
         Adds new columns required for the C1 report.
@@ -45,41 +64,34 @@ class C1TransformStrategy(TransformStrategy):
         - 'PAX' is calculated as the sum of 'TTL' (total passengers) and 'Infant'.
         - 'AIRCRAFTM' and 'AIRCRAFTMY' are initialized as copies of 'FLIGHT'.
         - 'FREIGHT' is initialized with a default value of 0.
+        - Counts read with the Inflot schema get the dtypes of plain input first (see
+          `TransformUtils.plain_counts`), so the report columns do not depend on the input dtypes.
 
         :return: Updated Pandas DataFrame.
         """
-        self.df_c1["PAX"] = self.df_c1["TTL"].fillna(0) + self.df_c1["Infant"].fillna(0)
-        self.df_c1["AIRCRAFTM"] = self.df_c1["FLIGHT"]
-        self.df_c1["AIRCRAFTMY"] = self.df_c1["FLIGHT"]
+        self.df_c1 = self.df_c1.assign(
+            PAX=TransformUtils.plain_counts(self.df_c1["TTL"]).fillna(0)
+                + TransformUtils.plain_counts(self.df_c1["Infant"]).fillna(0),
+            TRANSITPAX=TransformUtils.plain_counts(self.df_c1["TRANSITPAX"]),
+            AIRCRAFTM=self.df_c1["FLIGHT"],
+            AIRCRAFTMY=self.df_c1["FLIGHT"],
+        )
 
+    @profiled_step("df_c1")
     def _fill_cargo_from_total(self) -> None:
         """
         Dodaje dane 'FREIGHT' do raportu C1, łącząc po 'AIRLINEC'.
         W przypadku braku danych cargo dla danej linii, przypisuje 0.
         """
-        total = CargoData(self.df_total)
-
         date = TransformUtils.get_middle_record_data(self.df_inflot)
         year = int(date.strftime("%Y"))
         month = date.month
 
-        df_cargo = total.run(year, month)
-        df_cargo.rename(columns={"FREIGHT ON BOARD": "FREIGHT"}, inplace=True)
-
-        df_cargo_grouped = df_cargo.groupby("AIRLINEC", as_index=False).agg({
-            "FREIGHT": "sum"
-        })
-
-        self.df_c1 = pd.merge(
-            self.df_c1,
-            df_cargo_grouped,
-            how='left',
-            on='AIRLINEC'
-        )
-        mask = self.df_c1.duplicated(subset=['AIRLINEC'], keep='first')
-        self.df_c1.loc[mask, 'FREIGHT'] = 0.0
-        self.df_c1['FREIGHT'] = self.df_c1['FREIGHT'].fillna(0.0)
+        df_cargo = CARGO_RESULTS_CACHE.get(self.df_total, year, month)
+        df_cargo = df_cargo.rename(columns={"FREIGHT ON BOARD": "FREIGHT"})
+        self.df_c1 = FreightAllocation.to_first_row(self.df_c1, df_cargo, "AIRLINEC", "FREIGHT")
 
+    @profiled_step("df_c1")
     def _remove_unnecessary_rows(self) -> None:
         """
         Removes unnecessary rows from the dataset based on the flight type.
@@ -91,6 +103,7 @@ class C1TransformStrategy(TransformStrategy):
         col_filter = "Typ rejsu"
         self.df_c1 = TransformUtils.keep_relevant_rows(self.df_c1, col_filter, REPORTS_ROWS)
 
+    @profiled_step("df_c1")
     def _remove_unnecessary_columns(self) -> None:
         """
         Removes unnecessary columns from the DataFrame, retaining only those
@@ -104,84 +117,128 @@ class C1TransformStrategy(TransformStrategy):
 
 
 
-    @staticmethod
-    def create_df_with_operation_type(df: pd.DataFrame, col_filter: str, filter_values: list) -> pd.DataFrame:
+    @profiled_step()
+    def _aggregate_by_bucket(self) -> pd.DataFrame:
         """
-        Creates an aggregated DataFrame filtered by a specific flight type.
+        Aggregates the flights per flight-type bucket and airline in a single grouped pass.
 
-        - Filters the input DataFrame based on `col_filter` and `filter_values`.
-        - Aggregates passenger, transit, aircraft, and freight data per airline.
+        - Buckets come from `FLIGHT_TYPE_BUCKETS`: "A1" for passenger and cargo flights,
+          "TMY" for general aviation, technical and medical flights.
+        - Aircraft movements are counted as sums of non-empty flags, so every column is a plain
+          sum over integer group codes.
+        - 'SANITARY' counts the aircraft movements of medical flights and 'SANITARY ROWS' the
+          medical flight records; both are used for AIRCRAFTM of the TMY part.
 
-        :param df: The input Pandas DataFrame.
-        :param col_filter: Column used to filter data (e.g., "Typ rejsu").
-        :param filter_values: List of values to retain in the filtering column.
-        :return: Aggregated Pandas DataFrame.
+        :return: Aggregated Pandas DataFrame indexed by (bucket, AIRLINEC).
         """
-        df = TransformUtils.keep_relevant_rows(df, col_filter, filter_values)
-        df = df.groupby(["AIRLINEC"], as_index=False).agg({
-            "PAX": sum,
-            "TRANSITPAX": sum,
-            "AIRCRAFTM": "count",
-            "AIRCRAFTMY": "count",
-
+        flight_types = self.df_c1["Typ rejsu"].astype("category")
+        airlines = self.df_c1["AIRLINEC"].astype("category")
+        type_codes = flight_types.cat.codes.to_numpy()
+        airline_codes = airlines.cat.codes.to_numpy()
+        airline_count = len(airlines.cat.categories)
+
+        # Bucket and medical flag of every flight type; the extra last entry is taken by code -1 (missing type).
+        type_buckets = np.array([BUCKETS.index(FLIGHT_TYPE_BUCKETS[flight_type]) if flight_type in FLIGHT_TYPE_BUCKETS
+                                 else -1 for flight_type in flight_types.cat.categories] + [-1])
+        sanitary = np.append(flight_types.cat.categories == SANITARY_FLIGHT_TYPE, False)[type_codes]
+
+        # One integer code per (bucket, airline) pair, so grouping needs no hashing of the keys.
+        buckets = type_buckets[type_codes]
+        group_codes = np.where((buckets >= 0) & (airline_codes >= 0), buckets * airline_count + airline_codes, -1)
+        groups = pd.Categorical.from_codes(group_codes, categories=pd.RangeIndex(len(BUCKETS) * airline_count))
+
+        movements = self.df_c1["AIRCRAFTMY"].notna().to_numpy()
+        df = pd.DataFrame({
+            "PAX": self.df_c1["PAX"].array,
+            "TRANSITPAX": self.df_c1["TRANSITPAX"].array,
+            "AIRCRAFTMY": movements.astype("int64"),
+            "SANITARY": (movements & sanitary).astype("int64"),
+            "SANITARY ROWS": sanitary.astype("int64"),
         })
-        return df
+        aggregated = df.groupby(groups, observed=True).sum()
+        # Both movement columns are copies of FLIGHT (see `_add_columns`), so they are counted once.
+        aggregated.insert(2, "AIRCRAFTM", aggregated["AIRCRAFTMY"])
+
+        codes = aggregated.index.to_numpy(dtype="int64")
+        aggregated.index = pd.MultiIndex.from_arrays(
+            [np.asarray(BUCKETS, dtype=object)[codes // airline_count],
+             airlines.cat.categories[codes % airline_count]],
+            names=["BUCKET", "AIRLINEC"],
+        )
+        return aggregated
+
+    @staticmethod
+    def _bucket_df(aggregated: pd.DataFrame, bucket: str) -> pd.DataFrame:
+        """
+        Selects one bucket of the aggregated data.
 
-    def _generate_a1_type_df(self) -> pd.DataFrame:
+        :param aggregated: Result of `_aggregate_by_bucket`.
+        :param bucket: Bucket name, "A1" or "TMY".
+        :return: Pandas DataFrame with AIRLINEC, PAX, TRANSITPAX, AIRCRAFTM and AIRCRAFTMY per airline.
+        """
+        df = aggregated[aggregated.index.get_level_values("BUCKET") == bucket]
+        df = df.reset_index(level="BUCKET", drop=True).reset_index()
+        return TransformUtils.uncategorize(df)
+
+    @profiled_step()
+    def _generate_a1_type_df(self, aggregated: pd.DataFrame) -> pd.DataFrame:
         """
         Generates an aggregated DataFrame for A1 report types.
 
-        - Filters flights belonging to passenger and cargo categories.
-        - Aggregates data per airline.
+        - Takes the passenger and cargo flights from the aggregated data.
 
+        :param aggregated: Result of `_aggregate_by_bucket`.
         :return: Aggregated Pandas DataFrame.
         """
+        return self._bucket_df(aggregated, "A1").drop(columns=["SANITARY", "SANITARY ROWS"])
 
-        return self.create_df_with_operation_type(self.df_c1, "Typ rejsu", MAPPING_A1_TYPE)
-
-    def _generate_tmy_type_df(self) -> pd.DataFrame:
+    @profiled_step()
+    def _generate_tmy_type_df(self, aggregated: pd.DataFrame) -> pd.DataFrame:
         """
         Generates an aggregated DataFrame for TMY report types.
 
-        - Filters flights categorized as General Aviation, Technical, or Medical.
-        - Initializes missing values for PAX and AIRCRAFTM.
+        - Takes the General Aviation, Technical and Medical flights from the aggregated data.
+        - Initializes PAX with 0 and AIRCRAFTM with the number of medical flights of the airline,
+          0 when there were none.
 
+        :param aggregated: Result of `_aggregate_by_bucket`.
         :return: Aggregated Pandas DataFrame.
         """
+        df_tmy = self._bucket_df(aggregated, "TMY").assign(PAX=0, AIRCRAFTM=0)
 
-        df_tmy = self.create_df_with_operation_type(self.df_c1, "Typ rejsu", MAPPING_TMY)
-        df_tmy["PAX"] = 0
-        df_tmy["AIRCRAFTM"] = 0
-        return df_tmy
+        df_tm = df_tmy[df_tmy["SANITARY ROWS"] > 0]
+        aircraft_mapping = dict(zip(df_tm["AIRLINEC"], df_tm["SANITARY"]))
+        df_tmy = df_tmy.assign(AIRCRAFTM=df_tmy["AIRLINEC"].map(aircraft_mapping).fillna(df_tmy["AIRCRAFTM"]))
+        return df_tmy.drop(columns=["SANITARY", "SANITARY ROWS"])
 
+    @profiled_step("df_c1")
     def _combine_aggregated_data(self) -> None:
         """
         Combines aggregated passenger and general aviation data.
 
-        - Generates data for general aviation flights.
-        - Merges specific cases from the 'Sanitarny' category into the main dataset.
-        - Ensures missing aircraft types are mapped from a reference dataset.
+        - Aggregates all flights in one pass per (flight-type bucket, AIRLINEC).
+        - Builds the passenger part and the general aviation part, where AIRCRAFTM comes from
+          the 'Sanitarny' flights.
+        - Keeps both parts, labelled with their bucket, as the mergeable partial state of the month.
 
         :return: Combined Pandas DataFrame.
         """
-        df_tmy = self._generate_tmy_type_df()
-        df_tm = self.create_df_with_operation_type(self.df_c1, "Typ rejsu", ["Sanitarny"])
-
-        aircraft_mapping = dict(zip(df_tm["AIRLINEC"], df_tm["AIRCRAFTMY"]))
-        df_tmy["AIRCRAFTM"] = df_tmy["AIRLINEC"].map(aircraft_mapping).fillna(df_tmy["AIRCRAFTM"])
-
-        self.df_c1 = pd.concat([self._generate_a1_type_df(), df_tmy], ignore_index=True)
+        aggregated = self._aggregate_by_bucket()
+        self.df_partial = pd.concat([self._generate_a1_type_df(aggregated).assign(BUCKET="A1"),
+                                     self._generate_tmy_type_df(aggregated).assign(BUCKET="TMY")],
+                                    ignore_index=True)
+        self.df_c1 = self.df_partial.drop(columns=["BUCKET"])
 
+    @profiled_step("df_c1")
     def _add_static_data(self) -> None:
         """
         Adds static values to specific columns in the DataFrame.
 
         :return: Updated Pandas DataFrame with static values.
         """
-        self.df_c1["TABLE"] = "C1"
-        self.df_c1["COUNTRY"] = "EP"
-        self.df_c1["RAIRPORT"] = "EPGD"
+        self.df_c1 = self.df_c1.assign(TABLE="C1", COUNTRY=COUNTRY, RAIRPORT=self.rairport)
 
+    @profiled_step("df_c1")
     def _add_date_columns(self) -> None:
         """
         Extracts a reference date from the dataset and assigns year and period columns.
@@ -192,9 +249,9 @@ class C1TransformStrategy(TransformStrategy):
         :return: Updated Pandas DataFrame.
         """
         date = TransformUtils.get_middle_record_data(self.df_inflot)
-        self.df_c1["YEAR"] = date.strftime("%y")
-        self.df_c1["PERIOD"] = date.month
+        self.df_c1 = self.df_c1.assign(YEAR=date.strftime("%y"), PERIOD=date.month)
 
+    @profiled_step("df_c1")
     def _reorder_columns(self) -> None:
         """
         Ensures the correct column order in the final DataFrame.
@@ -203,6 +260,7 @@ class C1TransformStrategy(TransformStrategy):
         """
         self.df_c1 = self.df_c1[REPORTS_COLUMNS]
 
+    @profiled_step("df_c1")
     def run(self):
 
         self._prepare_columns()
@@ -0,0 +1,4 @@
+# Country code and default reporting airport (ICAO) written in the COUNTRY and RAIRPORT columns.
+COUNTRY = "EP"
+
+DEFAULT_RAIRPORT = "EPGD"
@@ -28,4 +28,4 @@ class Transform:
         """
         :return:  Get data transform by the current strategy
         """
-        return self._strategy.transform()
+        return self._strategy.run()
@@ -1,11 +1,29 @@
 import datetime
+import numpy as np
 import pandas as pd
 import shutil
 from typing import Optional
 
 
 class TransformUtils:
-    """Utility class for handling data transform operations."""
+    """
+    Utility class for handling data transform operations.
+
+    The helpers never modify the DataFrame they receive; they return a new DataFrame.
+    """
+
+    @staticmethod
+    def enable_copy_on_write() -> None:
+        """
+        Enables pandas copy-on-write for the whole process.
+
+        Frames produced by a transform then share memory with their input until one of them is
+        written to; the write copies only the affected column. Strategies can therefore share one
+        input frame (see `ReportRunner`) without defensive copies. The option is global, so it is
+        set by the entry points (the `run`, `batch`, `airports`, `daemon` and `rollup` commands and
+        the batch worker processes) rather than when this module is imported.
+        """
+        pd.set_option("mode.copy_on_write", True)
 
     @staticmethod
     def keep_relevant_columns(dataframe: pd.DataFrame, relevant_columns: list) -> pd.DataFrame:
@@ -20,7 +38,7 @@ class TransformUtils:
 
         missing_columns = [col for col in relevant_columns if col not in dataframe.columns]
         if missing_columns:
-            ValueError(f'Missing required columns in report: {missing_columns}')
+            raise ValueError(f'Missing required columns in report: {missing_columns}')
 
         dataframe = dataframe[relevant_columns]
         return dataframe
@@ -40,16 +58,103 @@ class TransformUtils:
         :param mapping: Dictionary mapping old column names to new column names.
         :return: A new DataFrame with cleaned and renamed columns.
         """
-        dataframe.columns = dataframe.columns.str.strip()
-        dataframe.columns = dataframe.columns.str.replace(r"[\n]", " ", regex=True).str.strip()
-        return dataframe.rename(columns=mapping)
+        columns = dataframe.columns.str.strip().str.replace(r"[\n]", " ", regex=True).str.strip()
+        return dataframe.set_axis(columns, axis=1).rename(columns=mapping)
 
 
 
     @staticmethod
     def replacing_data(dataframe: pd.DataFrame, column: str, mapping: dict) -> pd.DataFrame:
-        dataframe[column] = dataframe[column].replace(mapping)
-        return dataframe
+        """
+        Replaces values of one column according to a mapping.
+
+        :param dataframe: Input DataFrame.
+        :param column: Name of the column to modify.
+        :param mapping: Dictionary mapping old values to new values.
+        :return: A new DataFrame with the replaced column.
+        """
+        series = dataframe[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Replace the categories instead of every value; replaced categories may merge.
+            # Categories are kept sorted, so grouping orders rows as it does for plain values.
+            category_codes, categories = pd.factorize(series.cat.categories.to_series().replace(mapping), sort=True)
+            old_codes = series.cat.codes.to_numpy()
+            codes = np.full(len(old_codes), -1, dtype=np.int64)
+            codes[old_codes >= 0] = category_codes[old_codes[old_codes >= 0]]
+            replaced = pd.Categorical.from_codes(codes, categories=pd.Index(categories))
+        else:
+            replaced = series.replace(mapping)
+        return dataframe.assign(**{column: replaced})
+
+    @staticmethod
+    def map_values(series: pd.Series, mapping: dict) -> pd.Series:
+        """
+        Maps the values of a column, e.g. flight types to report codes.
+
+        Arrow-backed strings are dictionary-encoded first, so the mapping is looked up once per
+        distinct value, as for categorical columns, instead of once per row.
+
+        :param series: Column to map.
+        :param mapping: Dictionary mapping values to new values; other values become missing.
+        :return: Mapped column.
+        """
+        if TransformUtils.is_arrow_string(series.dtype):
+            series = series.astype("category")
+        return series.map(mapping)
+
+    @staticmethod
+    def plain_counts(series: pd.Series) -> pd.Series:
+        """
+        Converts a nullable numeric column (e.g. "Int16" counts of the Inflot schema) to the dtype
+        `pd.read_excel` gives the same column: float64 when it has blanks, int64 otherwise.
+
+        Must run before missing values are filled, since the blanks decide the dtype.
+
+        :param series: Column to convert; other columns are returned unchanged.
+        :return: Column with a NumPy dtype.
+        """
+        dtype = series.dtype
+        if not isinstance(dtype, pd.api.extensions.ExtensionDtype) or isinstance(dtype, pd.CategoricalDtype) \
+                or dtype.kind not in "iuf":
+            return series
+        if dtype.kind == "f" or series.hasnans:
+            return series.astype("float64")
+        return series.astype("int64")
+
+    @staticmethod
+    def uncategorize(dataframe: pd.DataFrame) -> pd.DataFrame:
+        """
+        Converts categorical columns back to the dtype of their categories, Arrow-backed
+        string columns back to object columns and nullable numeric columns to NumPy dtypes
+        (see `plain_counts`).
+
+        Used after aggregation, so reports built from compact-dtype or Arrow-backed input have
+        the same column types as reports built from plain input.
+
+        :param dataframe: Input DataFrame.
+        :return: DataFrame without categorical, Arrow-backed string or nullable numeric columns.
+        """
+        dtypes = {}
+        for column, dtype in dataframe.dtypes.items():
+            if isinstance(dtype, pd.CategoricalDtype):
+                dtypes[column] = object if TransformUtils.is_arrow_string(dtype.categories.dtype) \
+                    else dtype.categories.dtype
+            elif TransformUtils.is_arrow_string(dtype):
+                dtypes[column] = object
+            else:
+                plain_dtype = TransformUtils.plain_counts(dataframe[column]).dtype
+                if plain_dtype != dtype:
+                    dtypes[column] = plain_dtype
+        return dataframe.astype(dtypes) if dtypes else dataframe
+
+    @staticmethod
+    def is_arrow_string(dtype) -> bool:
+        """
+        :return: True for string dtypes stored in Arrow arrays ("string[pyarrow]" or `pd.ArrowDtype(pa.string())`).
+        """
+        if isinstance(dtype, pd.StringDtype):
+            return dtype.storage.startswith("pyarrow")
+        return isinstance(dtype, pd.ArrowDtype) and dtype.kind in "OSU"
 
     @staticmethod
     def handle_null_values(dataframe: pd.DataFrame) -> pd.DataFrame: